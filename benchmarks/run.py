@@ -0,0 +1,227 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmarks for the pipe toolbox hot paths
+
+Run from the repository root:
+
+    python benchmarks/run.py --save baseline.json
+    python benchmarks/run.py --compare baseline.json --threshold 0.25
+
+Each benchmark reports the best time per call over several repeats. With
+--compare the run is checked against a saved baseline and any benchmark
+slower by more than the threshold fraction is flagged, the exit status is
+then 1.
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import subprocess
+import sys
+import timeit
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import numpy as np
+
+import pipetoolbox as ptb
+
+PROPERTIES = ('area_inner', 'area_steel', 'area_outer', 'area_coatings',
+              'area_external', 'second_moment', 'radius_of_gyration',
+              'mass_fluids', 'mass_steel', 'mass_coatings', 'mass_total',
+              'mass_buoyant', 'tension_limit', 'bending_limit',
+              'pressure_internal_limit', 'euler_load')
+
+# -----------------------------------------------------------------------------
+# Benchmarks, each returns the function to time
+# -----------------------------------------------------------------------------
+def bench_import(repeat=5):
+    """
+    Time "import pipetoolbox" in a fresh interpreter, so this measures
+    itself rather than returning a function
+    """
+    code = ("import time; start = time.perf_counter(); import pipetoolbox; "
+            "print(time.perf_counter() - start)")
+    subprocess.check_call([sys.executable, '-c', 'import pipetoolbox'], cwd=ROOT)
+    return min(float(subprocess.check_output([sys.executable, '-c', code], cwd=ROOT))
+               for index in range(repeat))
+bench_import.measures_itself = True
+
+def bench_pipe_construction():
+    return lambda: ptb.Pipe(0.3239, 0.0127)
+
+def bench_materials_construction():
+    return lambda: ptb.Materials()
+
+def bench_get_material():
+    materials = ptb.Materials()
+    return lambda: materials.get_material('stainless steel')
+
+def _bench_property(name):
+    def bench():
+        # A fresh pipe each call so the property cache does not hide the work
+        def run():
+            pipe = ptb.Pipe(0.3239, 0.0127)
+            getattr(pipe, name)()
+        return run
+    return bench
+
+def _bench_property_cached(name):
+    def bench():
+        pipe = ptb.Pipe(0.3239, 0.0127)
+        return getattr(pipe, name)
+    return bench
+
+def bench_display():
+    pipe = ptb.Pipe(0.3239, 0.0127)
+    def run():
+        with contextlib.redirect_stdout(io.StringIO()):
+            pipe.display()
+    return run
+
+def bench_render_csv_1k():
+    pipes = [ptb.Pipe(0.1 + 0.001 * index, 0.0127) for index in range(1000)]
+    return lambda: ptb.render_properties(pipes, 'csv')
+
+def bench_size_sweep_100k():
+    rng = np.random.default_rng(0)
+    outer_diameter = rng.uniform(0.05, 1.2, 100000)
+    wall_thickness = outer_diameter * rng.uniform(0.02, 0.1, 100000)
+    def run():
+        sweep = ptb.PipeArray(outer_diameter, wall_thickness)
+        sweep.properties(PROPERTIES)
+    return run
+
+def bench_records_100k():
+    rng = np.random.default_rng(0)
+    outer_diameter = rng.uniform(0.05, 1.2, 100000)
+    sweep = ptb.PipeArray(outer_diameter, outer_diameter * rng.uniform(0.02, 0.1, 100000))
+    return lambda: sweep.to_records(PROPERTIES)
+
+def bench_string_10k():
+    rng = np.random.default_rng(0)
+    segments = ptb.PipeArray(0.3239, rng.uniform(0.01, 0.02, 10000), length=12.0)
+    return lambda: ptb.PipeString(segments, bottom_tension=1.0e5).governing_segment()
+
+def bench_string_10k_update():
+    segments = ptb.PipeArray(0.3239, np.full(10000, 0.0127), length=12.0)
+    string = ptb.PipeString(segments)
+    pipe = ptb.Pipe(0.3239, 0.0159)
+    pipe.length(12.0)
+    return lambda: string.set_segment(5000, pipe)
+
+def bench_derating_1m():
+    rng = np.random.default_rng(0)
+    rows = ptb.derating.material_rows(rng.choice(['steel', 'stainless steel'], 1000000))
+    temperatures = rng.uniform(0.0, 250.0, 1000000)
+    return lambda: ptb.yield_factor(rows, temperatures)
+
+def bench_time_series_10m():
+    rng = np.random.default_rng(0)
+    tension = rng.uniform(0.0, 3.0e6, (10000, 1000))
+    moment = rng.uniform(-5.0e5, 5.0e5, (10000, 1000))
+    pipe = ptb.Pipe(0.3239, 0.0127)
+    return lambda: ptb.check_time_series(pipe, tension, moment, 10.0e6, 2.0e6)
+
+def bench_spans_500k():
+    from pipetoolbox.freespan import end_condition_codes
+    rng = np.random.default_rng(0)
+    lengths = rng.uniform(5.0, 80.0, 500000)
+    end_conditions = end_condition_codes(rng.choice(['pin-pin', 'pin-fix', 'fix-fix'], 500000))
+    pipe = ptb.Pipe(0.3239, 0.0127)
+    return lambda: ptb.screen_spans(pipe, lengths, end_conditions, axial_force=-2.0e5, current_velocity=0.4)
+
+def benchmarks():
+    """Return the benchmarks by name, in run order"""
+    cases = [('import_pipetoolbox', bench_import),
+             ('pipe_construction', bench_pipe_construction),
+             ('materials_construction', bench_materials_construction),
+             ('get_material', bench_get_material)]
+    cases += [('pipe_' + name, _bench_property(name)) for name in PROPERTIES]
+    cases += [('pipe_' + name + '_cached', _bench_property_cached(name)) for name in PROPERTIES]
+    cases += [('display', bench_display),
+              ('render_csv_1k', bench_render_csv_1k),
+              ('size_sweep_100k', bench_size_sweep_100k),
+              ('records_100k', bench_records_100k),
+              ('string_10k', bench_string_10k),
+              ('string_10k_update', bench_string_10k_update),
+              ('derating_1m', bench_derating_1m),
+              ('time_series_10m', bench_time_series_10m),
+              ('spans_500k', bench_spans_500k)]
+    return cases
+
+# -----------------------------------------------------------------------------
+# Running and comparing
+# -----------------------------------------------------------------------------
+def time_call(function, repeat=5, min_time=0.2):
+    """Return the best time per call in seconds and the number of calls"""
+    timer = timeit.Timer(function)
+    number, elapsed = timer.autorange()
+    number = max(1, int(number * min_time / max(elapsed, 1e-9)))
+    return min(timer.repeat(repeat=repeat, number=number)) / number, number
+
+def run(selected=None, repeat=5):
+    results = {}
+    for name, bench in benchmarks():
+        if selected and not any(pattern in name for pattern in selected):
+            continue
+        if getattr(bench, 'measures_itself', False):
+            seconds, number = bench(repeat), 1
+        else:
+            seconds, number = time_call(bench(), repeat)
+        results[name] = {'seconds': seconds, 'number': number, 'repeat': repeat}
+        print("{:40} {:12.4g} s".format(name, seconds))
+    return {'python': platform.python_version(),
+            'numpy': np.__version__,
+            'machine': platform.platform(),
+            'results': results}
+
+def compare(current, baseline, threshold):
+    """Print the ratio to the baseline and return the names that slowed down"""
+    slower = []
+    print(" ")
+    print("{:40} {:>12} {:>12} {:>8}".format("Benchmark", "Baseline", "Current", "Ratio"))
+    for name, result in sorted(current['results'].items()):
+        reference = baseline['results'].get(name)
+        if reference is None:
+            continue
+        ratio = result['seconds'] / reference['seconds']
+        flag = ''
+        if ratio > 1.0 + threshold:
+            slower.append(name)
+            flag = ' SLOWER'
+        print("{:40} {:12.4g} {:12.4g} {:8.2f}{}".format(
+                name, reference['seconds'], result['seconds'], ratio, flag))
+    return slower
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--save', help='write the results to this JSON file')
+    parser.add_argument('--compare', help='baseline JSON file to compare against')
+    parser.add_argument('--threshold', type=float, default=0.25,
+                        help='fractional slowdown that is flagged (default 0.25)')
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('benchmark', nargs='*', help='only run names containing these')
+    args = parser.parse_args(argv)
+    #
+    current = run(args.benchmark, args.repeat)
+    if args.save:
+        with open(args.save, 'w') as save_file:
+            json.dump(current, save_file, indent=1, sort_keys=True)
+    if args.compare:
+        with open(args.compare) as baseline_file:
+            baseline = json.load(baseline_file)
+        slower = compare(current, baseline, args.threshold)
+        if slower:
+            print(" ")
+            print("{} benchmark(s) slower than the baseline by more than {:.0%}".format(len(slower), args.threshold))
+            return 1
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -2,14 +2,97 @@
 # -*- coding: utf-8 -*-
 """
 pipe toolbox
+
+The scalar Pipe and Materials objects are imported with the package. The
+batch, study and database features need NumPy or SQLite and are imported on
+first use, so importing the package stays fast.
 """
 
-from .materials import Materials
+import importlib
+import os
+
+from .derating import register_derating, yield_factor, youngs_factor
+from .materials import MaterialRecord, Materials, database_attach, database_detach, material_record, register_material
 from .pipe import Pipe
 
+# Names imported from their module on first use, see __getattr__
+_LAZY = {
+        'MaterialsDatabase': 'materials_database',
+        'MaterialTable': 'material_table',
+        'PipeCatalogue': 'catalogue',
+        'schedule_dimensions': 'catalogue',
+        'PipeArray': 'pipe_array',
+        'PipeString': 'pipe_string',
+        'ParameterStudy': 'study',
+        'failure_probability': 'reliability',
+        'design_optimize': 'design',
+        'combined_utilisation': 'combined_loading',
+        'check_time_series': 'combined_loading',
+        'screen_spans': 'freespan',
+        'PipeService': 'service',
+        'render_properties': 'report',
+        'instrument': 'instrumentation',
+        'save_properties': 'export',
+        'load_properties': 'export',
+        }
+
+def __getattr__(name):
+    module = _LAZY.get(name)
+    if module is None:
+        raise AttributeError("module {!r} has no attribute {!r}".format(__name__, name))
+    value = getattr(importlib.import_module('.' + module, __name__), name)
+    globals()[name] = value
+    return value
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY))
+
 __all__ = [
         # Materials
+        'MaterialRecord',
         'Materials',
+        'MaterialsDatabase',
+        'MaterialTable',
+        'database_attach',
+        'database_detach',
+        'material_record',
+        'register_material',
+        # Derating
+        'register_derating',
+        'yield_factor',
+        'youngs_factor',
         # Pipe
         'Pipe',
+        # Catalogue
+        'PipeCatalogue',
+        'schedule_dimensions',
+        # PipeArray
+        'PipeArray',
+        # PipeString
+        'PipeString',
+        # Studies
+        'ParameterStudy',
+        # Reliability
+        'failure_probability',
+        # Design
+        'design_optimize',
+        # Combined loading
+        'combined_utilisation',
+        'check_time_series',
+        # Free spans
+        'screen_spans',
+        # Service
+        'PipeService',
+        # Reports
+        'render_properties',
+        # Instrumentation
+        'instrument',
+        # Export
+        'save_properties',
+        'load_properties',
         ]
+
+# Opt-in instrumentation of the Pipe and Materials methods, see instrumentation.py
+if os.environ.get('PIPETOOLBOX_INSTRUMENT'):
+    from .instrumentation import instrument_from_environment
+    instrument_from_environment()
@@ -0,0 +1,24 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Numeric functions shared by the scalar and array code
+
+Python numbers are handled with math, anything else (NumPy arrays and
+scalars, or other array types with a __array_ufunc__) goes to NumPy, which
+is only imported the first time it is needed.
+"""
+
+import math
+
+pi = math.pi
+
+def numpy():
+    """Return the NumPy module, importing it on first use"""
+    import numpy
+    return numpy
+
+def sqrt(value):
+    """Square root, NaN for negative Python numbers as NumPy gives"""
+    if type(value) is float or type(value) is int:
+        return math.sqrt(value) if value >= 0.0 else float('nan')
+    return numpy().sqrt(value)
@@ -0,0 +1,270 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Standard pipe sizes and schedules
+
+Outer diameters and wall thicknesses of the ASME B36.10 (carbon steel,
+schedules 5 to 160, STD, XS and XXS) and B36.19 (stainless steel, 5S to 80S)
+sizes from NPS 1/8 to NPS 24, in inches as tabulated. Check project critical
+sizes against the current edition of the standards.
+
+Nominal sizes may be given as '10in', '10', 10, 'NPS 10', '1-1/2in' or
+'DN250', schedules as 'SCH40', '40', 'STD', 'XS', 'XXS' or '40S'.
+
+The PipeCatalogue holds every size as sorted NumPy columns with the section
+properties computed once, so the nearest size is a binary search and a
+range query is a binary search on a sorted index of each property.
+"""
+
+from .backend import numpy
+
+INCH = 0.0254
+
+# Nominal size: (DN, outer diameter in, {schedule: wall thickness in})
+_SIZES = {
+        '1/8': (6, 0.405, {'10': 0.049, '30': 0.057, '40': 0.068, 'STD': 0.068, '80': 0.095, 'XS': 0.095,
+                           '10S': 0.049, '40S': 0.068, '80S': 0.095}),
+        '1/4': (8, 0.540, {'10': 0.065, '30': 0.073, '40': 0.088, 'STD': 0.088, '80': 0.119, 'XS': 0.119,
+                           '10S': 0.065, '40S': 0.088, '80S': 0.119}),
+        '3/8': (10, 0.675, {'10': 0.065, '30': 0.073, '40': 0.091, 'STD': 0.091, '80': 0.126, 'XS': 0.126,
+                            '10S': 0.065, '40S': 0.091, '80S': 0.126}),
+        '1/2': (15, 0.840, {'5': 0.065, '10': 0.083, '30': 0.095, '40': 0.109, 'STD': 0.109, '80': 0.147,
+                            'XS': 0.147, '160': 0.187, 'XXS': 0.294,
+                            '5S': 0.065, '10S': 0.083, '40S': 0.109, '80S': 0.147}),
+        '3/4': (20, 1.050, {'5': 0.065, '10': 0.083, '30': 0.095, '40': 0.113, 'STD': 0.113, '80': 0.154,
+                            'XS': 0.154, '160': 0.219, 'XXS': 0.308,
+                            '5S': 0.065, '10S': 0.083, '40S': 0.113, '80S': 0.154}),
+        '1': (25, 1.315, {'5': 0.065, '10': 0.109, '30': 0.114, '40': 0.133, 'STD': 0.133, '80': 0.179,
+                          'XS': 0.179, '160': 0.250, 'XXS': 0.358,
+                          '5S': 0.065, '10S': 0.109, '40S': 0.133, '80S': 0.179}),
+        '1-1/4': (32, 1.660, {'5': 0.065, '10': 0.109, '30': 0.117, '40': 0.140, 'STD': 0.140, '80': 0.191,
+                              'XS': 0.191, '160': 0.250, 'XXS': 0.382,
+                              '5S': 0.065, '10S': 0.109, '40S': 0.140, '80S': 0.191}),
+        '1-1/2': (40, 1.900, {'5': 0.065, '10': 0.109, '30': 0.125, '40': 0.145, 'STD': 0.145, '80': 0.200,
+                              'XS': 0.200, '160': 0.281, 'XXS': 0.400,
+                              '5S': 0.065, '10S': 0.109, '40S': 0.145, '80S': 0.200}),
+        '2': (50, 2.375, {'5': 0.065, '10': 0.109, '30': 0.125, '40': 0.154, 'STD': 0.154, '80': 0.218,
+                          'XS': 0.218, '160': 0.344, 'XXS': 0.436,
+                          '5S': 0.065, '10S': 0.109, '40S': 0.154, '80S': 0.218}),
+        '2-1/2': (65, 2.875, {'5': 0.083, '10': 0.120, '30': 0.188, '40': 0.203, 'STD': 0.203, '80': 0.276,
+                              'XS': 0.276, '160': 0.375, 'XXS': 0.552,
+                              '5S': 0.083, '10S': 0.120, '40S': 0.203, '80S': 0.276}),
+        '3': (80, 3.500, {'5': 0.083, '10': 0.120, '30': 0.188, '40': 0.216, 'STD': 0.216, '80': 0.300,
+                          'XS': 0.300, '160': 0.438, 'XXS': 0.600,
+                          '5S': 0.083, '10S': 0.120, '40S': 0.216, '80S': 0.300}),
+        '3-1/2': (90, 4.000, {'5': 0.083, '10': 0.120, '30': 0.188, '40': 0.226, 'STD': 0.226, '80': 0.318,
+                              'XS': 0.318, 'XXS': 0.636,
+                              '5S': 0.083, '10S': 0.120, '40S': 0.226, '80S': 0.318}),
+        '4': (100, 4.500, {'5': 0.083, '10': 0.120, '30': 0.188, '40': 0.237, 'STD': 0.237, '80': 0.337,
+                           'XS': 0.337, '120': 0.438, '160': 0.531, 'XXS': 0.674,
+                           '5S': 0.083, '10S': 0.120, '40S': 0.237, '80S': 0.337}),
+        '5': (125, 5.563, {'5': 0.109, '10': 0.134, '40': 0.258, 'STD': 0.258, '80': 0.375, 'XS': 0.375,
+                           '120': 0.500, '160': 0.625, 'XXS': 0.750,
+                           '5S': 0.109, '10S': 0.134, '40S': 0.258, '80S': 0.375}),
+        '6': (150, 6.625, {'5': 0.109, '10': 0.134, '40': 0.280, 'STD': 0.280, '80': 0.432, 'XS': 0.432,
+                           '120': 0.562, '160': 0.719, 'XXS': 0.864,
+                           '5S': 0.109, '10S': 0.134, '40S': 0.280, '80S': 0.432}),
+        '8': (200, 8.625, {'5': 0.109, '10': 0.148, '20': 0.250, '30': 0.277, '40': 0.322, 'STD': 0.322,
+                           '60': 0.406, '80': 0.500, 'XS': 0.500, '100': 0.594, '120': 0.719,
+                           '140': 0.812, '160': 0.906, 'XXS': 0.875,
+                           '5S': 0.109, '10S': 0.148, '40S': 0.322, '80S': 0.500}),
+        '10': (250, 10.750, {'5': 0.134, '10': 0.165, '20': 0.250, '30': 0.307, '40': 0.365, 'STD': 0.365,
+                             '60': 0.500, 'XS': 0.500, '80': 0.594, '100': 0.719, '120': 0.844,
+                             '140': 1.000, '160': 1.125, 'XXS': 1.000,
+                             '5S': 0.134, '10S': 0.165, '40S': 0.365, '80S': 0.500}),
+        '12': (300, 12.750, {'5': 0.156, '10': 0.180, '20': 0.250, '30': 0.330, 'STD': 0.375, '40': 0.406,
+                             'XS': 0.500, '60': 0.562, '80': 0.688, '100': 0.844, '120': 1.000,
+                             '140': 1.125, '160': 1.312, 'XXS': 1.000,
+                             '5S': 0.156, '10S': 0.180, '40S': 0.375, '80S': 0.500}),
+        '14': (350, 14.000, {'5': 0.156, '10': 0.250, '20': 0.312, '30': 0.375, 'STD': 0.375, '40': 0.438,
+                             'XS': 0.500, '60': 0.594, '80': 0.750, '100': 0.938, '120': 1.094,
+                             '140': 1.250, '160': 1.406,
+                             '5S': 0.156, '10S': 0.188, '40S': 0.375, '80S': 0.500}),
+        '16': (400, 16.000, {'5': 0.165, '10': 0.250, '20': 0.312, '30': 0.375, 'STD': 0.375, '40': 0.500,
+                             'XS': 0.500, '60': 0.656, '80': 0.844, '100': 1.031, '120': 1.219,
+                             '140': 1.438, '160': 1.594,
+                             '5S': 0.165, '10S': 0.188, '40S': 0.375, '80S': 0.500}),
+        '18': (450, 18.000, {'5': 0.165, '10': 0.250, '20': 0.312, 'STD': 0.375, '30': 0.438, 'XS': 0.500,
+                             '40': 0.562, '60': 0.750, '80': 0.938, '100': 1.156, '120': 1.375,
+                             '140': 1.562, '160': 1.781,
+                             '5S': 0.165, '10S': 0.188, '40S': 0.375, '80S': 0.500}),
+        '20': (500, 20.000, {'5': 0.188, '10': 0.250, '20': 0.375, 'STD': 0.375, '30': 0.500, 'XS': 0.500,
+                             '40': 0.594, '60': 0.812, '80': 1.031, '100': 1.281, '120': 1.500,
+                             '140': 1.750, '160': 1.969,
+                             '5S': 0.188, '10S': 0.218, '40S': 0.375, '80S': 0.500}),
+        '24': (600, 24.000, {'5': 0.218, '10': 0.250, '20': 0.375, 'STD': 0.375, 'XS': 0.500, '30': 0.562,
+                             '40': 0.688, '60': 0.969, '80': 1.219, '100': 1.531, '120': 1.812,
+                             '140': 2.062, '160': 2.344,
+                             '5S': 0.218, '10S': 0.250, '40S': 0.375, '80S': 0.500}),
+        }
+
+_DN = {'DN{:d}'.format(dn): size for size, (dn, outer_diameter, walls) in _SIZES.items()}
+
+# Section properties stored by the catalogue, at a safety factor of 1
+PROPERTIES = ('diameter_inner', 'area_steel', 'second_moment', 'radius_of_gyration',
+              'mass_steel', 'tension_limit', 'bending_limit', 'pressure_internal_limit')
+
+def nominal_size(size):
+    """Return the catalogue label of a nominal size, e.g. '1-1/2' for '1.5in'"""
+    label = str(size).strip().upper().replace(' ', '')
+    if label.startswith('DN'):
+        if label in _DN:
+            return _DN[label]
+        raise ValueError("Unknown nominal size {}".format(size))
+    label = label.replace('NPS', '').replace('"', '').replace('IN', '')
+    if label in _SIZES:
+        return label
+    try:
+        inches = float(label)
+    except ValueError:
+        inches = None
+    for candidate in _SIZES:
+        if _size_inches(candidate) == inches:
+            return candidate
+    raise ValueError("Unknown nominal size {}".format(size))
+
+def _size_inches(label):
+    """Nominal size label as a number of inches, '1-1/2' is 1.5"""
+    whole, _, fraction = label.rpartition('-') if '-' in label else ('', '', label)
+    if '/' in fraction:
+        numerator, denominator = fraction.split('/')
+        return float(whole or 0) + float(numerator) / float(denominator)
+    return float(fraction)
+
+def schedule_name(schedule):
+    """Return the catalogue label of a schedule, e.g. '40' for 'SCH 40'"""
+    return str(schedule).strip().upper().replace(' ', '').replace('SCH', '')
+
+def schedule_dimensions(size, schedule):
+    """Return the outer diameter and wall thickness (m) of a size and schedule"""
+    dn, outer_diameter, walls = _SIZES[nominal_size(size)]
+    wall_thickness = walls.get(schedule_name(schedule))
+    if wall_thickness is None:
+        raise ValueError("No schedule {} for nominal size {}".format(schedule, size))
+    return outer_diameter * INCH, wall_thickness * INCH
+
+class PipeCatalogue(object):
+    """
+    Every standard size and schedule as columns sorted by outer diameter then
+    wall thickness, with the PROPERTIES computed for the material
+    """
+    def __init__(self, material='default'):
+        from .pipe_array import PipeArray
+        np = numpy()
+        rows = sorted((outer_diameter, wall_thickness, size, schedule)
+                      for size, (dn, outer_diameter, walls) in _SIZES.items()
+                      for schedule, wall_thickness in walls.items())
+        self._material = material
+        self._size = np.array([row[2] for row in rows])
+        self._schedule = np.array([row[3] for row in rows])
+        self._columns = {
+                'outer_diameter': np.array([row[0] for row in rows]) * INCH,
+                'wall_thickness': np.array([row[1] for row in rows]) * INCH,
+                }
+        self._columns.update(PipeArray(self._columns['outer_diameter'],
+                                       self._columns['wall_thickness'],
+                                       material).properties(PROPERTIES))
+        #
+        # Distinct outer diameters for the nearest size, and a sorted index
+        # of each column for the range queries
+        self._diameters, first = np.unique(self._columns['outer_diameter'], return_index=True)
+        self._diameter_sizes = self._size[first]
+        self._index = {}
+        self._rows = {(size, schedule): row for row, (size, schedule)
+                      in enumerate(zip(self._size.tolist(), self._schedule.tolist()))}
+
+    def __len__(self):
+        return len(self._size)
+
+    def columns(self):
+        """Names of the columns that can be read and queried"""
+        return ['size', 'schedule'] + sorted(self._columns)
+
+    def column(self, name, rows=None):
+        """Return a column, or its values for some rows"""
+        if name == 'size':
+            values = self._size
+        elif name == 'schedule':
+            values = self._schedule
+        else:
+            values = self._columns[name]
+        return values if rows is None else values[rows]
+
+    # -------------------------------------------------------------------------
+    # Queries
+    # -------------------------------------------------------------------------
+    def row(self, size, schedule):
+        """Row of a nominal size and schedule"""
+        key = (nominal_size(size), schedule_name(schedule))
+        if key not in self._rows:
+            raise ValueError("No schedule {} for nominal size {}".format(schedule, size))
+        return self._rows[key]
+
+    def schedules(self, size):
+        """Rows of every schedule of a nominal size, thinnest first"""
+        np = numpy()
+        return np.flatnonzero(self._size == nominal_size(size))
+
+    def nearest_size(self, outer_diameter):
+        """Nominal size with the outer diameter (m) nearest the given one(s)"""
+        np = numpy()
+        diameters = self._diameters
+        upper = np.clip(np.searchsorted(diameters, outer_diameter), 1, len(diameters) - 1)
+        lower = upper - 1
+        nearest = np.where(np.abs(diameters[lower] - outer_diameter) <= np.abs(diameters[upper] - outer_diameter),
+                           lower, upper)
+        sizes = self._diameter_sizes[nearest]
+        return sizes.tolist() if np.ndim(sizes) else str(sizes)
+
+    def select(self, **ranges):
+        """
+        Return the rows, in catalogue order, with every named column within
+        its (minimum, maximum) range, None for an open end, e.g.
+
+            catalogue.select(pressure_internal_limit=(20e6, None), mass_steel=(None, 80.0))
+        """
+        np = numpy()
+        selected = None
+        for name, (minimum, maximum) in ranges.items():
+            order, values = self._sorted(name)
+            start = 0 if minimum is None else np.searchsorted(values, minimum, 'left')
+            stop = len(values) if maximum is None else np.searchsorted(values, maximum, 'right')
+            rows = order[start:stop]
+            if selected is None:
+                selected = np.zeros(len(self), dtype=bool)
+                selected[rows] = True
+            else:
+                mask = np.zeros(len(self), dtype=bool)
+                mask[rows] = True
+                selected &= mask
+        if selected is None:
+            return np.arange(len(self))
+        return np.flatnonzero(selected)
+
+    def _sorted(self, name):
+        """Sorted index of a column, made on first use"""
+        if name not in self._index:
+            values = self.column(name)
+            order = numpy().argsort(values, kind='stable')
+            self._index[name] = (order, values[order])
+        return self._index[name]
+
+    # -------------------------------------------------------------------------
+    # Results
+    # -------------------------------------------------------------------------
+    def pipes(self, rows):
+        """Return a Pipe for each row"""
+        from .pipe import Pipe
+        return [Pipe(float(self._columns['outer_diameter'][row]),
+                     float(self._columns['wall_thickness'][row]), self._material)
+                for row in numpy().atleast_1d(rows).tolist()]
+
+    def pipe_array(self, rows=None):
+        """Return the rows as a PipeArray"""
+        from .pipe_array import PipeArray
+        return PipeArray(self.column('outer_diameter', rows), self.column('wall_thickness', rows),
+                         self._material)
+
+    def table(self, rows=None):
+        """Return a dictionary of every column for the rows"""
+        return {name: self.column(name, rows) for name in self.columns()}
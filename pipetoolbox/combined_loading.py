@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Combined loading checks over dynamic analysis time series
+
+The von Mises equivalent stress of the pipe wall follows API RP 2RD:
+
+    axial   sa = Tw / As +- M / Z,   Tw = Te + pi Ai - pe Ao
+    hoop    sh = (pi Di - pe Do) / 2t
+    radial  sr = -(pi + pe) / 2
+    svm     = sqrt(((sh - sr)^2 + (sr - sa)^2 + (sa - sh)^2) / 2)
+
+with the effective tension Te, bending moment M and the internal and external
+pressures pi and pe. Of the two bending fibres the one with the axial stress
+furthest from the mean of the hoop and radial stress governs. The utilisation
+is svm divided by the allowable stress Cf Ca yield, the design factor Ca is
+2/3 and the case factor Cf is 1.0 for operating, 1.2 for extreme and 1.5 for
+survival conditions.
+
+Time series are arrays with one row per time step and one column per node,
+usually memory mapped .npy files. They are read in blocks of rows so the
+memory used does not depend on the length of the analysis.
+"""
+
+from collections import namedtuple
+
+import numpy as np
+
+TimeSeriesResult = namedtuple('TimeSeriesResult', [
+        'utilisation',      # maximum utilisation of each node
+        'time_index',       # time step of the maximum
+        'time',             # time of the maximum, None without times
+        'thresholds',
+        'exceedances',      # steps above each threshold, thresholds x nodes
+        'upcrossings',      # times each threshold is crossed upwards
+        'steps',
+        ])
+
+def _section(section, design_factor, case_factor, temperature=None):
+    """Per node constants of a Pipe or PipeArray section"""
+    allowable = case_factor * design_factor * section.yield_stress(temperature)
+    return {
+            'area_steel': section.area_steel(),
+            'modulus': section.second_moment() / section.radius_outer(),
+            'area_inner': section.area_inner(),
+            'area_outer': section.area_outer(),
+            'diameter_inner': section.diameter_inner(),
+            'diameter_outer': section.diameter_outer(),
+            'wall_thickness': section.wall_thickness(),
+            'allowable': allowable,
+            }
+
+def _utilisation(constants, tension, moment, pressure_internal, pressure_external):
+    """Utilisation for arrays broadcast against the section constants"""
+    hoop = (pressure_internal * constants['diameter_inner']
+            - pressure_external * constants['diameter_outer']) / (2.0 * constants['wall_thickness'])
+    radial = -0.5 * (pressure_internal + pressure_external)
+    #
+    # With d the axial stress less the mean of the hoop and radial stress and
+    # h half their difference the von Mises stress is sqrt(d^2 + 3 h^2), the
+    # governing fibre has |d| increased by the bending stress
+    offset = (pressure_internal * constants['area_inner']
+              - pressure_external * constants['area_outer']) / constants['area_steel'] - 0.5 * (hoop + radial)
+    half = 0.5 * (hoop - radial)
+    stress = np.abs(tension / constants['area_steel'] + offset)
+    stress = stress + np.abs(moment) / constants['modulus']
+    stress = stress * stress + 3.0 * (half * half)
+    utilisation = np.sqrt(stress)
+    utilisation /= constants['allowable']
+    return utilisation
+
+def combined_utilisation(section, tension, moment, pressure_internal=0.0, pressure_external=0.0,
+                         design_factor=2.0 / 3.0, case_factor=1.0, temperature=None):
+    """
+    Return the von Mises utilisation of a Pipe or PipeArray section for the
+    effective tension (N), moment (Nm) and pressures (Pa), all broadcast
+    together. The yield stress is derated for the temperature if given.
+    """
+    constants = _section(section, design_factor, case_factor, temperature)
+    return _utilisation(constants, np.asarray(tension, dtype=float), np.asarray(moment, dtype=float),
+                        np.asarray(pressure_internal, dtype=float), np.asarray(pressure_external, dtype=float))
+
+def _open(series):
+    """Memory map a .npy file name, pass arrays through"""
+    if isinstance(series, str):
+        return np.load(series, mmap_mode='r')
+    return series
+
+def _rows(series, start, stop):
+    """The rows of a time series, constants and per node values as they are"""
+    if np.ndim(series) == 2:
+        return np.asarray(series[start:stop], dtype=float)
+    return series
+
+def check_time_series(section, tension, moment, pressure_internal=0.0, pressure_external=0.0,
+                      time=None, thresholds=(1.0,), design_factor=2.0 / 3.0, case_factor=1.0,
+                      temperature=None, chunk_size=None):
+    """
+    Evaluate the utilisation of every node at every time step and return the
+    maximum of each node with the step and time it occurs, and for each
+    threshold the number of steps above it and the number of upcrossings.
+
+    The series are (steps, nodes) arrays or .npy file names, which are memory
+    mapped. The pressures may also be constants or one value per node. The
+    section is a Pipe, or a PipeArray with one section per node. Rows are
+    read chunk_size at a time, by default about 65000 values so the
+    temporaries stay in cache.
+    """
+    tension = _open(tension)
+    moment = _open(moment)
+    pressure_internal = _open(pressure_internal)
+    pressure_external = _open(pressure_external)
+    steps, nodes = np.shape(tension)
+    if chunk_size is None:
+        chunk_size = max(1, 2**16 // max(nodes, 1))
+    thresholds = np.atleast_1d(np.asarray(thresholds, dtype=float))
+    #
+    constants = _section(section, design_factor, case_factor, temperature)
+    maximum = np.full(nodes, -np.inf)
+    time_index = np.zeros(nodes, dtype=np.intp)
+    exceedances = np.zeros((len(thresholds), nodes), dtype=np.int64)
+    upcrossings = np.zeros((len(thresholds), nodes), dtype=np.int64)
+    previous = np.zeros((len(thresholds), nodes), dtype=bool)
+    #
+    for start in range(0, steps, chunk_size):
+        stop = min(start + chunk_size, steps)
+        utilisation = _utilisation(constants, _rows(tension, start, stop), _rows(moment, start, stop),
+                                   _rows(pressure_internal, start, stop), _rows(pressure_external, start, stop))
+        utilisation = np.broadcast_to(utilisation, (stop - start, nodes))
+        #
+        # Keep the first occurrence of the maximum
+        chunk_index = np.argmax(utilisation, axis=0)
+        chunk_maximum = utilisation[chunk_index, np.arange(nodes)]
+        larger = chunk_maximum > maximum
+        maximum[larger] = chunk_maximum[larger]
+        time_index[larger] = start + chunk_index[larger]
+        #
+        for row, threshold in enumerate(thresholds):
+            above = utilisation > threshold
+            exceedances[row] += np.count_nonzero(above, axis=0)
+            upcrossings[row] += above[0] & ~previous[row]
+            upcrossings[row] += np.count_nonzero(above[1:] & ~above[:-1], axis=0)
+            previous[row] = above[-1]
+    #
+    times = None if time is None else np.asarray(_open(time))[time_index]
+    return TimeSeriesResult(maximum, time_index, times, thresholds, exceedances, upcrossings, steps)
@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Temperature derating of the material yield stress and Youngs modulus
+
+Each material may have a derating curve, the factors on the room temperature
+yield stress and Youngs modulus at a list of temperatures (degC), linear in
+between and held constant outside the curve. Materials without a curve are
+not derated.
+
+The curves are compiled into one table sampled on an even temperature grid,
+one row per material, so a lookup is an index and one linear interpolation
+whatever the number of points on the curve. The grid covers -50 to 400 degC
+and is extended to the knots of every registered curve. The knots must be
+whole degrees, so with the 1 degC grid the table reproduces the curves. Python
+numbers are interpolated with plain Python, arrays of temperatures and
+materials are interpolated in one vectorised gather.
+
+The default curves are indicative: carbon-manganese steel follows the
+DNV-ST-F101 yield derating and the ASME B31.3 modulus ratios, stainless
+steel the ASME ratios for austenitic grades. Register project data with
+register_derating.
+"""
+
+import itertools
+import math
+
+from .backend import numpy
+
+# Temperature grid of the compiled tables, degC, at least this range
+GRID_START = -50.0
+GRID_STEP = 1.0
+GRID_POINTS = 451
+
+# Derating curves, (temperature degC, factor) for the yield stress and the
+# Youngs modulus
+_CARBON_STEEL = {
+        'yield': ((50.0, 1.0), (100.0, 0.9163), (200.0, 0.8047), (300.0, 0.7280)),
+        'youngs': ((21.0, 1.0), (93.0, 0.976), (149.0, 0.959), (204.0, 0.939),
+                   (260.0, 0.925), (316.0, 0.905)),
+        }
+_STAINLESS_STEEL = {
+        'yield': ((20.0, 1.0), (100.0, 0.850), (200.0, 0.750), (300.0, 0.690)),
+        'youngs': ((21.0, 1.0), (93.0, 0.975), (149.0, 0.954), (204.0, 0.936),
+                   (260.0, 0.912), (316.0, 0.894)),
+        }
+
+def derating_default():
+    """Return a dictionary of the default derating curves by material name"""
+    return {
+        'default': _CARBON_STEEL,
+        'steel': _CARBON_STEEL,
+        'steel x52': _CARBON_STEEL,
+        'stainless steel': _STAINLESS_STEEL,
+        }
+
+_curves = derating_default()
+
+# Compiled table, built on first use and rebuilt when a curve is registered
+_table = None
+
+def register_derating(name, temperatures, yield_factors, youngs_factors=None):
+    """
+    Add or replace the derating curve of a material. The temperatures (degC)
+    must increase and fall on the GRID_STEP grid, whole degrees, the Youngs
+    modulus is not derated if no factors are given.
+    """
+    global _table
+    temperatures = [float(temperature) for temperature in temperatures]
+    if any(upper <= lower for lower, upper in zip(temperatures, temperatures[1:])):
+        raise ValueError("Derating temperatures must increase")
+    for temperature in temperatures:
+        if (temperature - GRID_START) / GRID_STEP != round((temperature - GRID_START) / GRID_STEP):
+            raise ValueError("Derating temperature {} is not on the {} degC grid".format(temperature, GRID_STEP))
+    if youngs_factors is None:
+        youngs_factors = [1.0] * len(temperatures)
+    if not len(temperatures) == len(yield_factors) == len(youngs_factors):
+        raise ValueError("Derating curve needs one factor per temperature")
+    _curves[name] = {
+            'yield': tuple(zip(temperatures, map(float, yield_factors))),
+            'youngs': tuple(zip(temperatures, map(float, youngs_factors))),
+            }
+    _table = None
+
+def _sample(curve, temperature):
+    """Linear interpolation of a curve, constant beyond the ends"""
+    if temperature <= curve[0][0]:
+        return curve[0][1]
+    for (lower, lower_factor), (upper, upper_factor) in zip(curve, curve[1:]):
+        if temperature <= upper:
+            return lower_factor + (upper_factor - lower_factor) * (temperature - lower) / (upper - lower)
+    return curve[-1][1]
+
+class _Table(object):
+    """
+    The curves sampled on the grid, row 0 is the row for no derating. Rows
+    follow the order the curves were added, so a row stays valid when a
+    curve is added or replaced.
+    """
+    def __init__(self, curves):
+        # Extend the grid to the first and last knot of every curve
+        knots = [knot for curve in curves.values() for kind in ('yield', 'youngs')
+                 for knot, _ in curve[kind]]
+        self.start = min([GRID_START] + knots)
+        stop = max([GRID_START + GRID_STEP * (GRID_POINTS - 1)] + knots)
+        self.points = int(round((stop - self.start) / GRID_STEP)) + 1
+        grid = [self.start + GRID_STEP * index for index in range(self.points)]
+        self.rows = {name: row for row, name in enumerate(curves, 1)}
+        self.names = ['none'] + list(curves)
+        self.values = {'yield': [[1.0] * self.points], 'youngs': [[1.0] * self.points]}
+        for name in curves:
+            for kind in ('yield', 'youngs'):
+                self.values[kind].append([_sample(curves[name][kind], temperature) for temperature in grid])
+        self._arrays = {}
+
+    def array(self, kind):
+        """The table as a flat NumPy array, made on first vectorised use"""
+        if kind not in self._arrays:
+            self._arrays[kind] = numpy().array(self.values[kind], dtype=float).ravel()
+        return self._arrays[kind]
+
+def _compiled():
+    global _table
+    if _table is None:
+        _table = _Table(_curves)
+    return _table
+
+def material_rows(material):
+    """
+    Return the table row of a material name, or an array of rows for a
+    sequence of names. Rows already looked up are returned as they are.
+    """
+    rows = _compiled().rows
+    if isinstance(material, str):
+        return rows.get(material, 0)
+    if type(material) is int:
+        return material
+    np = numpy()
+    if np.issubdtype(np.asarray(material).dtype, np.integer):
+        return np.asarray(material, dtype=np.intp)
+    if isinstance(material, np.ndarray):
+        shape = material.shape
+        material = material.ravel().tolist()
+    else:
+        material = list(material)
+        shape = (len(material),)
+    return np.fromiter(map(rows.get, material, itertools.repeat(0)),
+                       dtype=np.intp, count=len(material)).reshape(shape)
+
+def material_name(row):
+    """Return the material name of a table row, 'custom' for no derating"""
+    return _compiled().names[row] if row else 'custom'
+
+def _interpolate(kind, rows, temperature):
+    """Factor for table rows (int or array) at the temperatures"""
+    table = _compiled()
+    if type(temperature) in (float, int) and type(rows) is int:
+        position = min(max((temperature - table.start) / GRID_STEP, 0.0), table.points - 1.0)
+        index = min(int(math.floor(position)), table.points - 2)
+        fraction = position - index
+        lower, upper = table.values[kind][rows][index:index + 2]
+        return lower + fraction * (upper - lower)
+    #
+    np = numpy()
+    position = np.clip((np.asarray(temperature, dtype=float) - table.start) / GRID_STEP, 0.0, table.points - 1.0)
+    index = np.minimum(np.floor(position).astype(np.intp), table.points - 2)
+    fraction = position - index
+    flat = np.asarray(rows) * table.points + index
+    values = table.array(kind)
+    lower = values[flat]
+    upper = values[flat + 1]
+    return lower + fraction * (upper - lower)
+
+def yield_factor(material, temperature):
+    """
+    Factor on the yield stress of the material(s) at the temperature(s), degC.
+    The material may be a name, a sequence of names or rows from material_rows.
+    """
+    return _interpolate('yield', material_rows(material), temperature)
+
+def youngs_factor(material, temperature):
+    """Factor on the Youngs modulus of the material(s) at the temperature(s), degC"""
+    return _interpolate('youngs', material_rows(material), temperature)
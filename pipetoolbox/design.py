@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Lightest pipe section meeting a set of design loads
+
+Every limit state on Pipe increases with the wall thickness for a given outer
+diameter, so the thinnest feasible wall for each diameter follows in closed
+form from the required tension, moment, pressure and buckling load. The grid
+is searched at that wall thickness only, which prunes every thinner
+(infeasible) and thicker (heavier) candidate without evaluating it.
+"""
+
+import numpy as np
+
+from .materials import MaterialRecord, _registry, material_record
+from .pipe import Pipe
+from .pipe import euler_factor as _euler_factor
+from .pipe_array import PipeArray
+
+def _thinnest_wall(outer_diameter, tension, moment, pressure, buckling_load,
+                   euler_factor, length, safety_factors, record):
+    """
+    Return the thinnest wall thickness meeting every load for each outer
+    diameter, infinite where the diameter cannot carry the loads
+    """
+    tension_factor, bending_factor, pressure_factor = safety_factors
+    diameter_squared = outer_diameter * outer_diameter
+    diameter_fourth = diameter_squared * diameter_squared
+    wall = np.zeros_like(outer_diameter)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        # Tension, steel area
+        area = tension / (tension_factor * record.yield_stress)
+        inner_squared = diameter_squared - 4.0 * area / np.pi
+        wall = np.maximum(wall, 0.5 * (outer_diameter - np.sqrt(inner_squared)))
+        # Bending and buckling, second moment of area
+        second_moment = np.maximum(
+                moment * 0.5 * outer_diameter / (bending_factor * record.yield_stress),
+                buckling_load * length * length / (euler_factor * np.pi**2.0 * record.youngs_modulus))
+        inner_fourth = diameter_fourth - 64.0 * second_moment / np.pi
+        wall = np.maximum(wall, 0.5 * (outer_diameter - np.sqrt(np.sqrt(inner_fourth))))
+        # Burst
+        wall = np.maximum(wall, pressure * outer_diameter / (2.0 * pressure_factor * record.yield_stress))
+    wall[np.isnan(wall)] = np.inf
+    return wall
+
+def design_optimize(outer_diameters, wall_thicknesses, materials=None,
+                    tension=0.0, moment=0.0, pressure=0.0, buckling_load=0.0,
+                    end_conditions='fixed', safety_factor=1.0,
+                    objective='mass_steel', template=None):
+    """
+    Return the lightest Pipe over the grid of outer diameters, wall
+    thicknesses and materials that meets the required tension, bending
+    moment, internal pressure and Euler buckling load, or None when no
+    candidate is feasible.
+
+    The safety factor scales the capacities as in Pipe.tension_limit etc and
+    may be one value or a (tension, bending, pressure) tuple. The objective is
+    'mass_steel' or 'mass_total'. Coatings, fluids and the buckling length are
+    taken from the template pipe. Materials default to the whole database.
+    """
+    if objective not in ('mass_steel', 'mass_total'):
+        raise ValueError("Unknown objective {}".format(objective))
+    if np.ndim(safety_factor) == 0:
+        safety_factors = (safety_factor,) * 3
+    else:
+        safety_factors = tuple(safety_factor)
+    if template is None:
+        template = Pipe()
+    if materials is None:
+        materials = sorted(_registry)
+    #
+    outer_diameters = np.unique(np.asarray(outer_diameters, dtype=float))
+    wall_thicknesses = np.unique(np.asarray(wall_thicknesses, dtype=float))
+    euler_factor = _euler_factor(end_conditions)
+    length = template.length()
+    #
+    best = None
+    for material in materials:
+        if isinstance(material, MaterialRecord):
+            record = material
+        else:
+            record = material_record(material)
+            if record is None:
+                raise ValueError("Unknown material {}".format(material))
+        #
+        # Closed form estimate of the thinnest wall, then prune the diameters
+        # that cannot be made to work with any wall in the grid
+        wall = _thinnest_wall(outer_diameters, tension, moment, pressure, buckling_load,
+                              euler_factor, length, safety_factors, record)
+        index = np.searchsorted(wall_thicknesses, wall)
+        keep = index < len(wall_thicknesses)
+        diameters = outer_diameters[keep]
+        index = index[keep]
+        #
+        # Confirm exactly with the Pipe expressions either side of the estimate
+        chosen = np.full(len(diameters), len(wall_thicknesses))
+        for offset in (1, 0, -1):
+            trial = np.clip(index + offset, 0, len(wall_thicknesses) - 1)
+            feasible = _feasible(diameters, wall_thicknesses[trial], record, template,
+                                 tension, moment, pressure, buckling_load,
+                                 end_conditions, safety_factors)
+            chosen = np.where(feasible, np.minimum(chosen, trial), chosen)
+        keep = chosen < len(wall_thicknesses)
+        diameters = diameters[keep]
+        chosen = chosen[keep]
+        if not len(diameters):
+            continue
+        #
+        # The steel mass always increases with the wall, the total mass only
+        # when the steel is denser than the contents
+        if objective == 'mass_total' and record.density < template._internal_fluid.density:
+            candidate = _best_over_walls(diameters, chosen, wall_thicknesses, record,
+                                         template, objective)
+        else:
+            candidate = _best_over_walls(diameters, chosen, wall_thicknesses, record,
+                                         template, objective, first_only=True)
+        if best is None or candidate[0] < best[0]:
+            best = candidate + (record,)
+    #
+    if best is None:
+        return None
+    pipe = Pipe(best[1], best[2])
+    pipe.material(best[3])
+    pipe.coatings(*template._coatings)
+    pipe.internal_fluid(*template._internal_fluid)
+    pipe.external_fluid(*template._external_fluid)
+    pipe.length(length)
+    return pipe
+
+def _batch(diameters, walls, record, template):
+    """Build a PipeArray of candidates sharing the template settings"""
+    return PipeArray(diameters, walls,
+                     coatings_thickness=template._coatings.thickness,
+                     coatings_density=template._coatings.density,
+                     internal_fluid_density=template._internal_fluid.density,
+                     external_fluid_density=template._external_fluid.density,
+                     length=template.length(),
+                     yield_stress=record.yield_stress,
+                     youngs_modulus=record.youngs_modulus,
+                     density=record.density)
+
+def _feasible(diameters, walls, record, template, tension, moment, pressure,
+              buckling_load, end_conditions, safety_factors):
+    """Check each candidate against the loads with the Pipe expressions"""
+    batch = _batch(diameters, walls, record, template)
+    tension_factor, bending_factor, pressure_factor = safety_factors
+    return ((2.0 * walls < diameters)
+            & (batch.tension_limit(tension_factor) >= tension)
+            & (batch.bending_limit(bending_factor) >= moment)
+            & (batch.pressure_internal_limit(pressure_factor) >= pressure)
+            & (batch.euler_load(end_conditions) >= buckling_load))
+
+def _best_over_walls(diameters, chosen, wall_thicknesses, record, template,
+                     objective, first_only=False):
+    """
+    Return (mass, outer diameter, wall thickness) of the lightest candidate,
+    either at the thinnest feasible wall or over every feasible wall
+    """
+    if first_only:
+        walls = wall_thicknesses[chosen]
+        grid_diameters = diameters
+    else:
+        grid_diameters, walls = np.meshgrid(diameters, wall_thicknesses, indexing='ij')
+        feasible = (np.arange(len(wall_thicknesses)) >= chosen[:, None]) & (2.0 * walls < grid_diameters)
+        grid_diameters = grid_diameters[feasible]
+        walls = walls[feasible]
+    mass = getattr(_batch(grid_diameters, walls, record, template), objective)()
+    best = np.argmin(mass)
+    return (mass[best], float(grid_diameters[best]), float(walls[best]))
@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Structured array export of pipe properties
+
+The properties of a PipeArray are written into a NumPy structured array, one
+float64 field per property and one record per section, see
+PipeArray.to_records. Saved as a .npy file the array is written through a
+memory map a block of sections at a time and read back as a memory map, so
+neither side holds a second copy or any Python objects. Each field is a
+strided view of the same buffer, and the array supports the buffer protocol
+for tools that share it directly.
+
+    records = save_properties('sections.npy', batch, ('area_steel', 'mass_total'))
+    records = load_properties('sections.npy')
+    records['mass_total'].max()
+"""
+
+import numpy as np
+
+from .pipe_array import PROPERTIES, property_dtype
+
+def save_properties(filename, batch, names=PROPERTIES, safety_factor=1.0, end_conditions='fixed',
+                    temperature=None, chunk_size=1000000):
+    """
+    Evaluate the properties of a PipeArray straight into a memory mapped .npy
+    file and return the memory map. A 1-d array is evaluated chunk_size
+    sections at a time, the temperatures may then be one per section.
+    """
+    records = np.lib.format.open_memmap(filename, mode='w+', dtype=property_dtype(names), shape=batch.shape)
+    if len(batch.shape) != 1:
+        batch.to_records(names, safety_factor, end_conditions, temperature, out=records)
+    else:
+        for start in range(0, batch.shape[0], chunk_size):
+            stop = min(start + chunk_size, batch.shape[0])
+            part_temperature = temperature
+            if np.ndim(temperature) == 1:
+                part_temperature = temperature[start:stop]
+            batch.sections(start, stop).to_records(names, safety_factor, end_conditions, part_temperature,
+                                                   out=records[start:stop])
+    records.flush()
+    return records
+
+def load_properties(filename, mmap_mode='r'):
+    """Return the structured array of a saved .npy file as a memory map"""
+    return np.load(filename, mmap_mode=mmap_mode)
+
+def property_columns(records):
+    """Return a dictionary of the fields of a structured array, as views"""
+    return {name: records[name] for name in records.dtype.names}
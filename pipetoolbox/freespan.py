@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Free span screening of survey span data
+
+Each span has a length and end conditions. The end conditions are turned into
+integer codes once and every factor is read from a lookup table by code, so a
+pipeline of any number of spans is screened in one pass of array operations.
+
+For each span the Euler load and the first natural frequency of the beam are
+
+    P  = k pi^2 E I / L^2
+    f  = (C / 2 pi) sqrt(E I / (me L^4)) sqrt(1 + S / P)
+
+with k the Euler factor and C = (beta L)^2 the first mode factor of the end
+conditions, S the effective axial force (tension positive) and me the mass
+per metre of the pipe, its contents and coatings plus the added mass of the
+displaced fluid times the added mass coefficient.
+
+A span fails when the compression exceeds the Euler load times the safety
+factor, or when the reduced velocity U / (f D) of the current exceeds the
+onset of vortex induced vibration. D is the external diameter.
+"""
+
+from collections import namedtuple
+
+import numpy as np
+
+from .pipe import EULER_FACTORS
+
+# First mode factor (beta L)^2 of a uniform beam for each end condition
+FREQUENCY_FACTORS = {
+        'fix-fix': 22.373,
+        'pin-fix': 15.418,
+        'pin-pin': np.pi**2.0,
+        'free-fix': 3.516,
+        'fixed': np.pi**2.0,
+        }
+
+# End conditions in code order and the factor lookup tables by code
+END_CONDITIONS = tuple(EULER_FACTORS)
+_CODES = {name: code for code, name in enumerate(END_CONDITIONS)}
+_EULER_TABLE = np.array([EULER_FACTORS[name] for name in END_CONDITIONS])
+_FREQUENCY_TABLE = np.array([FREQUENCY_FACTORS[name] for name in END_CONDITIONS])
+
+SpanResult = namedtuple('SpanResult', [
+        'euler_load',
+        'frequency',
+        'reduced_velocity',
+        'buckled',
+        'vortex',
+        'failed',
+        ])
+
+def end_condition_codes(end_conditions):
+    """Return the code of an end condition name, or an array of codes"""
+    try:
+        if isinstance(end_conditions, str):
+            return _CODES[end_conditions]
+        if isinstance(end_conditions, np.ndarray):
+            if np.issubdtype(end_conditions.dtype, np.integer):
+                return end_conditions
+            return np.fromiter(map(_CODES.__getitem__, end_conditions.ravel().tolist()),
+                               dtype=np.intp, count=end_conditions.size).reshape(end_conditions.shape)
+        return np.fromiter(map(_CODES.__getitem__, end_conditions), dtype=np.intp)
+    except KeyError as error:
+        raise ValueError("Unknown end conditions {}".format(error.args[0])) from None
+
+def screen_spans(pipe, lengths, end_conditions='pin-pin', axial_force=0.0, current_velocity=0.0,
+                 onset_reduced_velocity=1.0, added_mass_coefficient=1.0, safety_factor=1.0,
+                 temperature=None):
+    """
+    Return the Euler load (N), first natural frequency (Hz) and reduced
+    velocity of each span with the spans that buckle, that would see vortex
+    induced vibration and that fail either check.
+
+    The pipe is a Pipe, or a PipeArray with a section for each span. The
+    lengths (m), end conditions, axial force (N) and current velocity (m/s)
+    may each be one value or one per span. The Youngs modulus is derated for
+    the temperature if given.
+    """
+    lengths = np.asarray(lengths, dtype=float)
+    codes = end_condition_codes(end_conditions)
+    #
+    stiffness = pipe.youngs_modulus(temperature) * pipe.second_moment()
+    mass_total = pipe.mass_total()
+    mass = mass_total + added_mass_coefficient * (mass_total - pipe.mass_buoyant())
+    #
+    # Same expression order as Pipe.euler_load
+    length_squared = lengths * lengths
+    euler_load = _EULER_TABLE[codes] * np.pi**2.0 * pipe.youngs_modulus(temperature) \
+        * pipe.second_moment() / length_squared
+    with np.errstate(invalid='ignore'):
+        frequency = _FREQUENCY_TABLE[codes] / (2.0 * np.pi) \
+            * np.sqrt(stiffness / (mass * (length_squared * length_squared))) \
+            * np.sqrt(1.0 + axial_force / euler_load)
+    #
+    buckled = -np.asarray(axial_force) > safety_factor * euler_load
+    frequency = np.where(buckled, 0.0, frequency)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        reduced_velocity = np.abs(current_velocity) / (frequency * pipe.diameter_external())
+    reduced_velocity = np.where(np.asarray(current_velocity) == 0.0, 0.0, reduced_velocity)
+    vortex = reduced_velocity > onset_reduced_velocity
+    return SpanResult(euler_load, frequency, reduced_velocity, buckled, vortex, buckled | vortex)
@@ -0,0 +1,248 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Opt-in instrumentation of the Pipe and Materials methods
+
+While enabled, every method of the instrumented classes, including __init__,
+is replaced on the class by a wrapper that counts the calls and times them.
+For the cached Pipe properties, see pipe._cached, the wrapper also counts
+cache hits and misses. Disabling puts the original methods back, so there is
+no cost at all when instrumentation is off.
+
+    with instrument() as stats:
+        run_sizing()
+    stats.write_json('sizing.json')
+    stats.dump_stats('sizing.prof')
+
+The .prof file is in the cProfile format, pstats.Stats('sizing.prof') or
+tools such as snakeviz read it. The time of a method includes the methods it
+calls (cumulative), its own time excludes those that are instrumented.
+
+Setting the environment variable PIPETOOLBOX_INSTRUMENT to a file name
+enables instrumentation when the package is imported and writes the report
+at exit, in the cProfile format for a .prof or .pstats file and JSON
+otherwise. Each thread keeps its own call stack, so own times and callers
+stay correct when the instrumented code runs in threads.
+"""
+
+import functools
+import threading
+import time
+
+ENVIRONMENT_VARIABLE = 'PIPETOOLBOX_INSTRUMENT'
+
+class _MethodStats(object):
+    """Counters of one instrumented method"""
+    __slots__ = ('primitive_calls', 'calls', 'own_time', 'time', 'callers',
+                 'cache_hits', 'cache_misses')
+
+    def __init__(self):
+        self.primitive_calls = 0
+        self.calls = 0
+        self.own_time = 0.0
+        self.time = 0.0
+        self.callers = {}
+        self.cache_hits = 0
+        self.cache_misses = 0
+
+def _default_classes():
+    from .materials import Materials
+    from .pipe import Pipe
+    return (Pipe, Materials)
+
+def _function_key(cls, name, function):
+    """The cProfile key (file, line, name) of the original function"""
+    while hasattr(function, '__wrapped__'):
+        function = function.__wrapped__
+    code = function.__code__
+    return (code.co_filename, code.co_firstlineno, '{}.{}'.format(cls.__name__, name))
+
+class Instrumentation(object):
+    """Call counts, times and cache statistics of the methods of some classes"""
+    def __init__(self, classes=None):
+        self._classes = tuple(classes or _default_classes())
+        self._stats = {}
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._originals = []
+        self._started = None
+        self._elapsed = 0.0
+
+    def __enter__(self):
+        self.enable()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.disable()
+
+    @property
+    def enabled(self):
+        return bool(self._originals)
+
+    # -------------------------------------------------------------------------
+    # Patching the classes
+    # -------------------------------------------------------------------------
+    def _wrap(self, key, function):
+        """Wrap a function to count and time its calls"""
+        stats = self._stats.setdefault(key, _MethodStats())
+        local = self._local
+        lock = self._lock
+        timer = time.perf_counter
+        slot = getattr(function, 'slot', None)
+        #
+        @functools.wraps(function)
+        def instrumented(*args, **kwargs):
+            # Each thread has its own call stack and count of active calls
+            try:
+                stack = local.stack
+                active = local.active
+            except AttributeError:
+                stack = local.stack = []
+                active = local.active = {}
+            hit = slot is not None and hasattr(args[0], slot)
+            caller = stack[-1][0] if stack else None
+            frame = [key, 0.0]
+            stack.append(frame)
+            active[key] = active.get(key, 0) + 1
+            start = timer()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                elapsed = timer() - start
+                stack.pop()
+                active[key] -= 1
+                own = elapsed - frame[1]
+                outermost = active[key] == 0
+                if stack:
+                    stack[-1][1] += elapsed
+                with lock:
+                    stats.calls += 1
+                    stats.own_time += own
+                    if outermost:
+                        stats.primitive_calls += 1
+                        stats.time += elapsed
+                    if slot is not None:
+                        if hit:
+                            stats.cache_hits += 1
+                        else:
+                            stats.cache_misses += 1
+                    if caller is not None:
+                        counts = stats.callers.get(caller)
+                        if counts is None:
+                            counts = stats.callers[caller] = [0, 0, 0.0, 0.0]
+                        counts[0] += outermost
+                        counts[1] += 1
+                        counts[2] += own
+                        counts[3] += elapsed if outermost else 0.0
+        return instrumented
+
+    def enable(self):
+        """Replace the methods of the classes with instrumented wrappers"""
+        if self._originals:
+            raise RuntimeError("Instrumentation is already enabled")
+        for cls in self._classes:
+            for name, attribute in list(vars(cls).items()):
+                if name.startswith('__') and name != '__init__':
+                    continue
+                if isinstance(attribute, (classmethod, staticmethod)):
+                    function = attribute.__func__
+                    wrapped = type(attribute)(self._wrap(_function_key(cls, name, function), function))
+                elif callable(attribute) and hasattr(attribute, '__code__'):
+                    wrapped = self._wrap(_function_key(cls, name, attribute), attribute)
+                else:
+                    continue
+                self._originals.append((cls, name, attribute))
+                setattr(cls, name, wrapped)
+        self._started = time.perf_counter()
+
+    def disable(self):
+        """Restore the original methods"""
+        if not self._originals:
+            return
+        for cls, name, attribute in reversed(self._originals):
+            setattr(cls, name, attribute)
+        self._originals = []
+        self._elapsed += time.perf_counter() - self._started
+        self._started = None
+        self._local = threading.local()
+
+    def reset(self):
+        """Discard the statistics collected so far"""
+        for stats in self._stats.values():
+            stats.__init__()
+        self._elapsed = 0.0
+        if self._started is not None:
+            self._started = time.perf_counter()
+
+    # -------------------------------------------------------------------------
+    # Reports
+    # -------------------------------------------------------------------------
+    def report(self):
+        """
+        Return the statistics of each method that was called, the method
+        taking the most time first, with the instrumented wall time
+        """
+        elapsed = self._elapsed
+        if self._started is not None:
+            elapsed += time.perf_counter() - self._started
+        methods = {}
+        for key, stats in sorted(self._stats.items(), key=lambda item: -item[1].time):
+            if not stats.calls:
+                continue
+            method = {'calls': stats.calls, 'time': stats.time, 'own_time': stats.own_time}
+            if stats.cache_hits or stats.cache_misses:
+                method['cache_hits'] = stats.cache_hits
+                method['cache_misses'] = stats.cache_misses
+            methods[key[2]] = method
+        return {'elapsed': elapsed, 'methods': methods}
+
+    def write_json(self, filename):
+        """Write the report to a JSON file"""
+        import json
+        with open(filename, 'w') as json_file:
+            json.dump(self.report(), json_file, indent=2)
+
+    def create_stats(self):
+        """
+        Set the stats attribute in the cProfile format, this is the interface
+        pstats.Stats uses so pstats.Stats(instrumentation) works directly
+        """
+        self.stats = {key: (stats.primitive_calls, stats.calls, stats.own_time, stats.time,
+                            {caller: tuple(counts) for caller, counts in stats.callers.items()})
+                      for key, stats in self._stats.items() if stats.calls}
+
+    def dump_stats(self, filename):
+        """Write the statistics to a file in the cProfile format"""
+        import marshal
+        self.create_stats()
+        with open(filename, 'wb') as stats_file:
+            marshal.dump(self.stats, stats_file)
+
+    def save(self, filename):
+        """Write the cProfile format for a .prof or .pstats file, JSON otherwise"""
+        if filename.endswith(('.prof', '.pstats')):
+            self.dump_stats(filename)
+        else:
+            self.write_json(filename)
+
+def instrument(classes=None):
+    """
+    Return an Instrumentation of the Pipe and Materials methods, or of the
+    given classes, to use as a context manager or enable() and disable()
+    """
+    return Instrumentation(classes)
+
+def instrument_from_environment():
+    """
+    Enable instrumentation if PIPETOOLBOX_INSTRUMENT names a report file,
+    the report is saved at exit. Returns the Instrumentation or None.
+    """
+    import atexit
+    import os
+    filename = os.environ.get(ENVIRONMENT_VARIABLE)
+    if not filename:
+        return None
+    instrumentation = instrument()
+    instrumentation.enable()
+    atexit.register(instrumentation.save, filename)
+    return instrumentation
@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Streaming evaluation of pipe line lists
+
+A line list is a CSV or TSV file with a header row and one pipe per row.
+Units are SI. The columns are
+
+    tag, od, wt                   required
+    material                      name in the materials database
+    coatings_thickness, coatings_density,
+    internal_fluid_density, external_fluid_density, length
+                                  optional, blank or missing uses the Pipe default
+
+Blank rows are skipped and a row that stops short of the last columns takes
+their defaults. A row with more fields than the header, a column that is not
+one of the above or a file with no header row is an error.
+
+The file is read in chunks of rows, each chunk is evaluated as one PipeArray
+and written out before the next is read, so memory does not depend on the
+size of the file. Each material name is looked up once.
+
+Command line:
+
+    python -m pipetoolbox.linelist lines.csv results.csv --properties area_steel,mass_total
+"""
+
+import argparse
+import csv
+import itertools
+import sys
+import time
+
+import numpy as np
+
+from .materials import material_record
+from .pipe_array import PROPERTIES, PipeArray
+
+# Optional numeric columns and their defaults, as for Pipe
+OPTIONAL_COLUMNS = (
+        ('coatings_thickness', 0.0),
+        ('coatings_density', 0.0),
+        ('internal_fluid_density', 1000.0),
+        ('external_fluid_density', 1025.0),
+        ('length', 1.0),
+        )
+
+# Every column a line list may have, blank header cells are ignored
+COLUMNS = ('tag', 'od', 'wt', 'material') + tuple(name for name, _ in OPTIONAL_COLUMNS)
+
+DEFAULT_PROPERTIES = ('area_steel', 'second_moment', 'mass_total',
+                      'tension_limit', 'bending_limit', 'pressure_internal_limit')
+
+def process_line_list(input_file, output_file, properties=DEFAULT_PROPERTIES,
+                      chunk_size=50000, delimiter=None, safety_factor=1.0,
+                      end_conditions='fixed'):
+    """
+    Read the line list, evaluate the properties of every row and write the
+    tag and the properties to the output file. Files may be names or open
+    text files. Returns the number of rows.
+    """
+    for name in properties:
+        if name not in PROPERTIES:
+            raise ValueError("Unknown property {}".format(name))
+    if delimiter is None:
+        delimiter = '\t' if str(getattr(input_file, 'name', input_file)).endswith('.tsv') else ','
+    #
+    with _open(input_file, 'r') as source, _open(output_file, 'w') as target:
+        reader = csv.reader(source, delimiter=delimiter)
+        header = next(reader, None)
+        if header is None:
+            raise ValueError("Line list has no header row")
+        header = [column.strip().lower() for column in header]
+        for required in ('tag', 'od', 'wt'):
+            if required not in header:
+                raise ValueError("Line list has no {} column".format(required))
+        unknown = [name for name in header if name and name not in COLUMNS]
+        if unknown:
+            raise ValueError("Line list has unknown columns {}".format(', '.join(unknown)))
+        columns = {name: header.index(name) for name in header}
+        #
+        writer = csv.writer(target, delimiter=delimiter, lineterminator='\n')
+        writer.writerow(['tag'] + list(properties))
+        materials = {}
+        rows = 0
+        records = _records(reader, len(header))
+        while True:
+            chunk = list(itertools.islice(records, chunk_size))
+            if not chunk:
+                break
+            tags, results = _evaluate(chunk, columns, materials, properties,
+                                      safety_factor, end_conditions)
+            _write_rows(target, writer, delimiter, tags,
+                        [list(map(repr, results[name].tolist())) for name in properties])
+            rows += len(chunk)
+    return rows
+
+def _records(reader, width):
+    """
+    Rows of the line list padded to the header width, so omitted trailing
+    columns take their defaults. Blank rows are skipped.
+    """
+    for row in reader:
+        if len(row) == width and any(row):
+            yield row
+        elif not ''.join(row).strip():
+            continue
+        elif len(row) < width:
+            yield row + [''] * (width - len(row))
+        else:
+            raise ValueError("Line list row {} has {} columns, the header has {}".format(
+                    reader.line_num, len(row), width))
+
+def _evaluate(chunk, columns, materials, properties, safety_factor, end_conditions):
+    """Evaluate one chunk of rows, returning the tags and the property arrays"""
+    fields = list(zip(*chunk))
+    #
+    def numbers(name, default=None):
+        if name not in columns:
+            return default
+        values = fields[columns[name]]
+        if default is not None:
+            values = [value.strip() or default for value in values]
+        return np.array(values, dtype=float)
+    #
+    if 'material' in columns:
+        names = fields[columns['material']]
+        for name in set(names).difference(materials):
+            record = material_record(name.strip() or 'default')
+            if record is None:
+                raise ValueError("Unknown material {}".format(name))
+            materials[name] = (record.yield_stress, record.youngs_modulus, record.density)
+        material_columns = np.array([materials[name] for name in names], dtype=float).T
+    else:
+        record = material_record('default')
+        material_columns = (record.yield_stress, record.youngs_modulus, record.density)
+    #
+    batch = PipeArray(numbers('od'), numbers('wt'),
+                      yield_stress=material_columns[0],
+                      youngs_modulus=material_columns[1],
+                      density=material_columns[2],
+                      **{name: numbers(name, default) for name, default in OPTIONAL_COLUMNS})
+    return fields[columns['tag']], batch.properties(properties, safety_factor, end_conditions)
+
+def _write_rows(target, writer, delimiter, tags, columns):
+    """
+    Write the tags and the formatted columns, the csv writer is only needed
+    when a tag has to be quoted
+    """
+    joined = ''.join(tags)
+    if any(character in joined for character in (delimiter, '"', '\n', '\r')):
+        writer.writerows(zip(tags, *columns))
+    else:
+        target.write(''.join([delimiter.join(row) + '\n' for row in zip(tags, *columns)]))
+
+class _open(object):
+    """Open a file name, or pass an open file through without closing it"""
+    def __init__(self, file, mode):
+        self._file = file
+        self._mode = mode
+        self._opened = None
+
+    def __enter__(self):
+        if hasattr(self._file, 'read') or hasattr(self._file, 'write'):
+            return self._file
+        self._opened = open(self._file, self._mode, newline='')
+        return self._opened
+
+    def __exit__(self, *exc_info):
+        if self._opened is not None:
+            self._opened.close()
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Evaluate pipe properties for a line list")
+    parser.add_argument('input', help='CSV or TSV line list, - for stdin')
+    parser.add_argument('output', help='results file, - for stdout')
+    parser.add_argument('--properties', default=','.join(DEFAULT_PROPERTIES),
+                        help='comma separated Pipe properties')
+    parser.add_argument('--chunk-size', type=int, default=50000)
+    parser.add_argument('--delimiter', default=None)
+    parser.add_argument('--safety-factor', type=float, default=1.0)
+    parser.add_argument('--end-conditions', default='fixed')
+    args = parser.parse_args(argv)
+    #
+    input_file = sys.stdin if args.input == '-' else args.input
+    output_file = sys.stdout if args.output == '-' else args.output
+    start = time.perf_counter()
+    rows = process_line_list(input_file, output_file,
+                             properties=[name.strip() for name in args.properties.split(',')],
+                             chunk_size=args.chunk_size,
+                             delimiter=args.delimiter,
+                             safety_factor=args.safety_factor,
+                             end_conditions=args.end_conditions)
+    elapsed = time.perf_counter() - start
+    sys.stderr.write("{:d} rows in {:.3f} s, {:.0f} rows/s\n".format(rows, elapsed, rows / max(elapsed, 1e-9)))
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
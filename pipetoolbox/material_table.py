@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Column table of material records for property queries
+
+The numeric fields of the records are held as NumPy columns, missing values
+are NaN. The first query on a column sorts it once and keeps the order, so a
+range is two binary searches. A compound query finds the number of rows in
+each range from the sorted indexes, takes the narrowest range and checks the
+other ranges only on those rows.
+
+Columns are the MaterialRecord fields, or the ratio of two of them written
+'yield_stress/density', which is computed once and then indexed the same way.
+
+    table = MaterialTable.from_registry()
+    rows = table.select(youngs_modulus=(180e9, 220e9), density=(None, 8000.0))
+    table.display(table.sort(rows, 'yield_stress/density', descending=True))
+"""
+
+import csv
+import sys
+
+import numpy as np
+
+from .materials import MaterialRecord, _registry, youngs_modulus_reference
+
+# Numeric columns, the MaterialRecord fields other than name and notes
+COLUMNS = MaterialRecord._fields[1:-1]
+
+class MaterialTable(object):
+    """Materials as columns with a sorted index of each queried column"""
+    def __init__(self, records):
+        records = list(records)
+        self._records = records
+        self._names = [record.name for record in records]
+        values = np.array([[np.nan if value is None else value for value in record[1:7]]
+                           for record in records], dtype=float).reshape(-1, len(COLUMNS))
+        self._columns = {name: values[:, index] for index, name in enumerate(COLUMNS)}
+        self._index = {}
+
+    @classmethod
+    def from_registry(cls, databases=()):
+        """
+        Table of the shared registry of materials, followed by the materials
+        of each database that are not in the registry
+        """
+        records = dict(_registry)
+        for database in databases:
+            for record in database.records():
+                records.setdefault(record.name, record)
+        return cls(records.values())
+
+    @classmethod
+    def from_database(cls, database):
+        """Table of every record in a MaterialsDatabase"""
+        return cls(database.records())
+
+    @classmethod
+    def from_youngs_reference(cls):
+        """Table of the Youngs modulus reference values, other columns are NaN"""
+        return cls(MaterialRecord(name, None, None, None, youngs_modulus, None, None)
+                   for name, youngs_modulus in youngs_modulus_reference().items())
+
+    def __len__(self):
+        return len(self._records)
+
+    def column(self, name, rows=None):
+        """Return a column, or its values for some rows"""
+        if name not in self._columns:
+            numerator, _, denominator = name.partition('/')
+            if numerator not in COLUMNS or denominator not in COLUMNS:
+                raise ValueError("Unknown column {}".format(name))
+            with np.errstate(divide='ignore', invalid='ignore'):
+                self._columns[name] = self._columns[numerator] / self._columns[denominator]
+        values = self._columns[name]
+        return values if rows is None else values[rows]
+
+    def names(self, rows=None):
+        """Material names, of every row or the given rows"""
+        if rows is None:
+            return list(self._names)
+        return [self._names[row] for row in np.atleast_1d(rows).tolist()]
+
+    def records(self, rows=None):
+        """Material records, of every row or the given rows"""
+        if rows is None:
+            return list(self._records)
+        return [self._records[row] for row in np.atleast_1d(rows).tolist()]
+
+    # -------------------------------------------------------------------------
+    # Queries
+    # -------------------------------------------------------------------------
+    def _sorted(self, name):
+        """Sorted order, sorted values and number of values that are not NaN"""
+        if name not in self._index:
+            values = self.column(name)
+            order = np.argsort(values, kind='stable')
+            self._index[name] = (order, values[order], int(np.count_nonzero(~np.isnan(values))))
+        return self._index[name]
+
+    def _range(self, name, minimum, maximum):
+        """Positions in the sorted index of the values within the range"""
+        order, values, count = self._sorted(name)
+        start = 0 if minimum is None else int(np.searchsorted(values[:count], minimum, 'left'))
+        stop = count if maximum is None else int(np.searchsorted(values[:count], maximum, 'right'))
+        return order, start, max(start, stop)
+
+    def select(self, **ranges):
+        """
+        Return the rows, in table order, with every named column within its
+        inclusive (minimum, maximum) range, None for an open end. Rows with a
+        missing value are never selected.
+        """
+        if not ranges:
+            return np.arange(len(self))
+        found = {name: self._range(name, minimum, maximum) for name, (minimum, maximum) in ranges.items()}
+        narrowest = min(found, key=lambda name: found[name][2] - found[name][1])
+        order, start, stop = found[narrowest]
+        rows = np.sort(order[start:stop])
+        for name, (minimum, maximum) in ranges.items():
+            if name == narrowest or len(rows) == 0:
+                continue
+            values = self.column(name, rows)
+            keep = ~np.isnan(values)
+            if minimum is not None:
+                keep &= values >= minimum
+            if maximum is not None:
+                keep &= values <= maximum
+            rows = rows[keep]
+        return rows
+
+    def sort(self, rows, name, descending=False):
+        """Return the rows sorted by a column, missing values last"""
+        rows = np.asarray(rows)
+        values = self.column(name, rows)
+        if descending:
+            values = -values
+        return rows[np.argsort(values, kind='stable')]
+
+    def top(self, name, count, rows=None, largest=True):
+        """
+        Return the rows with the largest, or smallest, values of a column,
+        best first. Without rows this reads the end of the sorted index.
+        """
+        if rows is not None:
+            return self.sort(rows, name, descending=largest)[:count]
+        order, values, valid = self._sorted(name)
+        if largest:
+            return self.sort(order[max(valid - count, 0):valid], name, descending=True)
+        return order[:min(count, valid)]
+
+    # -------------------------------------------------------------------------
+    # Output
+    # -------------------------------------------------------------------------
+    def display(self, rows=None, file=None):
+        """Print the rows as a table in MPa, GPa and kg/m^3"""
+        lines = ["Material                       Yield   Ultimate  Youngs   Possions  Density  Thermal",
+                 "Name                           Stress  Stress    Modulus  Ratio             Expansion",
+                 "                               (MPa)   (MPa)     (GPa)    (-)       (kg/m3)  (-)"]
+        line = "{:30} {:5.1f}   {:6.1f}    {:5.1f}    {:5.3f}     {:7.1f}  {:5.2e}"
+        for record in self.records(rows):
+            values = [np.nan if value is None else value for value in record[1:7]]
+            lines.append(line.format(record.name, 1e-6 * values[0], 1e-6 * values[1], 1e-9 * values[3],
+                                     values[2], values[4], values[5]))
+        (file or sys.stdout).write('\n'.join(lines) + '\n')
+
+    def export_csv(self, filename, rows=None):
+        """Write the records of the rows to a CSV file with MaterialRecord fields"""
+        with open(filename, 'w', newline='') as csv_file:
+            writer = csv.writer(csv_file)
+            writer.writerow(MaterialRecord._fields)
+            writer.writerows(self.records(rows))
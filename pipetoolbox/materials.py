@@ -6,7 +6,20 @@ Created on Thu Sep 21 14:37:53 2017
 @author: christopherbridge
 """
 
-import pickle
+import os
+from collections import namedtuple
+
+# Immutable material properties, one record is shared by every user
+MaterialRecord = namedtuple('MaterialRecord', [
+        'name',
+        'yield_stress',
+        'ultimate_stress',
+        'possions_ratio',
+        'youngs_modulus',
+        'density',
+        'thermal_expansion',
+        'notes',
+        ], defaults=('',))
 
 def materials_default():
     """
@@ -111,75 +124,137 @@ def youngs_modulus_reference():
     return youngs_data
 #
 #
+def _record(name, material_data):
+    """Build a material record from a materials_default style dictionary"""
+    return MaterialRecord(name,
+                          material_data.get('yield_stress'),
+                          material_data.get('ultimate_stress'),
+                          material_data.get('possions_ratio'),
+                          material_data.get('youngs_modulus'),
+                          material_data.get('density'),
+                          material_data.get('thermal_expansion'),
+                          material_data.get('notes', ''))
+
+# Process-wide registry of material records, built once on import
+_registry = {name: _record(name, material_data)
+             for name, material_data in materials_default().items()}
+
+# On-disk libraries searched by name after the registry, see database_attach
+_databases = []
+
+def _database_record(material_name, databases):
+    """Return the record from the first library that has the material"""
+    for database in databases:
+        record = database.get(material_name)
+        if record is not None:
+            return record
+    return None
+
+def material_record(material_name='default'):
+    """Return the shared record for a material, or None if it is not known"""
+    record = _registry.get(material_name)
+    if record is None and _databases:
+        record = _database_record(material_name, _databases)
+    return record
+
+def database_attach(database):
+    """
+    Search a MaterialsDatabase, or the named library file, for materials that
+    are not in the registry. Returns the database.
+    """
+    if not hasattr(database, 'get'):
+        from .materials_database import MaterialsDatabase
+        database = MaterialsDatabase(database)
+    _databases.append(database)
+    return database
+
+def database_detach(database):
+    """Stop searching an attached MaterialsDatabase"""
+    _databases.remove(database)
+
+def register_material(name, yield_stress_Pa, ultimate_Pa, youngs_Pa, possions, density_kgm3, thermal, notes=''):
+    """Add a material to the shared registry and return its record"""
+    record = MaterialRecord(name, yield_stress_Pa, ultimate_Pa, possions,
+                            youngs_Pa, density_kgm3, thermal, notes)
+    _registry[name] = record
+    return record
+#
+#
 class Materials(object):
     """
     Material object
+    
+    The database is a reference to the shared registry of material records
+    and the current material is one of those records. Changing a property
+    replaces the record with a modified copy, database_private() gives the
+    object its own copy of the database.
     """
     def __init__(self, material_name='default'):
         #
         # Set up the default variables
-        self._materials_data = materials_default()
-        self._name = material_name
-        self._yield = 0.0
-        self._ultimate = 0.0
-        self._possions = 0.0
-        self._youngs = 0.0
-        self._density = 0.0
-        self._thermal_expansion = 0.0
+        self._materials_data = _registry
+        self._databases = _databases
+        self._private = False
         #
         # Read from the materials data
-        self.get_material(material_name)
+        self._record = self._materials_data.get(material_name)
+        if self._record is None:
+            self._record = MaterialRecord(material_name, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0)
         #
-        self._databse_filename = 'Materials.txt'
+        self._databse_filename = 'Materials.db'
+        
+    def record(self):
+        """Return the record of the current material"""
+        return self._record
         
     def name(self, material_name=None):
         """Return the material name"""
         if material_name != None:
-            self._name = material_name
+            self._record = self._record._replace(name=material_name)
         else:
-            return self._name
+            return self._record.name
     
     def yield_stress(self, stress=None):
         """Return the yield stress"""
         if stress != None:
-            self._yield = stress
+            self._record = self._record._replace(yield_stress=stress)
         else:
-            return self._yield
+            return self._record.yield_stress
     
     def ultimate_stress(self, stress=None):
         """Return the ultimate stress"""
         if stress != None:
-            self._ultimate = stress
+            self._record = self._record._replace(ultimate_stress=stress)
         else:
-            return self._ultimate
+            return self._record.ultimate_stress
     
     def possions(self, possions_ratio=None):
         """Return the Possions Ratio"""
         if possions_ratio != None:
-            self._possions = possions_ratio
+            self._record = self._record._replace(possions_ratio=possions_ratio)
         else:
-            return self._possions
+            return self._record.possions_ratio
     
     def youngs(self, youngs_modulus=None):
         """Return the Youngs Modulus"""
         if youngs_modulus != None:
-            self._youngs = youngs_modulus
+            self._record = self._record._replace(youngs_modulus=youngs_modulus)
         else:
-            return self._youngs
+            return self._record.youngs_modulus
     
     def density(self, density=None):
         """Return the density of the material"""
         if density != None:
-            self._density = density
+            self._record = self._record._replace(density=density)
         else:
-            return self._density
+            return self._record.density
     
     def thermalexpansion(self, thermal_expansion=None):
         """Return the thermal expansion of the material"""
         if thermal_expansion != None:
-            self._thermal_expansion = thermal_expansion
+            self._record = self._record._replace(thermal_expansion=thermal_expansion)
         else:
-            return self._thermal_expansion
+            return self._record.thermal_expansion
     
     def addmat(self, name, yield_stress_Pa, ultimate_Pa, youngs_Pa, possions, density_kgm3, thermal):
         """Add a meterial to the database and set it as the current material"""
@@ -192,56 +267,91 @@ class Materials(object):
     def get_material(self, material_name='default'):
         """Get the meterial from the materials database"""
         material_data = self._materials_data.get(material_name)
+        if material_data is None and self._databases:
+            material_data = _database_record(material_name, self._databases)
         #
         if not material_data:
             return False
         else:   
-            self._name = material_name
-            self._yield = material_data.get('yield_stress')
-            self._ultimate = material_data.get('ultimate_stress')
-            self._possions = material_data.get('possions_ratio')
-            self._youngs = material_data.get('youngs_modulus')
-            self._density = material_data.get('density')
-            self._thermal_expansion = material_data.get('thermal_expansion')
+            self._record = material_data
             return True
     
     def __repr__(self):
-        return "Material {}".format(self._name) \
-            + " Yield {:5.1f} MPa".format(self._yeild)
+        return "Material {}".format(self._record.name) \
+            + " Yield {:5.1f} MPa".format(1e-6 * self._record.yield_stress)
         #, Ultimate {:5.1f} MPa, Youngs Modulus {:5.1f} GPa, Possions Ratio {:5.3f}, Thermal Expansion {:5.2e}".format(self.MaterialName, 0.000001 * self.Data['yield'], 0.000001 * self.Data['ultimate'], 0.000000001 * self.Data['youngs'], self.Data['possions'], self.Data['thermalexpansion']))
 
     def database_add(self, name, yield_stress_Pa, ultimate_Pa, youngs_Pa, possions, density_kgm3, thermal):
-        """Add another mateiral to the database"""
-        self._materials_data[name] = {'yield_stress': yield_stress_Pa,
-                         'ultimate_stress':  ultimate_Pa, 
-                         'possions_ratio': possions, 
-                         'youngs_modulus': youngs_Pa,
-                         'density': density_kgm3,
-                         'thermal_expansion': thermal
-                         }
+        """
+        Add another mateiral to the database, this is the shared registry
+        unless database_private() has been called
+        """
+        if self._private:
+            self._materials_data[name] = MaterialRecord(name, yield_stress_Pa, ultimate_Pa, possions,
+                                                        youngs_Pa, density_kgm3, thermal)
+        else:
+            register_material(name, yield_stress_Pa, ultimate_Pa, youngs_Pa, possions, density_kgm3, thermal)
+
+    def database_private(self):
+        """
+        Give this object its own copy of the database so that later additions
+        are not seen by other objects, the records themselves are shared
+        """
+        if not self._private:
+            self._materials_data = dict(self._materials_data)
+            self._databases = list(self._databases)
+            self._private = True
 
     def database_display(self):
-        """Print out the database to the command line"""
-        print("Material                       Yield   Ultimate  Youngs   Possions  Thermal")
-        print("Name                           Stress  Stress    Modulus  Ratio     Expansion")
-        print("                               (MPa)   (MPa)     (GPa)    (-)       (-)")
-        
-        for material_name in sorted(self._material_data):
-            material = self._materials_data[material_name]
-            print ("{:30} {:5.1f}   {:6.1f}    {:5.1f}    {:5.3f}     {:5.2e}".format(material_name, 
-                   1e-6 * material['yield'], 
-                   1e-6 * material['ultimate'], 
-                   1e-9 * material['youngs'], 
-                   material['possions'], 
-                   material['thermalexpansion']))
-
-    def database_save(self):
-        """Save the database using pickle"""
-        with open(self._databse_filename, 'wb') as save_file:
-            save_file.write(pickle.dumps(self.__dict__))
+        """Print out the database to the command line, sorted by name"""
+        from .material_table import MaterialTable
+        MaterialTable(self._materials_data[name] for name in sorted(self._materials_data)).display()
+
+    def database_save(self, filename=None):
+        """Save the in-memory database to an SQLite materials library"""
+        from .materials_database import MaterialsDatabase
+        with MaterialsDatabase(filename or self._databse_filename) as database:
+            database.add(self._materials_data.values())
     
-    def database_load(self):
-        """Load the database using pickle from an existing file"""
-        with open(self._databse_filename, 'rb') as load_file:
-            dict_data = load_file.read()
-            self.__dict__ = pickle.loads(dict_data)
+    def database_load(self, filename=None):
+        """
+        Open a materials library and search it for materials that are not in
+        the in-memory database. The library is only read as materials are
+        requested and the current material is left unchanged. The library is
+        searched by this object only, use database_attach() for every Pipe
+        and Materials, and a library that is already attached is not opened
+        again. A file written by the earlier pickle version of database_save
+        is imported instead.
+        """
+        filename = filename or self._databse_filename
+        if _is_pickle(filename):
+            import pickle
+            with open(filename, 'rb') as load_file:
+                dict_data = pickle.loads(load_file.read())
+            for name, material_data in dict_data['_materials_data'].items():
+                if isinstance(material_data, dict):
+                    material_data = _record(name, material_data)
+                self.database_add(*material_data[:7])
+            return None
+        #
+        path = os.path.abspath(filename)
+        for database in self._databases:
+            if callable(getattr(database, 'filename', None)) and os.path.abspath(database.filename()) == path:
+                return database
+        #
+        # Libraries loaded here are added to a copy of the shared list
+        if self._databases is _databases:
+            self._databases = list(_databases)
+        from .materials_database import MaterialsDatabase
+        database = MaterialsDatabase(filename)
+        self._databases.append(database)
+        return database
+
+def _is_pickle(filename):
+    """Check for a database file written by the pickle version of database_save"""
+    try:
+        with open(filename, 'rb') as test_file:
+            header = test_file.read(2)
+    except IOError:
+        return False
+    return header[:1] == b'\x80'
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Materials library stored on disk in an SQLite file
+
+Opening a library does not read it, each material is read by name the first
+time it is asked for and kept as a MaterialRecord. Temperature variants of a
+grade are stored as separate names.
+"""
+
+import csv
+import sqlite3
+
+from .materials import MaterialRecord
+
+_CREATE = """CREATE TABLE IF NOT EXISTS materials (
+        name TEXT PRIMARY KEY,
+        yield_stress REAL,
+        ultimate_stress REAL,
+        possions_ratio REAL,
+        youngs_modulus REAL,
+        density REAL,
+        thermal_expansion REAL,
+        notes TEXT)"""
+_SELECT = "SELECT {} FROM materials".format(", ".join(MaterialRecord._fields))
+_INSERT = "INSERT OR REPLACE INTO materials VALUES ({})".format(
+        ", ".join("?" * len(MaterialRecord._fields)))
+
+class MaterialsDatabase(object):
+    """
+    Indexed materials library, look up by name with get() and add records
+    singly or in bulk with add()
+    """
+    def __init__(self, filename):
+        """Open the library, creating the file if it does not exist"""
+        self._filename = filename
+        self._connection = sqlite3.connect(filename)
+        with self._connection:
+            self._connection.execute(_CREATE)
+        self._records = {}
+
+    def filename(self):
+        return self._filename
+
+    def close(self):
+        self._connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def __len__(self):
+        return self._connection.execute("SELECT COUNT(*) FROM materials").fetchone()[0]
+
+    def __contains__(self, name):
+        return self.get(name) is not None
+
+    # -------------------------------------------------------------------------
+    # Lookup
+    # -------------------------------------------------------------------------
+    def get(self, name):
+        """Return the record for the named material, or None"""
+        record = self._records.get(name)
+        if record is None:
+            row = self._connection.execute(_SELECT + " WHERE name = ?", (name,)).fetchone()
+            if row is None:
+                return None
+            record = self._records[name] = MaterialRecord(*row)
+        return record
+
+    def names(self):
+        """Return the sorted material names"""
+        return [row[0] for row in self._connection.execute("SELECT name FROM materials ORDER BY name")]
+
+    def records(self):
+        """Iterate over every record in name order without caching them"""
+        for row in self._connection.execute(_SELECT + " ORDER BY name"):
+            yield MaterialRecord(*row)
+
+    # -------------------------------------------------------------------------
+    # Additions
+    # -------------------------------------------------------------------------
+    def add(self, records):
+        """Add or replace one record or an iterable of records in one transaction"""
+        if isinstance(records, MaterialRecord):
+            records = [records]
+        with self._connection:
+            self._connection.executemany(_INSERT, records)
+        self._records.clear()
+
+    def import_csv(self, filename):
+        """Add every row of a CSV file with a header of MaterialRecord fields"""
+        with open(filename, newline='') as csv_file:
+            reader = csv.DictReader(csv_file)
+            self.add(MaterialRecord(
+                    row['name'],
+                    float(row['yield_stress']),
+                    float(row['ultimate_stress']),
+                    float(row['possions_ratio']),
+                    float(row['youngs_modulus']),
+                    float(row['density']),
+                    float(row['thermal_expansion']),
+                    row.get('notes') or '') for row in reader)
+
+    def export_csv(self, filename):
+        """Write every record to a CSV file"""
+        with open(filename, 'w', newline='') as csv_file:
+            writer = csv.writer(csv_file)
+            writer.writerow(MaterialRecord._fields)
+            writer.writerows(self.records())
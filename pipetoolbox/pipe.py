@@ -6,9 +6,109 @@ Created on Thu Sep 21 17:20:38 2017
 @author: christopherbridge
 """
 
-import numpy as np
+import functools
+import sys
+from collections import namedtuple
 
-from .materials import Materials
+from .backend import pi, sqrt
+from .derating import yield_factor, youngs_factor
+from .materials import MaterialRecord, _registry, material_record
+
+# Factor applied to the pin-pin Euler load for each supported end condition.
+# 'fixed' is the historical default of euler_load() and keeps its pin-pin
+# result, use 'fix-fix' for a pipe fixed at both ends
+EULER_FACTORS = {
+        'fix-fix': 4.0,
+        'pin-fix': 2.045,
+        'pin-pin': 1.0,
+        'free-fix': 0.25,
+        'fixed': 1.0,
+        }
+
+def euler_factor(end_conditions):
+    """Return the Euler load factor of an end condition, see EULER_FACTORS"""
+    try:
+        return EULER_FACTORS[end_conditions]
+    except KeyError:
+        raise ValueError("Unknown end conditions {}".format(end_conditions)) from None
+
+# Small immutable settings shared between pipes, see _intern
+Coatings = namedtuple('Coatings', ['name', 'thickness', 'density'])
+Fluid = namedtuple('Fluid', ['name', 'density'])
+
+# Interned settings. The table is emptied when it is full, so varying
+# coatings or contents along a pipeline cannot grow it without limit while
+# the settings in current use are still shared
+_INTERN_LIMIT = 256
+_interned = {}
+
+def _intern(value):
+    """
+    Return the shared copy of an equal coatings or fluid setting. Settings
+    holding arrays or NaN are returned as they are
+    """
+    try:
+        return _interned[value]
+    except KeyError:
+        if all(item == item for item in value[1:]):
+            if len(_interned) >= _INTERN_LIMIT:
+                _interned.clear()
+            _interned[value] = value
+        return value
+    except TypeError:
+        return value
+
+_NO_COATINGS = _intern(Coatings('none', 0.0, 0.0))
+_WATER = _intern(Fluid('water', 1000.0))
+_SEA_WATER = _intern(Fluid('sea water', 1025.0))
+
+def _ratio(numerator, denominator):
+    """numerator / denominator, NaN for a zero scalar denominator"""
+    try:
+        return numerator / denominator
+    except ZeroDivisionError:
+        return float('nan')
+
+def _differs(value, current):
+    """Compare a new input with the current one, arrays count as changed"""
+    try:
+        return bool(value != current)
+    except ValueError:
+        return True
+
+# Slot of each cached property and the slots that depend on each input
+_CACHE_SLOTS = []
+_DEPENDENT_SLOTS = {}
+
+def _cached(*inputs):
+    """
+    Memoise a derived property of the pipe in the slot '_cached_<name>'. The
+    stored value is discarded when one of the named inputs is changed through
+    the pipe setters
+    """
+    def decorator(method):
+        slot = '_cached_' + method.__name__
+        @functools.wraps(method)
+        def cached_method(self):
+            try:
+                value = getattr(self, slot)
+            except AttributeError:
+                self._cache_misses = getattr(self, '_cache_misses', 0) + 1
+                value = method(self)
+                setattr(self, slot, value)
+            else:
+                try:
+                    self._cache_hits += 1
+                except AttributeError:
+                    self._cache_hits = 1
+            return value
+        cached_method.inputs = frozenset(inputs)
+        cached_method.slot = slot
+        _CACHE_SLOTS.append(slot)
+        for input_name in inputs:
+            _DEPENDENT_SLOTS.setdefault(input_name, []).append(slot)
+        return cached_method
+    return decorator
 
 class Pipe(object):
     """
@@ -18,66 +118,152 @@ class Pipe(object):
     
     Note, units are SI. Options for Imperial units may follow
     
+    The pipe uses __slots__ and holds references to shared material, coatings
+    and fluid records. Cached properties are kept in a slot each rather than
+    a dictionary. An instance costs 184 bytes plus the 16 byte garbage
+    collector header (64-bit CPython 3.11), 200 bytes, and 488 bytes with
+    every cached property evaluated as each stored float adds 24 bytes.
     """
+    __slots__ = (
+            '_diameter_outer',
+            '_wall_thickness',
+            '_material',
+            '_coatings',
+            '_internal_fluid',
+            '_external_fluid',
+            '_length',
+            '_cache_hits',
+            '_cache_misses',
+            # One slot for each _cached property
+            '_cached_area_inner',
+            '_cached_area_steel',
+            '_cached_area_outer',
+            '_cached_area_coatings',
+            '_cached_area_external',
+            '_cached_second_moment',
+            '_cached_radius_of_gyration',
+            '_cached_mass_fluids',
+            '_cached_mass_steel',
+            '_cached_mass_coatings',
+            '_cached_mass_total',
+            '_cached_mass_buoyant',
+            )
+    
+    _gravity = 9.81
+    
     def __init__(self, outer_diameter=-1, wall_thickness=-1, material='default'):
         """
         Initialise the pipe with outer diameter, wall thickness and a 
-        default material 
+        default material, an unknown material name raises ValueError
         """
         self._diameter_outer = outer_diameter
         self._wall_thickness = wall_thickness
-        self._material_name = material
-        #        
-        self._materials = Materials()
-        #
-        self._coatings_material = 'none'
-        self._coatings_thickness = 0.0
-        self._coatings_density = 0.0
-        #
-        self._internal_fluid_name = 'water'
-        self._internal_fluid_density = 1000.0
         #
-        self._external_fluid_name = 'sea water'
-        self._external_fluid_density = 1025.0
+        # Reference to the shared material record, see materials.py
+        record = _registry.get(material)
+        if record is None:
+            record = material_record(material)
+            if record is None:
+                raise ValueError("Unknown material {}".format(material))
+        self._material = record
         #
-        self._gravity = 9.81
+        self._coatings = _NO_COATINGS
+        self._internal_fluid = _WATER
+        self._external_fluid = _SEA_WATER
         #
         self._length = 1.0
+        #
+        # The cache counters are set on first use, see _cached
         
+    @classmethod
+    def from_schedule(cls, size, schedule, material='default'):
+        """
+        Create the pipe of a standard nominal size and schedule, for example
+        Pipe.from_schedule('10in', 'SCH40'), see catalogue.py
+        """
+        from .catalogue import schedule_dimensions
+        return cls(*schedule_dimensions(size, schedule), material=material)
+    
     def od(self, od):
         """Assign the outer diameter"""
-        self._diameter_outer = od
+        if _differs(od, self._diameter_outer):
+            self._diameter_outer = od
+            self._invalidate('od')
         
     def t(self, t):
         """Assign the wall thickness"""
-        self._wall_thickness = t
+        if _differs(t, self._wall_thickness):
+            self._wall_thickness = t
+            self._invalidate('t')
         
     def coatings(self, name, thickness_mm, density_kgm3):
         """Set key properties for the coatings on the pipe"""
-        self._coatings_material = name
-        self._coatings_thickness = thickness_mm
-        self._coatings_density = density_kgm3
+        changed = _differs(thickness_mm, self._coatings.thickness) \
+            or _differs(density_kgm3, self._coatings.density)
+        self._coatings = _intern(Coatings(name, thickness_mm, density_kgm3))
+        if changed:
+            self._invalidate('coatings')
         
     def internal_fluid(self, name, density_kgm3):
         """Set the intenral fluids"""
-        self._internal_fluid_name = name
-        self._internal_fluid_density = density_kgm3
+        changed = _differs(density_kgm3, self._internal_fluid.density)
+        self._internal_fluid = _intern(Fluid(name, density_kgm3))
+        if changed:
+            self._invalidate('internal_fluid')
 
     def external_fluid(self, name, density_kgm3):
         """Set the intenral fluids"""
-        self._external_fluid_name = name
-        self._external_fluid_density = density_kgm3
+        changed = _differs(density_kgm3, self._external_fluid.density)
+        self._external_fluid = _intern(Fluid(name, density_kgm3))
+        if changed:
+            self._invalidate('external_fluid')
         
     def material(self, material_name):
-        """Set the material from the database"""
-        self._materials.get_material(material_name)
+        """
+        Set the material from the database, a MaterialRecord such as
+        Materials.record() may be given instead of a name
+        """
+        if isinstance(material_name, MaterialRecord):
+            record = material_name
+        else:
+            record = material_record(material_name)
+        if record is not None and record != self._material:
+            self._material = record
+            self._invalidate('material')
         
     def length(self, length=None):
         """Set or return the length"""
-        if length != None:
-            self._length = length
+        if length is not None:
+            if _differs(length, self._length):
+                self._length = length
+                self._invalidate('length')
         else:
             return self._length
+
+    # -------------------------------------------------------------------------
+    # Cache of derived properties
+    # -------------------------------------------------------------------------
+    def _invalidate(self, input_name):
+        """Discard the cached properties that depend on the given input"""
+        for slot in _DEPENDENT_SLOTS.get(input_name, ()):
+            try:
+                delattr(self, slot)
+            except AttributeError:
+                pass
+
+    def cache_info(self):
+        """Return the cache hits, misses and the number of stored values"""
+        return {'hits': getattr(self, '_cache_hits', 0),
+                'misses': getattr(self, '_cache_misses', 0),
+                'size': sum(hasattr(self, slot) for slot in _CACHE_SLOTS)}
+
+    def cache_clear(self):
+        """Discard all cached properties and reset the counters"""
+        for slot in _CACHE_SLOTS + ['_cache_hits', '_cache_misses']:
+            try:
+                delattr(self, slot)
+            except AttributeError:
+                pass
         
     # -------------------------------------------------------------------------
     # Determine the properties
@@ -94,7 +280,7 @@ class Pipe(object):
         return 0.5 * self._diameter_outer
     
     def radius_external(self):
-        return 0.5 * (self._diameter_outer + 2.0 * self._coatings_thickness)
+        return 0.5 * (self._diameter_outer + 2.0 * self._coatings.thickness)
 
     def wall_thickness(self):
         return self._wall_thickness
@@ -107,111 +293,142 @@ class Pipe(object):
         return self._diameter_outer
     
     def diameter_external(self):
-        return self._diameter_outer + 2.0 * self._coatings_thickness
+        return self._diameter_outer + 2.0 * self._coatings.thickness
     
     # -----------------    
+    @_cached('od', 't')
     def area_inner(self):
-        return 0.25 * np.pi * self.diameter_inner()**2.0
+        diameter = self.diameter_inner()
+        return 0.25 * pi * (diameter * diameter)
     
+    @_cached('od', 't')
     def area_steel(self):
         return self.area_outer() - self.area_inner()
     
+    @_cached('od')
     def area_outer(self):
-        return 0.25 * np.pi * self.diameter_outer()**2.0
+        diameter = self.diameter_outer()
+        return 0.25 * pi * (diameter * diameter)
     
+    @_cached('od', 'coatings')
     def area_coatings(self):
         return self.area_external() - self.area_outer()
 
+    @_cached('od', 'coatings')
     def area_external(self):
-        return 0.25 * np.pi * self.diameter_external()**2.0
+        diameter = self.diameter_external()
+        return 0.25 * pi * (diameter * diameter)
         
     # -----------------    
+    @_cached('od', 't')
     def second_moment(self):
-        return 0.015625 * np.pi * (self.diameter_outer()**4.0 - self.diameter_inner()**4.0)
+        outer_squared = self.diameter_outer() * self.diameter_outer()
+        inner_squared = self.diameter_inner() * self.diameter_inner()
+        return 0.015625 * pi * (outer_squared * outer_squared - inner_squared * inner_squared)
     
+    @_cached('od', 't')
     def radius_of_gyration(self):
-        return np.sqrt(self.second_moment() / self.area_steel())       
+        return sqrt(self.second_moment() / self.area_steel())       
 
     # -----------------  
+    @_cached('od', 't', 'internal_fluid')
     def mass_fluids(self):
-        return self.area_inner() * self._internal_fluid_density
+        return self.area_inner() * self._internal_fluid.density
     
+    @_cached('od', 't', 'material')
     def mass_steel(self):
         """Calculate the mass per unit length of the pipe"""
-        return self.area_steel() * self._materials.density()
+        return self.area_steel() * self._material.density
     
+    @_cached('od', 'coatings')
     def mass_coatings(self):
-        return self.area_coatings() * self._coatings_density
+        return self.area_coatings() * self._coatings.density
     
+    @_cached('od', 't', 'coatings', 'internal_fluid', 'material')
     def mass_total(self):
         return self.mass_fluids() + self.mass_steel() + self.mass_coatings()
     
+    @_cached('od', 't', 'coatings', 'internal_fluid', 'external_fluid', 'material')
     def mass_buoyant(self):
-        return self.mass_total() - self.area_external * self._external_fluid_density
+        """Mass per unit length less the displaced external fluid"""
+        return self.mass_total() - self.area_external() * self._external_fluid.density
     
     # -----------------  
-    def tension_limit(self, safety_factor=1.0):
-        return safety_factor * self.area_steel() * self._materials.yield_stress()
+    def yield_stress(self, temperature=None):
+        """Yield stress, derated for the temperature(s) in degC if given"""
+        if temperature is None:
+            return self._material.yield_stress
+        return self._material.yield_stress * yield_factor(self._material.name, temperature)
     
-    def bending_limit(self, safety_factor=1.0):
-        return safety_factor * self.second_moment() * self._materials.yield_stress() / self.radius_outer()
+    def youngs_modulus(self, temperature=None):
+        """Youngs modulus, derated for the temperature(s) in degC if given"""
+        if temperature is None:
+            return self._material.youngs_modulus
+        return self._material.youngs_modulus * youngs_factor(self._material.name, temperature)
     
-    def pressure_internal_limit(self, safety_factor=1.0):
-        return safety_factor * 2.0 * self._wall_thickness * self._materials.yield_stress() / self._diameter_outer
+    def tension_limit(self, safety_factor=1.0, temperature=None):
+        return safety_factor * self.area_steel() * self.yield_stress(temperature)
+    
+    def bending_limit(self, safety_factor=1.0, temperature=None):
+        return safety_factor * self.second_moment() * self.yield_stress(temperature) / self.radius_outer()
+    
+    def pressure_internal_limit(self, safety_factor=1.0, temperature=None):
+        return safety_factor * 2.0 * self._wall_thickness * self.yield_stress(temperature) / self._diameter_outer
     
     # -----------------  
-    def euler_load(self, end_conditions='fixed'):
+    def euler_load(self, end_conditions='fixed', temperature=None):
         """Return the Eular buckling load for a given length"""
-        if end_conditions == 'fix-fix':
-            factor = 4.0
-        elif end_conditions == 'pin-fix':
-            factor = 2.045
-        elif end_conditions == 'pin-pin':
-            factor = 1.0
-        elif end_conditions == 'free-fix':
-            factor = 0.25
-        else:
-            factor = 1.0
+        factor = euler_factor(end_conditions)
         #
-        return factor * np.pi**2.0 * self._materials.youngs() * self.second_moment() / self._length**2.0        
-        
-    # -------------------------------------------------------------------------
-    # Display for information
-    # -------------------------------------------------------------------------
-    def display(self, SI=False):
-        """Print a copy of the pipe details to the screen for information"""
-        print("Pipe Details")
+        return factor * pi**2.0 * self.youngs_modulus(temperature) * self.second_moment() / (self._length * self._length)        
         
-        if SI:
-            print("Outer Diameter {:6.4g} m and wall thickness {:6.4g} m".format(self._diameter_outer, self._wall_thickness))
-        else:
-            print("Outer Diameter {:6.4g} mm and wall thickness {:6.4g} mm".format(1e3 * self._diameter_outer, 1e3 * self._wall_thickness))
-
-        print("Material {}".format(self._materials.name()))
+    # -----------------  
+    def properties(self, SI=True, safety_factor=1.0, end_conditions='fixed', temperature=None):
+        """
+        Return every derived property as a PipeReport, see report.py, in SI
+        or field units. The properties are evaluated in one pass sharing the
+        diameters, areas and second moment, with the same results as the
+        individual methods. Ratios with a zero denominator, such as the
+        radius of gyration of a pipe with no steel area, are NaN.
+        """
+        from .report import make_report
+        diameter_outer = self._diameter_outer
+        wall_thickness = self._wall_thickness
+        diameter_inner = diameter_outer - 2.0 * wall_thickness
+        diameter_external = diameter_outer + 2.0 * self._coatings.thickness
+        outer_squared = diameter_outer * diameter_outer
+        inner_squared = diameter_inner * diameter_inner
         #
-        # Geometry Table
-        print(" ")
-        print("OD {:6.4g} mm, DI {:6.4g} mm, t {:6.4g} mm".format(
-                1e3 * self.diameter_outer(),
-                1e3 * self.diameter_inner(),
-                1e3 * self.wall_thickness()
-                ))
-        print("Ai {:6.4g} m^2, As {:6.4g} m^2, Ae {:6.4g} m^2".format(
-                self.area_inner(),
-                self.area_steel(),
-                self.area_outer()
-                ))
-        print("I {:6.4g} m^4".format(self.second_moment()))
+        area_inner = 0.25 * pi * inner_squared
+        area_outer = 0.25 * pi * outer_squared
+        area_external = 0.25 * pi * (diameter_external * diameter_external)
+        area_steel = area_outer - area_inner
+        area_coatings = area_external - area_outer
+        second_moment = 0.015625 * pi * (outer_squared * outer_squared - inner_squared * inner_squared)
         #
+        mass_fluids = area_inner * self._internal_fluid.density
+        mass_steel = area_steel * self._material.density
+        mass_coatings = area_coatings * self._coatings.density
+        mass_total = mass_fluids + mass_steel + mass_coatings
+        mass_buoyant = mass_total - area_external * self._external_fluid.density
         #
-        print(" ")
-        if SI:
-            print("Tension limit {:6g} N".format(self.tension_limit()))
-            print("Bending limit {:6g} Nm".format(self.bending_limit()))
-            print("Burst limit {:6g} Pa".format(self.pressure_internal_limit()))
-        else:
-            print("Tension limit {:6g} kN".format(1e-3 * self.tension_limit()))
-            print("Bending limit {:6g} kNm".format(1e-3 * self.bending_limit()))
-            print("Burst limit {:6g} MPa".format(1e-6 * self.pressure_internal_limit()))
-        
-        
\ No newline at end of file
+        yield_stress = self.yield_stress(temperature)
+        return make_report(self._material.name, (
+                diameter_outer, wall_thickness, diameter_inner, diameter_external,
+                area_inner, area_steel, area_outer, area_coatings, area_external,
+                second_moment, sqrt(_ratio(second_moment, area_steel)),
+                mass_fluids, mass_steel, mass_coatings, mass_total, mass_buoyant,
+                safety_factor * area_steel * yield_stress,
+                _ratio(safety_factor * second_moment * yield_stress, 0.5 * diameter_outer),
+                _ratio(safety_factor * 2.0 * wall_thickness * yield_stress, diameter_outer),
+                _ratio(euler_factor(end_conditions) * pi**2.0 * self.youngs_modulus(temperature) * second_moment,
+                       self._length * self._length),
+                ), SI)
+
+    # -------------------------------------------------------------------------
+    # Display for information
+    # -------------------------------------------------------------------------
+    def display(self, SI=False, file=None):
+        """Print a copy of the pipe details to the screen, or a file, for information"""
+        from .report import render_properties
+        render_properties(self, 'details', SI, file or sys.stdout)
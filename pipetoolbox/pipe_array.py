@@ -0,0 +1,381 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Batch evaluation of many pipe sections at once
+
+The PipeArray stores each pipe input as a NumPy column and evaluates the same
+properties as Pipe for every section in a single vectorised call. The
+expressions are kept in the same order as the Pipe methods so the results
+match the scalar values exactly.
+"""
+
+import numpy as np
+
+from .derating import material_name, material_rows, yield_factor, youngs_factor
+from .materials import MaterialRecord, material_record
+from .pipe import Pipe, euler_factor
+
+# Properties that can be requested from PipeArray.properties()
+PROPERTIES = (
+        'radius_inner', 'radius_outer', 'radius_external',
+        'diameter_inner', 'diameter_outer', 'diameter_external',
+        'area_inner', 'area_steel', 'area_outer', 'area_coatings', 'area_external',
+        'second_moment', 'radius_of_gyration',
+        'mass_fluids', 'mass_steel', 'mass_coatings', 'mass_total', 'mass_buoyant',
+        'tension_limit', 'bending_limit', 'pressure_internal_limit', 'euler_load',
+        )
+
+def property_dtype(names=None):
+    """Structured dtype with a float64 field for each property"""
+    return np.dtype([(name, np.float64) for name in (PROPERTIES if names is None else names)])
+
+def _shared(method):
+    """Reuse an intermediate result while properties() is evaluating"""
+    name = method.__name__
+    def shared_method(self):
+        if self._shared is None:
+            return method(self)
+        if name not in self._shared:
+            self._shared[name] = method(self)
+        return self._shared[name]
+    shared_method.__name__ = name
+    shared_method.__doc__ = method.__doc__
+    return shared_method
+
+class PipeArray(object):
+    """
+    Struct of arrays of pipe sections
+
+    Every input may be a scalar or an array, all inputs are broadcast to a
+    common shape. Units are SI, as for Pipe.
+    """
+    _COLUMNS = (
+            '_diameter_outer',
+            '_wall_thickness',
+            '_coatings_thickness',
+            '_coatings_density',
+            '_internal_fluid_density',
+            '_external_fluid_density',
+            '_length',
+            '_yield',
+            '_youngs',
+            '_density',
+            )
+
+    def __init__(self, outer_diameter, wall_thickness, material='default',
+                 coatings_thickness=0.0, coatings_density=0.0,
+                 internal_fluid_density=1000.0, external_fluid_density=1025.0,
+                 length=1.0, yield_stress=None, youngs_modulus=None, density=None):
+        """
+        Initialise the columns, the material may be a single name or one name
+        per section. The yield stress, Youngs modulus and density from the
+        materials database can be overridden with explicit values, the
+        material names still select the temperature derating curves.
+        """
+        material_columns = self._material_columns(material)
+        if yield_stress is None:
+            yield_stress = material_columns[0]
+        if youngs_modulus is None:
+            youngs_modulus = material_columns[1]
+        if density is None:
+            density = material_columns[2]
+        #
+        columns = [np.array(value, dtype=float) for value in (
+                outer_diameter, wall_thickness,
+                coatings_thickness, coatings_density,
+                internal_fluid_density, external_fluid_density,
+                length, yield_stress, youngs_modulus, density)]
+        #
+        # Scalar columns are kept as scalars and only broadcast when used
+        self._shape = np.broadcast_shapes(*[column.shape for column in columns])
+        for attribute, column in zip(self._COLUMNS, columns):
+            setattr(self, attribute, column)
+        #
+        # Rows of the derating table, see derating.py
+        self._rows = material_rows(material)
+        #
+        self._shared = None
+
+    @staticmethod
+    def _material_columns(material):
+        """Look up each unique material name once in the database"""
+        if isinstance(material, str):
+            names = [material]
+        else:
+            names = list(material)
+        #
+        lookup = {}
+        for name in set(names):
+            record = material_record(name)
+            if record is None:
+                raise ValueError("Unknown material {}".format(name))
+            lookup[name] = (record.yield_stress, record.youngs_modulus, record.density)
+        #
+        values = np.array([lookup[name] for name in names], dtype=float)
+        if isinstance(material, str):
+            return values[0]
+        return values.T
+
+    @staticmethod
+    def _pipe_values(pipe):
+        """Return the column values of a Pipe object, in _COLUMNS order"""
+        return (pipe._diameter_outer,
+                pipe._wall_thickness,
+                pipe._coatings.thickness,
+                pipe._coatings.density,
+                pipe._internal_fluid.density,
+                pipe._external_fluid.density,
+                pipe._length,
+                pipe._material.yield_stress,
+                pipe._material.youngs_modulus,
+                pipe._material.density)
+
+    @classmethod
+    def from_pipes(cls, pipes):
+        """Create the array from a sequence of Pipe objects"""
+        values = np.array([cls._pipe_values(pipe) for pipe in pipes], dtype=float).reshape(-1, len(cls._COLUMNS))
+        return cls(*values.T[:2], material=[pipe._material.name for pipe in pipes],
+                   coatings_thickness=values[:, 2],
+                   coatings_density=values[:, 3],
+                   internal_fluid_density=values[:, 4],
+                   external_fluid_density=values[:, 5],
+                   length=values[:, 6],
+                   yield_stress=values[:, 7],
+                   youngs_modulus=values[:, 8],
+                   density=values[:, 9])
+
+    def __setitem__(self, index, pipe):
+        """Replace a section with the values of a Pipe object"""
+        for attribute, value in zip(self._COLUMNS, self._pipe_values(pipe)):
+            column = getattr(self, attribute)
+            if column.shape != self._shape or not column.flags.writeable:
+                column = np.array(np.broadcast_to(column, self._shape))
+                setattr(self, attribute, column)
+            column[index] = value
+        #
+        if np.shape(self._rows) != self._shape or not self._rows.flags.writeable:
+            self._rows = np.array(np.broadcast_to(self._rows, self._shape))
+        self._rows[index] = material_rows(pipe._material.name)
+
+    def __len__(self):
+        return self._shape[0]
+
+    @property
+    def shape(self):
+        return self._shape
+
+    def _column(self, column):
+        """Return a column broadcast to the full shape of the array"""
+        return np.broadcast_to(column, self._shape)
+
+    def length(self):
+        return self._column(self._length)
+
+    # -------------------------------------------------------------------------
+    # Determine the properties
+    # -------------------------------------------------------------------------
+    def radius_inner(self):
+        return 0.5 * (self.diameter_outer() - 2.0 * self._wall_thickness)
+
+    def radius_outer(self):
+        return 0.5 * self.diameter_outer()
+
+    def radius_external(self):
+        return 0.5 * (self.diameter_outer() + 2.0 * self._coatings_thickness)
+
+    def wall_thickness(self):
+        return self._column(self._wall_thickness)
+
+    # -----------------
+    @_shared
+    def diameter_inner(self):
+        return self.diameter_outer() - 2.0 * self._wall_thickness
+
+    def diameter_outer(self):
+        return self._column(self._diameter_outer)
+
+    @_shared
+    def diameter_external(self):
+        return self.diameter_outer() + 2.0 * self._coatings_thickness
+
+    # -----------------
+    @_shared
+    def area_inner(self):
+        diameter = self.diameter_inner()
+        return 0.25 * np.pi * (diameter * diameter)
+
+    @_shared
+    def area_steel(self):
+        return self.area_outer() - self.area_inner()
+
+    @_shared
+    def area_outer(self):
+        diameter = self.diameter_outer()
+        return 0.25 * np.pi * (diameter * diameter)
+
+    def area_coatings(self):
+        return self.area_external() - self.area_outer()
+
+    @_shared
+    def area_external(self):
+        diameter = self.diameter_external()
+        return 0.25 * np.pi * (diameter * diameter)
+
+    # -----------------
+    @_shared
+    def second_moment(self):
+        outer_squared = self.diameter_outer() * self.diameter_outer()
+        inner_squared = self.diameter_inner() * self.diameter_inner()
+        return 0.015625 * np.pi * (outer_squared * outer_squared - inner_squared * inner_squared)
+
+    def radius_of_gyration(self):
+        return np.sqrt(self.second_moment() / self.area_steel())
+
+    # -----------------
+    def mass_fluids(self):
+        return self.area_inner() * self._internal_fluid_density
+
+    def mass_steel(self):
+        return self.area_steel() * self._density
+
+    def mass_coatings(self):
+        return self.area_coatings() * self._coatings_density
+
+    @_shared
+    def mass_total(self):
+        return self.mass_fluids() + self.mass_steel() + self.mass_coatings()
+
+    def mass_buoyant(self):
+        return self.mass_total() - self.area_external() * self._external_fluid_density
+
+    # -----------------
+    def yield_stress(self, temperature=None):
+        """Yield stress, derated for the temperatures in degC if given"""
+        if temperature is None:
+            return self._yield
+        if self._shared is not None:
+            # One temperature per properties() call, derate once
+            if 'yield_stress' not in self._shared:
+                self._shared['yield_stress'] = self._yield * yield_factor(self._rows, temperature)
+            return self._shared['yield_stress']
+        return self._yield * yield_factor(self._rows, temperature)
+
+    def youngs_modulus(self, temperature=None):
+        """Youngs modulus, derated for the temperatures in degC if given"""
+        if temperature is None:
+            return self._youngs
+        return self._youngs * youngs_factor(self._rows, temperature)
+
+    def tension_limit(self, safety_factor=1.0, temperature=None):
+        return safety_factor * self.area_steel() * self.yield_stress(temperature)
+
+    def bending_limit(self, safety_factor=1.0, temperature=None):
+        return safety_factor * self.second_moment() * self.yield_stress(temperature) / self.radius_outer()
+
+    def pressure_internal_limit(self, safety_factor=1.0, temperature=None):
+        return safety_factor * 2.0 * self.wall_thickness() * self.yield_stress(temperature) / self._diameter_outer
+
+    # -----------------
+    def euler_load(self, end_conditions='fixed', temperature=None):
+        """Return the Euler buckling load of each section for its length"""
+        factor = euler_factor(end_conditions)
+        return factor * np.pi**2.0 * self.youngs_modulus(temperature) * self.second_moment() / (self._length * self._length)
+
+    # -----------------
+    def properties(self, names=PROPERTIES, safety_factor=1.0, end_conditions='fixed', temperature=None):
+        """
+        Evaluate several properties in one call, the diameters, areas and
+        second moment are computed once and shared. The limits are derated
+        for the temperatures if given. Returns a dictionary of arrays keyed by
+        the property name.
+        """
+        self._shared = {}
+        try:
+            return {name: self._property(name, safety_factor, end_conditions, temperature)
+                    for name in names}
+        finally:
+            self._shared = None
+
+    def _property(self, name, safety_factor, end_conditions, temperature):
+        """Evaluate one of the PROPERTIES by name"""
+        if name in ('tension_limit', 'bending_limit', 'pressure_internal_limit'):
+            return getattr(self, name)(safety_factor, temperature)
+        elif name == 'euler_load':
+            return self.euler_load(end_conditions, temperature)
+        elif name in PROPERTIES:
+            return getattr(self, name)()
+        raise ValueError("Unknown property {}".format(name))
+
+    def to_records(self, names=PROPERTIES, safety_factor=1.0, end_conditions='fixed',
+                   temperature=None, out=None):
+        """
+        Evaluate the properties into a structured array with one float64
+        field per property, see export.py. Each property is written into its
+        field as it is computed, only the shared intermediates such as the
+        diameters, areas, second moment and total mass are held besides the
+        output until the call returns. Out may be a structured array or
+        memory map to fill, of the same shape and fields.
+        """
+        dtype = property_dtype(names)
+        if out is None:
+            out = np.empty(self._shape, dtype)
+        elif out.shape != self._shape or out.dtype != dtype:
+            raise ValueError("Output must have shape {} and fields {}".format(self._shape, ', '.join(names)))
+        self._shared = {}
+        try:
+            for name in names:
+                out[name] = self._property(name, safety_factor, end_conditions, temperature)
+        finally:
+            self._shared = None
+        return out
+
+    # -------------------------------------------------------------------------
+    # Conversion
+    # -------------------------------------------------------------------------
+    def sections(self, start, stop):
+        """Return sections start to stop of a 1-d array, sharing the column data"""
+        if len(self._shape) != 1:
+            raise ValueError("sections() needs a 1-d PipeArray")
+        part = object.__new__(PipeArray)
+        for attribute in self._COLUMNS + ('_rows',):
+            column = getattr(self, attribute)
+            if np.ndim(column):
+                column = np.broadcast_to(column, self._shape)[start:stop]
+            setattr(part, attribute, column)
+        part._shape = (len(range(*slice(start, stop).indices(self._shape[0]))),)
+        part._shared = None
+        return part
+
+    def pipe(self, index):
+        """Return a single section as a Pipe object"""
+        def value(column):
+            return float(self._column(column)[index])
+        #
+        pipe = Pipe(value(self._diameter_outer), value(self._wall_thickness))
+        pipe.coatings('none', value(self._coatings_thickness), value(self._coatings_density))
+        pipe.internal_fluid('water', value(self._internal_fluid_density))
+        pipe.external_fluid('sea water', value(self._external_fluid_density))
+        pipe.length(value(self._length))
+        row = int(np.broadcast_to(self._rows, self._shape)[index])
+        properties = {'yield_stress': value(self._yield),
+                      'youngs_modulus': value(self._youngs),
+                      'density': value(self._density)}
+        record = material_record(material_name(row)) if row else None
+        if record is None:
+            record = MaterialRecord(material_name(row), properties['yield_stress'], 0.0, 0.0,
+                                    properties['youngs_modulus'], properties['density'], 0.0)
+        else:
+            changed = {name: number for name, number in properties.items() if getattr(record, name) != number}
+            if changed:
+                record = record._replace(**changed)
+        pipe.material(record)
+        return pipe
+
+    def copy(self):
+        """Return a PipeArray with its own copy of the columns"""
+        duplicate = object.__new__(PipeArray)
+        for attribute in self._COLUMNS + ('_rows',):
+            setattr(duplicate, attribute, np.array(getattr(self, attribute)))
+        duplicate._shape = self._shape
+        duplicate._shared = None
+        return duplicate
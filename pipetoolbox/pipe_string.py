@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+String of pipe segments such as a riser or flowline
+
+The segments are ordered from the top (index 0) to the bottom. The submerged
+weight of each segment is summed from the bottom to give the tension at the
+top of every segment, and the utilisation is that tension over the segment
+tension limit. Replacing one segment only updates the running sums above it.
+"""
+
+import numpy as np
+
+from .pipe import Pipe
+from .pipe_array import PipeArray
+
+class PipeString(object):
+    """
+    Ordered pipe segments, each with its own length, section, coatings,
+    contents and material. Units are SI.
+    """
+    def __init__(self, segments, bottom_tension=0.0, safety_factor=1.0):
+        """
+        Initialise from a PipeArray or a sequence of Pipe objects, the length
+        of each segment is the Pipe length. The bottom tension is applied
+        below the lowest segment. A PipeArray is copied, so set_segment does
+        not change the caller's array.
+        """
+        if isinstance(segments, PipeArray):
+            segments = segments.copy()
+        else:
+            segments = PipeArray.from_pipes(segments)
+        self._segments = segments
+        self._bottom_tension = bottom_tension
+        self._safety_factor = safety_factor
+        self.refresh()
+
+    def refresh(self):
+        """Recompute every segment and the cumulative sums from scratch"""
+        segments = self._segments
+        length = segments.length()
+        #
+        self._weight = segments.mass_buoyant() * Pipe._gravity * length
+        self._mass_steel = segments.mass_steel() * length
+        self._mass_coatings = segments.mass_coatings() * length
+        self._capacity = segments.tension_limit(self._safety_factor)
+        #
+        self._tension = np.cumsum(self._weight[::-1])[::-1] + self._bottom_tension
+        self._utilisation = self._tension / self._capacity
+        self._mass_steel_total = self._mass_steel.sum()
+        self._mass_coatings_total = self._mass_coatings.sum()
+        self._length_total = length.sum()
+
+    def __len__(self):
+        return len(self._segments)
+
+    def segment(self, index):
+        """Return a segment as a Pipe object"""
+        return self._segments.pipe(index)
+
+    def set_segment(self, index, pipe):
+        """
+        Replace one segment with a Pipe object. Only that segment is
+        evaluated and only the tensions at and above it are adjusted.
+        """
+        index = range(len(self))[index]
+        self._length_total += pipe.length() - self._segments.length()[index]
+        self._segments[index] = pipe
+        #
+        weight = pipe.mass_buoyant() * Pipe._gravity * pipe.length()
+        mass_steel = pipe.mass_steel() * pipe.length()
+        mass_coatings = pipe.mass_coatings() * pipe.length()
+        #
+        self._tension[:index + 1] += weight - self._weight[index]
+        self._mass_steel_total += mass_steel - self._mass_steel[index]
+        self._mass_coatings_total += mass_coatings - self._mass_coatings[index]
+        #
+        self._weight[index] = weight
+        self._mass_steel[index] = mass_steel
+        self._mass_coatings[index] = mass_coatings
+        self._capacity[index] = pipe.tension_limit(self._safety_factor)
+        self._utilisation[:index + 1] = self._tension[:index + 1] / self._capacity[:index + 1]
+
+    def bottom_tension(self, tension=None):
+        """Set or return the tension applied below the lowest segment"""
+        if tension != None:
+            self._tension += tension - self._bottom_tension
+            self._utilisation = self._tension / self._capacity
+            self._bottom_tension = tension
+        else:
+            return self._bottom_tension
+
+    # -------------------------------------------------------------------------
+    # Results
+    # -------------------------------------------------------------------------
+    def length(self):
+        """Total length of the string"""
+        return self._length_total
+
+    def submerged_weight(self):
+        """Submerged weight of each segment, N"""
+        return self._weight.copy()
+
+    def tension_profile(self):
+        """Tension at the top of each segment, N"""
+        return self._tension.copy()
+
+    def tension_top(self):
+        """Tension at the top of the string, N"""
+        return self._tension[0]
+
+    def mass_steel(self):
+        """Total steel mass of the string, kg"""
+        return self._mass_steel_total
+
+    def mass_coatings(self):
+        """Total coatings mass of the string, kg"""
+        return self._mass_coatings_total
+
+    def utilisation(self):
+        """Top tension of each segment over its tension limit"""
+        return self._utilisation.copy()
+
+    def governing_segment(self):
+        """Return the index and utilisation of the most utilised segment"""
+        index = int(np.argmax(self._utilisation))
+        return index, self._utilisation[index]
@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Monte Carlo structural reliability of the Pipe limit states
+
+The wall thickness, outer diameter, yield stress and load are random, each
+driven by one standard normal variable:
+
+    wall thickness  t  = t_nominal (1 + cov_t u0)
+    outer diameter  D  = D_nominal (1 + cov_D u1)
+    yield stress    lognormal about the material yield, capped at ultimate
+    load            normal about the mean load
+
+Samples are drawn and evaluated in fixed size blocks so the memory used does
+not grow with the number of samples. Importance sampling draws the normals
+about a shifted centre, by default the design point found with the HL-RF
+iteration, and weights each sample by the ratio of the densities.
+"""
+
+import math
+from collections import namedtuple
+from statistics import NormalDist
+
+import numpy as np
+
+from .pipe_array import PipeArray
+
+ReliabilityResult = namedtuple('ReliabilityResult', [
+        'probability',
+        'lower',
+        'upper',
+        'samples',
+        'failures',
+        'shift',
+        ])
+
+# Pipe capacity method for each limit state
+LIMIT_STATES = {
+        'tension': 'tension_limit',
+        'bending': 'bending_limit',
+        'pressure': 'pressure_internal_limit',
+        }
+
+_DIMENSION = 4
+
+def failure_probability(pipe, load, limit_state='tension', load_cov=0.1,
+                        wall_thickness_cov=0.0, ovality_cov=0.0, yield_cov=0.07,
+                        safety_factor=1.0, samples=10**7, block_size=10**6,
+                        seed=None, importance_shift=None, confidence=0.95):
+    """
+    Return the probability that the load exceeds the capacity of the pipe for
+    the tension, bending or pressure limit state, with a confidence interval.
+
+    The load is the mean tension (N), moment (Nm) or internal pressure (Pa).
+    The coefficients of variation set the scatter of each variable. The seed
+    makes the result reproducible. Importance sampling is used when
+    importance_shift is 'auto', for the design point, or a sequence of four
+    shifts of the normals (wall thickness, diameter, yield, load).
+    """
+    if limit_state not in LIMIT_STATES:
+        raise ValueError("Unknown limit state {}".format(limit_state))
+    #
+    material = pipe._material
+    yield_sigma = math.sqrt(math.log(1.0 + yield_cov * yield_cov))
+    yield_mu = math.log(material.yield_stress) - 0.5 * yield_sigma * yield_sigma
+    ultimate = material.ultimate_stress or np.inf
+    #
+    def margin(normals):
+        """Capacity less load for each row of standard normals"""
+        batch = PipeArray(pipe._diameter_outer * (1.0 + ovality_cov * normals[:, 1]),
+                          pipe._wall_thickness * (1.0 + wall_thickness_cov * normals[:, 0]),
+                          yield_stress=np.minimum(np.exp(yield_mu + yield_sigma * normals[:, 2]), ultimate),
+                          youngs_modulus=material.youngs_modulus,
+                          density=material.density)
+        capacity = getattr(batch, LIMIT_STATES[limit_state])(safety_factor)
+        return capacity - load * (1.0 + load_cov * normals[:, 3])
+    #
+    if importance_shift is None:
+        shift = np.zeros(_DIMENSION)
+    elif isinstance(importance_shift, str):
+        if importance_shift != 'auto':
+            raise ValueError("Unknown importance shift {}".format(importance_shift))
+        shift = design_point(margin)
+    else:
+        shift = np.asarray(importance_shift, dtype=float)
+    weighted = bool(np.any(shift))
+    #
+    generator = np.random.default_rng(seed)
+    total = int(samples)
+    weight_sum = 0.0
+    weight_squared_sum = 0.0
+    failures = 0
+    for start in range(0, total, block_size):
+        count = min(block_size, total - start)
+        normals = generator.standard_normal((count, _DIMENSION))
+        normals += shift
+        failed = margin(normals) <= 0.0
+        failures += int(np.count_nonzero(failed))
+        if weighted:
+            normals = normals[failed]
+            weights = np.exp(0.5 * shift.dot(shift) - normals.dot(shift))
+            weight_sum += weights.sum()
+            weight_squared_sum += (weights * weights).sum()
+    #
+    z = NormalDist().inv_cdf(0.5 + 0.5 * confidence)
+    if weighted:
+        probability = weight_sum / total
+        variance = max(weight_squared_sum / total - probability * probability, 0.0) / total
+        lower = max(probability - z * math.sqrt(variance), 0.0)
+        upper = probability + z * math.sqrt(variance)
+    else:
+        probability = failures / float(total)
+        lower, upper = _wilson(failures, total, z)
+    return ReliabilityResult(float(probability), float(lower), float(upper), total, failures,
+                             tuple(float(value) for value in shift))
+
+def design_point(margin, iterations=50, tolerance=1e-6, step=1e-4):
+    """
+    Return the most probable failure point in standard normal space with the
+    HL-RF iteration, the gradient is taken by central differences
+    """
+    point = np.zeros(_DIMENSION)
+    offsets = step * np.vstack([np.zeros(_DIMENSION), np.eye(_DIMENSION), -np.eye(_DIMENSION)])
+    for iteration in range(iterations):
+        values = margin(point + offsets)
+        gradient = (values[1:_DIMENSION + 1] - values[_DIMENSION + 1:]) / (2.0 * step)
+        norm_squared = gradient.dot(gradient)
+        if norm_squared == 0.0:
+            break
+        new_point = (gradient.dot(point) - values[0]) / norm_squared * gradient
+        converged = np.linalg.norm(new_point - point) < tolerance * max(1.0, np.linalg.norm(new_point))
+        point = new_point
+        if converged:
+            break
+    return point
+
+def _wilson(failures, total, z):
+    """Wilson score interval for a binomial proportion"""
+    probability = failures / float(total)
+    denominator = 1.0 + z * z / total
+    centre = (probability + 0.5 * z * z / total) / denominator
+    half_width = z * math.sqrt(probability * (1.0 - probability) / total + 0.25 * z * z / (total * total)) / denominator
+    return max(centre - half_width, 0.0), min(centre + half_width, 1.0)
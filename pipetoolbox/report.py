@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Property reports of pipes and their rendering
+
+Pipe.properties() evaluates every derived property in one pass and returns a
+PipeReport in SI or field units. Field units are those of Pipe.display():
+lengths in mm and forces, moments and pressures in kN, kNm and MPa, the
+areas, second moment and masses stay in m^2, m^4 and kg/m.
+
+render_properties() writes the reports of one pipe, a sequence of pipes or a
+PipeArray as a text table, CSV or JSON. The output is built as one string and
+written once, so thousands of pipes take one write rather than a print per
+line. The 'details' format is the block printed by Pipe.display().
+
+    render_properties(pipes, 'csv', file=csv_file)
+    print(render_properties(batch, 'text', SI=True))
+"""
+
+from collections import namedtuple
+
+# Numeric fields of a report, in report order
+FIELDS = (
+        'diameter_outer', 'wall_thickness', 'diameter_inner', 'diameter_external',
+        'area_inner', 'area_steel', 'area_outer', 'area_coatings', 'area_external',
+        'second_moment', 'radius_of_gyration',
+        'mass_fluids', 'mass_steel', 'mass_coatings', 'mass_total', 'mass_buoyant',
+        'tension_limit', 'bending_limit', 'pressure_internal_limit', 'euler_load',
+        )
+
+PipeReport = namedtuple('PipeReport', ('material', 'units') + FIELDS)
+
+# SI unit, field unit and the factor from SI to field units of each field
+_LENGTH = ('m', 'mm', 1e3)
+_AREA = ('m^2', 'm^2', 1.0)
+_MASS = ('kg/m', 'kg/m', 1.0)
+_FORCE = ('N', 'kN', 1e-3)
+UNITS = {
+        'diameter_outer': _LENGTH,
+        'wall_thickness': _LENGTH,
+        'diameter_inner': _LENGTH,
+        'diameter_external': _LENGTH,
+        'area_inner': _AREA,
+        'area_steel': _AREA,
+        'area_outer': _AREA,
+        'area_coatings': _AREA,
+        'area_external': _AREA,
+        'second_moment': ('m^4', 'm^4', 1.0),
+        'radius_of_gyration': _LENGTH,
+        'mass_fluids': _MASS,
+        'mass_steel': _MASS,
+        'mass_coatings': _MASS,
+        'mass_total': _MASS,
+        'mass_buoyant': _MASS,
+        'tension_limit': _FORCE,
+        'bending_limit': ('Nm', 'kNm', 1e-3),
+        'pressure_internal_limit': ('Pa', 'MPa', 1e-6),
+        'euler_load': _FORCE,
+        }
+
+def units(SI=True):
+    """Return the unit of each report field"""
+    return {name: UNITS[name][0 if SI else 1] for name in FIELDS}
+
+def make_report(material, values, SI=True):
+    """Build a PipeReport from the SI values of FIELDS, converting to field units"""
+    if SI:
+        return PipeReport(material, 'SI', *values)
+    return PipeReport(material, 'field', *[value * UNITS[name][2] for name, value in zip(FIELDS, values)])
+
+# -----------------------------------------------------------------------------
+# Rendering
+# -----------------------------------------------------------------------------
+def _columns(pipes, SI, safety_factor, end_conditions, temperature):
+    """Material names, or None, and a list of values for each field"""
+    if hasattr(pipes, 'to_records'):
+        results = pipes.properties(FIELDS[:1] + FIELDS[2:], safety_factor, end_conditions, temperature)
+        results['wall_thickness'] = pipes.wall_thickness()
+        return None, [(results[name] if SI else results[name] * UNITS[name][2]).ravel().tolist()
+                      for name in FIELDS]
+    if hasattr(pipes, 'properties'):
+        pipes = [pipes]
+    reports = [pipe.properties(SI, safety_factor, end_conditions, temperature) for pipe in pipes]
+    columns = list(zip(*reports)) if reports else [()] * len(PipeReport._fields)
+    return list(columns[0]), [list(column) for column in columns[2:]]
+
+def _table(materials, columns, unit_names):
+    """Fixed width text table with a header, a units line and a row per pipe"""
+    names = FIELDS if materials is None else ('material',) + FIELDS
+    widths = [max(12, len(name)) for name in names]
+    head = ' '.join('{:>{}}'.format(name, width) for name, width in zip(names, widths))
+    unit_line = ' '.join('{:>{}}'.format(unit_names.get(name, ''), width) for name, width in zip(names, widths))
+    number = ' '.join('{{:>{}.6g}}'.format(width) for width in widths[len(names) - len(FIELDS):])
+    if materials is not None:
+        number = '{{:>{}}} '.format(widths[0]) + number
+        rows = zip(materials, *columns)
+    else:
+        rows = zip(*columns)
+    return '\n'.join([head, unit_line] + [number.format(*row) for row in rows]) + '\n'
+
+def _csv(materials, columns, unit_names):
+    """CSV with the unit of each field in its header"""
+    import csv
+    import io
+    output = io.StringIO()
+    writer = csv.writer(output, lineterminator='\n')
+    header = ['{} ({})'.format(name, unit_names[name]) for name in FIELDS]
+    if materials is None:
+        writer.writerow(header)
+        writer.writerows(zip(*columns))
+    else:
+        writer.writerow(['material'] + header)
+        writer.writerows(zip(materials, *columns))
+    return output.getvalue()
+
+def _json(materials, columns, unit_names):
+    """JSON object with the units and a list of the pipes"""
+    import json
+    names = FIELDS if materials is None else ('material',) + FIELDS
+    rows = zip(*columns) if materials is None else zip(materials, *columns)
+    return json.dumps({'units': unit_names,
+                       'pipes': [dict(zip(names, row)) for row in rows]}) + '\n'
+
+def _details(report):
+    """The Pipe.display() block of one report"""
+    SI = report.units == 'SI'
+    millimetres = 1e3 if SI else 1.0
+    lines = ["Pipe Details"]
+    if SI:
+        lines.append("Outer Diameter {:6.4g} m and wall thickness {:6.4g} m".format(
+                report.diameter_outer, report.wall_thickness))
+    else:
+        lines.append("Outer Diameter {:6.4g} mm and wall thickness {:6.4g} mm".format(
+                report.diameter_outer, report.wall_thickness))
+    lines.append("Material {}".format(report.material))
+    #
+    # Geometry Table
+    lines.append(" ")
+    lines.append("OD {:6.4g} mm, DI {:6.4g} mm, t {:6.4g} mm".format(
+            millimetres * report.diameter_outer,
+            millimetres * report.diameter_inner,
+            millimetres * report.wall_thickness))
+    lines.append("Ai {:6.4g} m^2, As {:6.4g} m^2, Ae {:6.4g} m^2".format(
+            report.area_inner, report.area_steel, report.area_outer))
+    lines.append("I {:6.4g} m^4".format(report.second_moment))
+    #
+    lines.append(" ")
+    if SI:
+        lines.append("Tension limit {:6g} N".format(report.tension_limit))
+        lines.append("Bending limit {:6g} Nm".format(report.bending_limit))
+        lines.append("Burst limit {:6g} Pa".format(report.pressure_internal_limit))
+    else:
+        lines.append("Tension limit {:6g} kN".format(report.tension_limit))
+        lines.append("Bending limit {:6g} kNm".format(report.bending_limit))
+        lines.append("Burst limit {:6g} MPa".format(report.pressure_internal_limit))
+    return '\n'.join(lines) + '\n'
+
+_FORMATS = {'text': _table, 'csv': _csv, 'json': _json}
+
+def render_properties(pipes, format='text', SI=True, file=None, safety_factor=1.0,
+                      end_conditions='fixed', temperature=None):
+    """
+    Render the property reports of a Pipe, a sequence of Pipes or a PipeArray
+    as 'text', 'csv', 'json' or the 'details' of Pipe.display(). Returns the
+    output, or writes it to the file if given. A PipeArray is evaluated in
+    one pass of array operations and has no material column.
+    """
+    if format == 'details':
+        if hasattr(pipes, 'to_records'):
+            raise ValueError("The details format needs Pipe objects")
+        if hasattr(pipes, 'properties'):
+            pipes = [pipes]
+        output = ''.join(_details(pipe.properties(SI, safety_factor, end_conditions, temperature))
+                         for pipe in pipes)
+    elif format in _FORMATS:
+        materials, columns = _columns(pipes, SI, safety_factor, end_conditions, temperature)
+        output = _FORMATS[format](materials, columns, units(SI))
+    else:
+        raise ValueError("Unknown format {}".format(format))
+    if file is None:
+        return output
+    file.write(output)
@@ -0,0 +1,414 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Local pipe property service
+
+Requests and responses are JSON objects, one per line, over TCP or a Unix
+socket. A request uses the line list column names, see linelist.py:
+
+    {"id": 1, "od": 0.3239, "wt": 0.0127, "material": "default",
+     "coatings_thickness": 0.05, "coatings_density": 2400.0,
+     "internal_fluid_density": 1000.0, "external_fluid_density": 1025.0,
+     "length": 12.0, "safety_factor": 1.0, "end_conditions": "pin-pin",
+     "properties": ["mass_total", "tension_limit"]}
+
+and is answered with {"id": 1, "results": {...}} or {"id": 1, "error": "..."}.
+{"id": 2, "command": "metrics"} returns the service metrics.
+
+Requests that arrive within a short window are evaluated together as one
+PipeArray, identical requests in the same window are evaluated once, and the
+properties of each geometry are kept in an LRU cache. A connection may send
+many requests without waiting, the responses carry the request id.
+
+    python -m pipetoolbox.service serve --port 8765
+    python -m pipetoolbox.service load --requests 20000 --concurrency 64
+"""
+
+import argparse
+import asyncio
+import collections
+import json
+import random
+import sys
+import time
+
+from .linelist import DEFAULT_PROPERTIES, OPTIONAL_COLUMNS
+from .materials import material_record
+from .pipe import Pipe, euler_factor
+from .pipe_array import PROPERTIES, PipeArray
+
+_LIMITS = ('tension_limit', 'bending_limit', 'pressure_internal_limit')
+
+class PipeService(object):
+    """
+    Evaluate pipe property requests in coalesced batches
+
+    The window (s) is how long the first request of a batch waits for
+    others, a batch is also evaluated once it has max_batch geometries. With
+    coalesce False every request is evaluated on its own with a Pipe.
+    """
+    def __init__(self, window=0.002, max_batch=4096, cache_size=65536, coalesce=True):
+        self._window = window
+        self._max_batch = max_batch
+        self._cache_size = cache_size
+        self._coalesce = coalesce
+        #
+        self._cache = collections.OrderedDict()
+        self._pending = {}
+        self._queue = []
+        self._timer = None
+        self._connections = set()
+        #
+        self._started = time.perf_counter()
+        self._latencies = collections.deque(maxlen=10000)
+        self._counts = collections.Counter()
+
+    # -------------------------------------------------------------------------
+    # Requests
+    # -------------------------------------------------------------------------
+    @staticmethod
+    def _parse(request):
+        """Return the cache key and the requested properties of a request"""
+        properties = request.get('properties', DEFAULT_PROPERTIES)
+        for name in properties:
+            if name not in PROPERTIES:
+                raise ValueError("Unknown property {}".format(name))
+        material = request.get('material', 'default')
+        if material_record(material) is None:
+            raise ValueError("Unknown material {}".format(material))
+        end_conditions = request.get('end_conditions', 'fixed')
+        euler_factor(end_conditions)
+        key = ((float(request['od']), float(request['wt']), material)
+               + tuple(float(request.get(name, default)) for name, default in OPTIONAL_COLUMNS)
+               + (float(request.get('safety_factor', 1.0)), end_conditions))
+        return key, properties
+
+    def _values(self, key):
+        """
+        Return the property values of a key, from the cache or evaluated now,
+        or a future for them when the key waits for the next batch
+        """
+        values = self._cache.get(key)
+        if values is not None:
+            self._cache.move_to_end(key)
+            self._counts['cache_hits'] += 1
+            return values
+        self._counts['cache_misses'] += 1
+        if not self._coalesce:
+            return self._store(key, _evaluate_pipe(key))
+        future = self._pending.get(key)
+        if future is None:
+            future = self._pending[key] = asyncio.get_running_loop().create_future()
+            self._queue.append(key)
+            if len(self._queue) >= self._max_batch:
+                self._flush()
+            elif self._timer is None:
+                self._timer = asyncio.get_running_loop().call_later(self._window, self._flush)
+        return future
+
+    def _results(self, values, properties, start):
+        self._counts['requests'] += 1
+        self._latencies.append(time.perf_counter() - start)
+        return {name: values[PROPERTIES.index(name)] for name in properties}
+
+    async def evaluate(self, request):
+        """Return a dictionary of the requested properties"""
+        start = time.perf_counter()
+        key, properties = self._parse(request)
+        values = self._values(key)
+        if isinstance(values, asyncio.Future):
+            values = await values
+        return self._results(values, properties, start)
+
+    def _store(self, key, values):
+        self._cache[key] = values
+        if len(self._cache) > self._cache_size:
+            self._cache.popitem(last=False)
+        return values
+
+    def _flush(self):
+        """Evaluate every queued geometry, one PipeArray per set of factors"""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        queue, self._queue = self._queue, []
+        if not queue:
+            return
+        self._counts['batches'] += 1
+        self._counts['batched'] += len(queue)
+        #
+        groups = collections.defaultdict(list)
+        for key in queue:
+            groups[key[-2:]].append(key)
+        for (safety_factor, end_conditions), keys in groups.items():
+            try:
+                columns = list(zip(*keys))
+                batch = PipeArray(columns[0], columns[1], material=list(columns[2]),
+                                  **{name: columns[3 + index] for index, (name, default)
+                                     in enumerate(OPTIONAL_COLUMNS)})
+                results = batch.properties(PROPERTIES, safety_factor, end_conditions)
+                rows = zip(*[results[name].tolist() for name in PROPERTIES])
+                for key, values in zip(keys, rows):
+                    self._pending.pop(key).set_result(self._store(key, values))
+            except Exception as error:
+                for key in keys:
+                    future = self._pending.pop(key, None)
+                    if future is not None and not future.done():
+                        future.set_exception(error)
+
+    def metrics(self):
+        """Request, batch and cache counts with latency percentiles (s)"""
+        latencies = sorted(self._latencies)
+        def percentile(fraction):
+            return latencies[min(int(fraction * len(latencies)), len(latencies) - 1)] if latencies else 0.0
+        elapsed = time.perf_counter() - self._started
+        batches = self._counts['batches']
+        return {
+                'requests': self._counts['requests'],
+                'errors': self._counts['errors'],
+                'throughput': self._counts['requests'] / elapsed if elapsed > 0.0 else 0.0,
+                'batches': batches,
+                'mean_batch': self._counts['batched'] / batches if batches else 0.0,
+                'cache_hits': self._counts['cache_hits'],
+                'cache_misses': self._counts['cache_misses'],
+                'cache_size': len(self._cache),
+                'latency_p50': percentile(0.50),
+                'latency_p99': percentile(0.99),
+                'latency_max': latencies[-1] if latencies else 0.0,
+                }
+
+    # -------------------------------------------------------------------------
+    # Connections
+    # -------------------------------------------------------------------------
+    def _respond(self, line, writer):
+        """
+        Answer one request line, at once when the values are known, otherwise
+        when its batch has been evaluated. Returns the future being waited on.
+        """
+        start = time.perf_counter()
+        request_id = None
+        def send(response):
+            writer.write(json.dumps(response).encode() + b'\n')
+        def fail(error):
+            self._counts['errors'] += 1
+            send({'id': request_id, 'error': "{}: {}".format(type(error).__name__, error)})
+        try:
+            request = json.loads(line)
+            request_id = request.get('id')
+            if request.get('command') == 'metrics':
+                return send({'id': request_id, 'metrics': self.metrics()})
+            key, properties = self._parse(request)
+            values = self._values(key)
+        except Exception as error:
+            return fail(error)
+        if not isinstance(values, asyncio.Future):
+            return send({'id': request_id, 'results': self._results(values, properties, start)})
+        #
+        def done(future):
+            if future.exception() is not None:
+                fail(future.exception())
+            else:
+                send({'id': request_id, 'results': self._results(future.result(), properties, start)})
+        values.add_done_callback(done)
+        return values
+
+    async def handle(self, reader, writer):
+        """Serve one connection until the client closes it"""
+        waiting = set()
+        connection = asyncio.current_task()
+        self._connections.add(connection)
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                future = self._respond(line, writer)
+                if future is not None:
+                    waiting.add(future)
+                    future.add_done_callback(waiting.discard)
+                if writer.transport.get_write_buffer_size() > 2**20:
+                    await writer.drain()
+            if waiting:
+                await asyncio.wait(waiting)
+            await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            self._connections.discard(connection)
+            writer.close()
+
+    async def start(self, path=None, host='127.0.0.1', port=0):
+        """Start serving on a Unix socket path, or on TCP, returns the server"""
+        if path is not None:
+            return await asyncio.start_unix_server(self.handle, path=path)
+        return await asyncio.start_server(self.handle, host=host, port=port)
+
+    async def stop(self, server):
+        """Stop accepting connections and wait for the open ones to finish"""
+        server.close()
+        await server.wait_closed()
+        if self._connections:
+            await asyncio.gather(*self._connections, return_exceptions=True)
+
+def _evaluate_pipe(key):
+    """Every property of one request key with a Pipe, in PROPERTIES order"""
+    outer_diameter, wall_thickness, material, coatings_thickness, coatings_density, \
+        internal_fluid_density, external_fluid_density, length, safety_factor, end_conditions = key
+    pipe = Pipe(outer_diameter, wall_thickness, material)
+    pipe.coatings('none', coatings_thickness, coatings_density)
+    pipe.internal_fluid('water', internal_fluid_density)
+    pipe.external_fluid('sea water', external_fluid_density)
+    pipe.length(length)
+    values = []
+    for name in PROPERTIES:
+        if name in _LIMITS:
+            values.append(getattr(pipe, name)(safety_factor))
+        elif name == 'euler_load':
+            values.append(pipe.euler_load(end_conditions))
+        else:
+            values.append(getattr(pipe, name)())
+    return tuple(values)
+
+# -----------------------------------------------------------------------------
+# Client and load generator
+# -----------------------------------------------------------------------------
+class PipeClient(object):
+    """Connection to a PipeService, requests may be awaited concurrently"""
+    def __init__(self, reader, writer):
+        self._reader = reader
+        self._writer = writer
+        self._waiting = {}
+        self._next_id = 0
+        self._receiver = asyncio.ensure_future(self._receive())
+
+    @classmethod
+    async def connect(cls, path=None, host='127.0.0.1', port=8765):
+        if path is not None:
+            reader, writer = await asyncio.open_unix_connection(path)
+        else:
+            reader, writer = await asyncio.open_connection(host, port)
+        return cls(reader, writer)
+
+    async def _receive(self):
+        while True:
+            line = await self._reader.readline()
+            if not line:
+                break
+            response = json.loads(line)
+            future = self._waiting.pop(response.get('id'), None)
+            if future is not None:
+                future.set_result(response)
+        for future in self._waiting.values():
+            future.set_exception(ConnectionError("Service closed the connection"))
+
+    async def request(self, request):
+        """Send a request and return the results, raises ValueError on an error"""
+        self._next_id += 1
+        request = dict(request, id=self._next_id)
+        future = self._waiting[self._next_id] = asyncio.get_running_loop().create_future()
+        self._writer.write(json.dumps(request).encode() + b'\n')
+        response = await future
+        if 'error' in response:
+            raise ValueError(response['error'])
+        return response.get('results', response.get('metrics'))
+
+    async def metrics(self):
+        return await self.request({'command': 'metrics'})
+
+    async def close(self):
+        self._writer.close()
+        await self._writer.wait_closed()
+        await self._receiver
+
+def make_requests(count, repeat=0.2, seed=0):
+    """Random requests, the repeat fraction reuse an earlier geometry"""
+    rng = random.Random(seed)
+    requests = []
+    for index in range(count):
+        if requests and rng.random() < repeat:
+            requests.append(requests[rng.randrange(len(requests))])
+            continue
+        outer_diameter = rng.uniform(0.1, 1.0)
+        requests.append({'od': outer_diameter,
+                         'wt': outer_diameter * rng.uniform(0.02, 0.08),
+                         'material': rng.choice(['steel', 'stainless steel']),
+                         'coatings_thickness': rng.choice([0.0, 0.003, 0.05]),
+                         'coatings_density': 2400.0,
+                         'length': 12.0,
+                         'properties': list(DEFAULT_PROPERTIES)})
+    return requests
+
+async def run_load(requests, concurrency=64, path=None, host='127.0.0.1', port=8765):
+    """
+    Send the requests from concurrency connections, each waiting for every
+    answer before the next request. Returns the elapsed time and latencies.
+    """
+    clients = [await PipeClient.connect(path, host, port) for index in range(concurrency)]
+    latencies = []
+    async def worker(client, share):
+        for request in share:
+            start = time.perf_counter()
+            await client.request(request)
+            latencies.append(time.perf_counter() - start)
+    start = time.perf_counter()
+    await asyncio.gather(*[worker(client, requests[index::concurrency]) for index, client in enumerate(clients)])
+    elapsed = time.perf_counter() - start
+    for client in clients:
+        await client.close()
+    return elapsed, sorted(latencies)
+
+def _report(label, elapsed, latencies):
+    print("{:24} {:10.0f} req/s   p50 {:7.3f} ms   p99 {:7.3f} ms".format(
+            label, len(latencies) / elapsed,
+            1e3 * latencies[len(latencies) // 2], 1e3 * latencies[int(0.99 * (len(latencies) - 1))]))
+
+async def _compare(args):
+    """Run the load against a coalescing and a per-request service"""
+    requests = make_requests(args.requests, args.repeat)
+    for label, coalesce in (('per-request', False), ('coalesced', True)):
+        service = PipeService(window=args.window, coalesce=coalesce)
+        server = await service.start(host='127.0.0.1', port=0)
+        port = server.sockets[0].getsockname()[1]
+        elapsed, latencies = await run_load(requests, args.concurrency, port=port)
+        _report(label, elapsed, latencies)
+        metrics = service.metrics()
+        print("{:24} batches {:d}, mean batch {:.1f}, cache hits {:d}".format(
+                '', metrics['batches'], metrics['mean_batch'], metrics['cache_hits']))
+        await service.stop(server)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Pipe property service")
+    commands = parser.add_subparsers(dest='command', required=True)
+    serve = commands.add_parser('serve', help='run the service')
+    load = commands.add_parser('load', help='run the load generator')
+    for command in (serve, load):
+        command.add_argument('--socket', help='Unix socket path instead of TCP')
+        command.add_argument('--host', default='127.0.0.1')
+        command.add_argument('--port', type=int, default=None)
+        command.add_argument('--window', type=float, default=0.002, help='coalescing window (s)')
+    serve.add_argument('--max-batch', type=int, default=4096)
+    serve.add_argument('--cache-size', type=int, default=65536)
+    serve.add_argument('--no-coalesce', action='store_true')
+    load.add_argument('--requests', type=int, default=20000)
+    load.add_argument('--concurrency', type=int, default=64)
+    load.add_argument('--repeat', type=float, default=0.2, help='fraction of repeated geometries')
+    args = parser.parse_args(argv)
+    #
+    if args.command == 'serve':
+        async def serve_forever():
+            service = PipeService(args.window, args.max_batch, args.cache_size, not args.no_coalesce)
+            server = await service.start(args.socket, args.host, 8765 if args.port is None else args.port)
+            sys.stderr.write("Serving on {}\n".format(args.socket or server.sockets[0].getsockname()))
+            async with server:
+                await server.serve_forever()
+        asyncio.run(serve_forever())
+    elif args.socket is None and args.port is None:
+        asyncio.run(_compare(args))
+    else:
+        requests = make_requests(args.requests, args.repeat)
+        elapsed, latencies = asyncio.run(run_load(requests, args.concurrency, args.socket, args.host, args.port))
+        _report('service', elapsed, latencies)
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
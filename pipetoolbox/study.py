@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Full factorial parameter studies over pipe properties
+
+The case space is the product of the values given for each parameter. It is
+split into chunks of consecutive cases, each chunk is evaluated as one
+PipeArray and written straight into a result buffer. With more than one
+process the buffer is a block of shared memory that the workers write into,
+so no results are pickled. Every case is computed with the same expressions
+whatever the chunking, so parallel and serial runs give identical results.
+"""
+
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from .materials import material_record
+from .pipe_array import PipeArray
+
+# Study parameters with the values used when they are not given
+PARAMETERS = (
+        ('outer_diameter', (0.3239,)),
+        ('wall_thickness', (0.0127,)),
+        ('corrosion_allowance', (0.0,)),
+        ('coatings_thickness', (0.0,)),
+        ('coatings_density', (0.0,)),
+        ('internal_fluid_density', (1000.0,)),
+        ('external_fluid_density', (1025.0,)),
+        ('material', ('default',)),
+        )
+
+class ParameterStudy(object):
+    """
+    Evaluate pipe properties over every combination of the parameter values
+
+    The wall thickness used for each case is the wall thickness less the
+    corrosion allowance. Results are arrays with one axis per parameter, in
+    the order of PARAMETERS.
+    """
+    def __init__(self, properties=('tension_limit', 'bending_limit', 'pressure_internal_limit'),
+                 safety_factor=1.0, end_conditions='fixed', length=1.0, **parameters):
+        unknown = set(parameters) - set(name for name, default in PARAMETERS)
+        if unknown:
+            raise ValueError("Unknown parameters {}".format(', '.join(sorted(unknown))))
+        #
+        self._values = {}
+        for name, default in PARAMETERS:
+            values = parameters.get(name, default)
+            if np.ndim(values) == 0:
+                values = [values]
+            self._values[name] = list(values)
+        #
+        # Materials become indexes into columns of their properties
+        records = []
+        for name in self._values['material']:
+            record = material_record(name)
+            if record is None:
+                raise ValueError("Unknown material {}".format(name))
+            records.append(record)
+        #
+        self._spec = {
+                'shape': tuple(len(self._values[name]) for name, default in PARAMETERS),
+                'columns': [np.asarray(self._values[name], dtype=float) for name, default in PARAMETERS[:-1]],
+                'yield_stress': np.array([record.yield_stress for record in records]),
+                'youngs_modulus': np.array([record.youngs_modulus for record in records]),
+                'density': np.array([record.density for record in records]),
+                'properties': tuple(properties),
+                'safety_factor': safety_factor,
+                'end_conditions': end_conditions,
+                'length': length,
+                }
+
+    def shape(self):
+        """Number of values of each parameter"""
+        return self._spec['shape']
+
+    def cases(self):
+        """Total number of cases"""
+        return int(np.prod(self._spec['shape']))
+
+    def values(self, name):
+        """Return the values of a parameter"""
+        return list(self._values[name])
+
+    # -------------------------------------------------------------------------
+    # Running
+    # -------------------------------------------------------------------------
+    def run(self, processes=None, chunk_size=250000, progress=None):
+        """
+        Evaluate every case and return a dictionary of result arrays keyed by
+        property. Processes defaults to the number of CPUs, 1 runs serially in
+        this process. Progress may be a function called with the number of
+        cases done and the total, or True to report on stderr.
+        """
+        if processes is None:
+            processes = os.cpu_count() or 1
+        if progress is True:
+            progress = _report
+        total = self.cases()
+        chunks = [(start, min(start + chunk_size, total)) for start in range(0, total, chunk_size)]
+        buffer_shape = (len(self._spec['properties']), total)
+        #
+        if processes <= 1 or len(chunks) <= 1:
+            buffer = np.empty(buffer_shape)
+            done = 0
+            for start, stop in chunks:
+                _evaluate(self._spec, buffer, start, stop)
+                done += stop - start
+                if progress:
+                    progress(done, total)
+            return self._results(buffer)
+        #
+        memory = shared_memory.SharedMemory(create=True, size=max(1, 8 * buffer_shape[0] * buffer_shape[1]))
+        try:
+            buffer = np.ndarray(buffer_shape, dtype=float, buffer=memory.buf)
+            with ProcessPoolExecutor(max_workers=processes) as executor:
+                futures = {executor.submit(_run_chunk, memory.name, buffer_shape, self._spec, start, stop): stop - start
+                           for start, stop in chunks}
+                done = 0
+                for future in as_completed(futures):
+                    future.result()
+                    done += futures[future]
+                    if progress:
+                        progress(done, total)
+            results = self._results(buffer.copy())
+            del buffer
+            return results
+        finally:
+            memory.close()
+            memory.unlink()
+
+    def _results(self, buffer):
+        return {name: buffer[index].reshape(self._spec['shape'])
+                for index, name in enumerate(self._spec['properties'])}
+
+def _evaluate(spec, buffer, start, stop):
+    """Evaluate the cases start to stop into the columns of the buffer"""
+    index = np.unravel_index(np.arange(start, stop), spec['shape'])
+    outer_diameter, wall_thickness, corrosion, coatings_thickness, coatings_density, \
+        internal_fluid_density, external_fluid_density = [
+                column[column_index] for column, column_index in zip(spec['columns'], index)]
+    material = index[-1]
+    batch = PipeArray(outer_diameter, wall_thickness - corrosion,
+                      coatings_thickness=coatings_thickness,
+                      coatings_density=coatings_density,
+                      internal_fluid_density=internal_fluid_density,
+                      external_fluid_density=external_fluid_density,
+                      length=spec['length'],
+                      yield_stress=spec['yield_stress'][material],
+                      youngs_modulus=spec['youngs_modulus'][material],
+                      density=spec['density'][material])
+    results = batch.properties(spec['properties'], spec['safety_factor'], spec['end_conditions'])
+    for row, name in enumerate(spec['properties']):
+        buffer[row, start:stop] = results[name]
+
+def _run_chunk(memory_name, buffer_shape, spec, start, stop):
+    """Worker, attach to the shared result buffer and evaluate one chunk"""
+    memory = shared_memory.SharedMemory(name=memory_name)
+    try:
+        buffer = np.ndarray(buffer_shape, dtype=float, buffer=memory.buf)
+        _evaluate(spec, buffer, start, stop)
+        del buffer
+    finally:
+        memory.close()
+
+def _report(done, total):
+    sys.stderr.write("\r{:d} / {:d} cases ({:.0%})".format(done, total, done / float(total)))
+    if done == total:
+        sys.stderr.write("\n")
+    sys.stderr.flush()
@@ -13,5 +13,10 @@ setup(name='pipetoolbox',
       author_email='chris@bridgeboys.co.uk',
       license='public',
       packages=['pipetoolbox'],
+      install_requires=['numpy'],
+      entry_points={'console_scripts': [
+          'pipetoolbox-linelist=pipetoolbox.linelist:main',
+          'pipetoolbox-service=pipetoolbox.service:main',
+          ]},
       zip_safe=False)
    
\ No newline at end of file
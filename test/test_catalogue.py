@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Check the standard size catalogue lookups and queries
+"""
+
+import numpy as np
+import pytest
+
+import pipetoolbox as ptb
+from pipetoolbox.catalogue import nominal_size
+
+
+def test_from_schedule():
+    pipe = ptb.Pipe.from_schedule('10in', 'SCH40')
+    assert pipe.diameter_outer() == pytest.approx(0.27305)
+    assert pipe.wall_thickness() == pytest.approx(0.009271)
+    assert ptb.Pipe.from_schedule('DN250', 'STD').wall_thickness() == pipe.wall_thickness()
+    assert ptb.Pipe.from_schedule(12, '40S', 'stainless steel')._material.name == 'stainless steel'
+    with pytest.raises(ValueError):
+        ptb.Pipe.from_schedule('3-1/2in', '160')
+
+
+def test_nominal_size_names():
+    assert nominal_size('1.5in') == '1-1/2'
+    assert nominal_size('NPS 1/2') == '1/2'
+    assert nominal_size(24) == '24'
+    with pytest.raises(ValueError):
+        nominal_size('11in')
+
+
+def test_columns_match_pipe():
+    catalogue = ptb.PipeCatalogue()
+    assert np.all(np.diff(catalogue.column('outer_diameter')) >= 0.0)
+    row = catalogue.row('6in', 'XS')
+    pipe = ptb.Pipe.from_schedule('6in', 'XS')
+    for name in ('area_steel', 'second_moment', 'mass_steel', 'pressure_internal_limit'):
+        assert catalogue.column(name)[row] == getattr(pipe, name)()
+
+
+def test_nearest_size():
+    catalogue = ptb.PipeCatalogue()
+    assert catalogue.nearest_size(0.27) == '10'
+    assert catalogue.nearest_size([0.001, 0.3239, 0.5, 2.0]) == ['1/8', '12', '20', '24']
+
+
+def test_select_matches_a_scan():
+    catalogue = ptb.PipeCatalogue()
+    rows = catalogue.select(pressure_internal_limit=(20e6, None), mass_steel=(None, 80.0))
+    pressure = catalogue.column('pressure_internal_limit')
+    mass = catalogue.column('mass_steel')
+    assert rows.tolist() == np.flatnonzero((pressure >= 20e6) & (mass <= 80.0)).tolist()
+    pipes = catalogue.pipes(rows)
+    assert all(pipe.pressure_internal_limit() >= 20e6 for pipe in pipes)
+    assert catalogue.pipe_array(rows).mass_steel().tolist() == mass[rows].tolist()
+    assert len(catalogue.select()) == len(catalogue)
@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Check the combined loading utilisation and the chunked time series checks
+"""
+
+import numpy as np
+import pytest
+
+import pipetoolbox as ptb
+from pipetoolbox.combined_loading import check_time_series, combined_utilisation
+
+
+def make_series(steps=3000, nodes=40, seed=4):
+    rng = np.random.default_rng(seed)
+    phase = rng.uniform(0.0, 2.0 * np.pi, nodes)
+    time = np.linspace(0.0, 300.0, steps)
+    wave = np.sin(0.7 * time[:, None] + phase) + 0.3 * rng.standard_normal((steps, nodes))
+    tension = 1.5e6 + 0.8e6 * wave
+    moment = 4.0e5 * np.cos(0.7 * time[:, None] + phase) * np.linspace(0.2, 1.0, nodes)
+    return time, tension, moment
+
+
+def test_axial_only_matches_the_capacities():
+    pipe = ptb.Pipe(0.3239, 0.0127)
+    tension = 0.3 * pipe.tension_limit()
+    moment = 0.2 * pipe.bending_limit()
+    assert combined_utilisation(pipe, tension, moment, design_factor=1.0) == pytest.approx(0.5)
+    assert combined_utilisation(pipe, -tension, moment, design_factor=1.0) == pytest.approx(0.5)
+
+
+def test_pressure_only_is_von_mises():
+    pipe = ptb.Pipe(0.3239, 0.0127)
+    pressure = 20e6
+    # Closed end axial stress from the internal pressure on the end cap
+    axial = pressure * pipe.area_inner() / pipe.area_steel()
+    hoop = pressure * pipe.diameter_inner() / (2.0 * pipe.wall_thickness())
+    radial = -0.5 * pressure
+    expected = np.sqrt(0.5 * ((hoop - radial)**2 + (radial - axial)**2 + (axial - hoop)**2))
+    assert combined_utilisation(pipe, 0.0, 0.0, pressure, case_factor=1.5) == \
+        pytest.approx(expected / (1.5 * 2.0 / 3.0 * pipe.yield_stress()))
+
+
+def test_time_series_matches_a_full_evaluation(tmp_path):
+    time, tension, moment = make_series()
+    section = ptb.PipeArray(0.3239, np.linspace(0.0127, 0.0159, tension.shape[1]))
+    np.save(str(tmp_path / 'tension.npy'), tension)
+    np.save(str(tmp_path / 'moment.npy'), moment)
+    result = check_time_series(section, str(tmp_path / 'tension.npy'), str(tmp_path / 'moment.npy'),
+                               pressure_internal=10e6, pressure_external=2e6, time=time,
+                               thresholds=(1.5, 2.0), chunk_size=257)
+    full = combined_utilisation(section, tension, moment, 10e6, 2e6)
+    assert result.utilisation.tolist() == full.max(axis=0).tolist()
+    assert result.time_index.tolist() == full.argmax(axis=0).tolist()
+    assert result.time.tolist() == time[full.argmax(axis=0)].tolist()
+    for row, threshold in enumerate(result.thresholds):
+        above = full > threshold
+        assert result.exceedances[row].tolist() == above.sum(axis=0).tolist()
+        crossings = above[0].astype(int) + (above[1:] & ~above[:-1]).sum(axis=0)
+        assert result.upcrossings[row].tolist() == crossings.tolist()
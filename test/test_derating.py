@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Check the temperature derating tables and the derated Pipe limits
+"""
+
+import numpy as np
+import pytest
+
+import pipetoolbox as ptb
+from pipetoolbox import derating
+
+from test_pipe_array import make_pipes
+
+
+def test_table_reproduces_the_curves():
+    temperatures = np.linspace(-60.0, 420.0, 4801)
+    for name, curves in derating.derating_default().items():
+        for kind, factor in (('yield', derating.yield_factor), ('youngs', derating.youngs_factor)):
+            knots = np.array(curves[kind])
+            expected = np.interp(temperatures, knots[:, 0], knots[:, 1])
+            assert np.allclose(factor(name, temperatures), expected, rtol=0.0, atol=1e-12)
+
+
+def test_carbon_steel_yield_derating():
+    pipe = ptb.Pipe(0.3239, 0.0127)
+    assert pipe.tension_limit(temperature=20.0) == pipe.tension_limit()
+    assert pipe.yield_stress(100.0) == pytest.approx(358.5e6 - 30.0e6, rel=1e-4)
+    assert pipe.yield_stress(200.0) == pytest.approx(358.5e6 - 70.0e6, rel=1e-4)
+    assert pipe.euler_load('pin-pin', 204.0) == pytest.approx(0.939 * pipe.euler_load('pin-pin'))
+
+
+def test_unknown_material_is_not_derated():
+    pipe = ptb.Pipe(0.3239, 0.0127)
+    pipe.material(ptb.MaterialRecord('custom', 400e6, 500e6, 0.3, 200e9, 7850.0, 1.2e-5))
+    assert pipe.bending_limit(temperature=150.0) == pipe.bending_limit()
+
+
+def test_scalar_and_array_temperatures_match():
+    pipe = ptb.Pipe(0.3239, 0.0127, 'stainless steel')
+    temperatures = np.linspace(0.0, 250.0, 101)
+    expected = [pipe.pressure_internal_limit(1.0, temperature) for temperature in temperatures.tolist()]
+    assert pipe.pressure_internal_limit(1.0, temperatures).tolist() == expected
+
+
+def test_pipe_array_matches_scalar_pipe_exactly():
+    pipes = make_pipes()
+    batch = ptb.PipeArray.from_pipes(pipes)
+    temperatures = np.random.default_rng(2).uniform(-20.0, 350.0, len(pipes))
+    results = batch.properties(['tension_limit', 'bending_limit', 'euler_load'],
+                               0.8, 'pin-fix', temperatures)
+    for name in results:
+        method = getattr(ptb.Pipe, name)
+        argument = 'pin-fix' if name == 'euler_load' else 0.8
+        expected = [method(pipe, argument, temperature=temperature)
+                    for pipe, temperature in zip(pipes, temperatures.tolist())]
+        assert results[name].tolist() == expected, name
+    assert batch.pipe(1).tension_limit(temperature=90.0) == pipes[1].tension_limit(temperature=90.0)
+
+
+def test_register_derating_keeps_rows():
+    rows = derating.material_rows(['steel', 'stainless steel'])
+    derating.register_derating('duplex test', [20.0, 100.0, 200.0], [1.0, 0.75, 0.61])
+    try:
+        assert derating.material_rows(['steel', 'stainless steel']).tolist() == rows.tolist()
+        assert derating.yield_factor('duplex test', 150.0) == pytest.approx(0.68)
+        assert derating.youngs_factor('duplex test', 150.0) == 1.0
+        with pytest.raises(ValueError):
+            derating.register_derating('bad', [100.0, 20.0], [1.0, 0.9])
+    finally:
+        del derating._curves['duplex test']
+        derating._table = None
+
+
+def test_curve_beyond_the_default_grid():
+    derating.register_derating('hot test', [20.0, 300.0, 600.0], [1.0, 0.8, 0.4])
+    try:
+        assert derating.yield_factor('hot test', 550.0) == pytest.approx(0.8 - 0.4 * 250.0 / 300.0)
+        assert derating.yield_factor('hot test', np.array([550.0, 700.0])).tolist() == pytest.approx(
+                [0.8 - 0.4 * 250.0 / 300.0, 0.4])
+        assert derating.yield_factor('steel', 500.0) == derating.yield_factor('steel', 300.0)
+        with pytest.raises(ValueError):
+            derating.register_derating('off grid', [20.5, 100.0], [1.0, 0.5])
+    finally:
+        del derating._curves['hot test']
+        derating._table = None
@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Check the design optimiser against a brute force search over Pipe objects
+"""
+
+import numpy as np
+
+import pipetoolbox as ptb
+
+
+def brute_force(diameters, walls, materials, loads, objective):
+    tension, moment, pressure, buckling_load = loads
+    best = None
+    for material in materials:
+        for diameter in diameters:
+            for wall in walls:
+                if 2.0 * wall >= diameter:
+                    continue
+                pipe = ptb.Pipe(diameter, wall, material)
+                pipe.internal_fluid('oil', 850.0)
+                pipe.length(20.0)
+                if (pipe.tension_limit(0.8) >= tension
+                        and pipe.bending_limit(0.8) >= moment
+                        and pipe.pressure_internal_limit(0.8) >= pressure
+                        and pipe.euler_load('pin-pin') >= buckling_load):
+                    mass = getattr(pipe, objective)()
+                    if best is None or mass < best[0]:
+                        best = (mass, diameter, wall, material)
+    return best
+
+
+def test_matches_brute_force():
+    diameters = np.linspace(0.1, 0.6, 26)
+    walls = np.linspace(0.004, 0.04, 19)
+    materials = ['steel', 'stainless steel']
+    template = ptb.Pipe()
+    template.internal_fluid('oil', 850.0)
+    template.length(20.0)
+    for loads in [(2.0e6, 1.0e5, 20.0e6, 5.0e5),
+                  (5.0e6, 0.0, 0.0, 0.0),
+                  (0.0, 0.0, 60.0e6, 0.0)]:
+        for objective in ('mass_steel', 'mass_total'):
+            pipe = ptb.design_optimize(diameters, walls, materials, *loads,
+                                       end_conditions='pin-pin', safety_factor=0.8,
+                                       objective=objective, template=template)
+            expected = brute_force(diameters.tolist(), walls.tolist(), materials, loads, objective)
+            assert getattr(pipe, objective)() == expected[0]
+            assert pipe.diameter_outer() == expected[1]
+
+
+def test_infeasible_returns_none():
+    assert ptb.design_optimize([0.1, 0.2], [0.005, 0.01], tension=1e12) is None
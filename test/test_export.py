@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Check the structured array export of PipeArray properties
+"""
+
+import numpy as np
+import pytest
+
+import pipetoolbox as ptb
+from pipetoolbox.export import property_columns
+from pipetoolbox.pipe_array import PROPERTIES
+from test_pipe_array import make_pipes
+
+
+def test_records_match_properties():
+    batch = ptb.PipeArray.from_pipes(make_pipes(50))
+    records = batch.to_records(safety_factor=0.8, temperature=120.0)
+    expected = batch.properties(PROPERTIES, 0.8, 'fixed', 120.0)
+    assert records.dtype.names == PROPERTIES
+    for name in PROPERTIES:
+        assert records[name].tolist() == expected[name].tolist(), name
+
+
+def test_save_and_load_memory_map(tmp_path):
+    batch = ptb.PipeArray.from_pipes(make_pipes(103))
+    names = ('area_steel', 'mass_total', 'euler_load')
+    temperature = np.linspace(20.0, 150.0, 103)
+    filename = str(tmp_path / 'sections.npy')
+    ptb.save_properties(filename, batch, names, temperature=temperature, chunk_size=10)
+    records = ptb.load_properties(filename)
+    assert isinstance(records, np.memmap)
+    expected = batch.to_records(names, temperature=temperature)
+    assert records.tobytes() == expected.tobytes()
+
+
+def test_sections_share_columns():
+    batch = ptb.PipeArray.from_pipes(make_pipes(20))
+    part = batch.sections(5, 12)
+    assert part.shape == (7,)
+    assert np.shares_memory(part.diameter_outer(), batch.diameter_outer())
+    assert part.mass_total().tolist() == batch.mass_total()[5:12].tolist()
+
+
+def test_columns_are_views():
+    records = ptb.PipeArray.from_pipes(make_pipes(10)).to_records(('area_steel', 'mass_total'))
+    columns = property_columns(records)
+    assert list(columns) == ['area_steel', 'mass_total']
+    assert all(np.shares_memory(column, records) for column in columns.values())
+
+
+def test_output_must_match():
+    batch = ptb.PipeArray.from_pipes(make_pipes(10))
+    with pytest.raises(ValueError):
+        batch.to_records(('area_steel',), out=np.empty(9, batch.to_records(('area_steel',)).dtype))
+    with pytest.raises(ValueError):
+        batch.to_records(('area_steel',), out=np.empty(10))
+
+
+def test_sections_of_broadcast_columns(tmp_path):
+    batch = ptb.PipeArray([0.3239], np.linspace(0.01, 0.02, 10))
+    assert batch.sections(5, 8).area_steel().tolist() == batch.area_steel()[5:8].tolist()
+    filename = str(tmp_path / 'broadcast.npy')
+    records = ptb.save_properties(filename, batch, ('area_steel',), chunk_size=3)
+    assert records['area_steel'].tolist() == batch.area_steel().tolist()
+
+
+def test_assigning_into_sections():
+    batch = ptb.PipeArray([0.3239], np.linspace(0.01, 0.02, 10), length=12.0)
+    pipe = ptb.Pipe(0.3239, 0.0159)
+    pipe.length(12.0)
+    part = batch.sections(2, 6)
+    part[0] = pipe
+    assert part.area_steel()[0] == pipe.area_steel()
+    assert batch.area_steel()[2] != pipe.area_steel()
+    string = ptb.PipeString(batch.sections(2, 6))
+    string.set_segment(1, pipe)
+    assert string.segment(1).area_steel() == pipe.area_steel()
@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Check the free span screening against the scalar Pipe methods
+"""
+
+import numpy as np
+import pytest
+
+import pipetoolbox as ptb
+from pipetoolbox.freespan import END_CONDITIONS, end_condition_codes, screen_spans
+
+
+def make_spans(count=2000, seed=5):
+    rng = np.random.default_rng(seed)
+    lengths = rng.uniform(5.0, 80.0, count)
+    end_conditions = rng.choice(['pin-pin', 'pin-fix', 'fix-fix'], count)
+    return lengths, end_conditions
+
+
+def test_euler_load_matches_pipe_exactly():
+    lengths, end_conditions = make_spans()
+    pipe = ptb.Pipe(0.3239, 0.0127)
+    result = screen_spans(pipe, lengths, end_conditions)
+    for length, end, load in zip(lengths.tolist(), end_conditions.tolist(), result.euler_load.tolist()):
+        pipe.length(length)
+        assert load == pipe.euler_load(end)
+
+
+def test_natural_frequency():
+    pipe = ptb.Pipe(0.3239, 0.0127)
+    pipe.coatings('concrete', 0.05, 2400.0)
+    result = screen_spans(pipe, 40.0, 'pin-pin', added_mass_coefficient=1.0)
+    mass = pipe.mass_total() + pipe.area_external() * 1025.0
+    expected = 0.5 * np.pi * np.sqrt(pipe.youngs_modulus() * pipe.second_moment() / (mass * 40.0**4))
+    assert result.frequency == pytest.approx(expected)
+    # Tension stiffens the span, at the Euler load in tension by sqrt(2)
+    stiffened = screen_spans(pipe, 40.0, 'pin-pin', axial_force=result.euler_load)
+    assert stiffened.frequency == pytest.approx(np.sqrt(2.0) * expected)
+
+
+def test_failing_spans_are_flagged():
+    lengths, end_conditions = make_spans()
+    pipe = ptb.Pipe(0.3239, 0.0127)
+    compression = -2.0e5
+    result = screen_spans(pipe, lengths, end_conditions, axial_force=compression,
+                          current_velocity=0.4, safety_factor=0.8)
+    assert result.buckled.tolist() == (-compression > 0.8 * result.euler_load).tolist()
+    assert np.all(result.frequency[result.buckled] == 0.0)
+    velocity = 0.4 / (result.frequency[~result.buckled] * pipe.diameter_external())
+    assert result.vortex[~result.buckled].tolist() == (velocity > 1.0).tolist()
+    assert result.failed.tolist() == (result.buckled | result.vortex).tolist()
+    assert result.failed.any() and not result.failed.all()
+
+
+def test_pipe_array_sections_and_codes():
+    lengths, end_conditions = make_spans(50)
+    section = ptb.PipeArray(0.3239, np.linspace(0.0095, 0.0191, 50), length=lengths)
+    codes = end_condition_codes(end_conditions)
+    assert [END_CONDITIONS[code] for code in codes] == end_conditions.tolist()
+    result = screen_spans(section, lengths, codes)
+    assert result.euler_load.tolist() == [section.euler_load(end)[index]
+                                          for index, end in enumerate(end_conditions)]
+
+
+def test_unknown_end_conditions():
+    with pytest.raises(ValueError):
+        screen_spans(ptb.Pipe(0.3239, 0.0127), [10.0, 20.0], ['pin-pin', 'clamped'])
+    with pytest.raises(ValueError):
+        ptb.Pipe(0.3239, 0.0127).euler_load('clamped')
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Check the opt-in instrumentation of the Pipe and Materials methods
+"""
+
+import json
+import os
+import pstats
+import subprocess
+import sys
+
+import pytest
+
+import pipetoolbox as ptb
+
+
+def test_counts_calls_and_cache():
+    original = ptb.Pipe.__dict__['area_steel']
+    with ptb.instrument() as stats:
+        assert ptb.Pipe.__dict__['area_steel'] is not original
+        pipe = ptb.Pipe(0.3239, 0.0127)
+        for _ in range(3):
+            pipe.area_steel()
+        pipe.t(0.02)
+        pipe.area_steel()
+        materials = ptb.Materials()
+        materials.get_material('stainless steel')
+    assert ptb.Pipe.__dict__['area_steel'] is original
+    assert not stats.enabled
+    methods = stats.report()['methods']
+    assert methods['Pipe.area_steel']['calls'] == 4
+    assert methods['Pipe.area_steel']['cache_hits'] == 2
+    assert methods['Pipe.area_steel']['cache_misses'] == 2
+    assert methods['Pipe.area_outer']['cache_hits'] == 1
+    assert methods['Pipe.__init__']['calls'] == 1
+    assert methods['Materials.get_material']['calls'] == 1
+    assert methods['Pipe.area_steel']['time'] >= methods['Pipe.area_steel']['own_time']
+    #
+    # Calls after disabling are not counted
+    pipe.second_moment()
+    assert stats.report()['methods'] == methods
+
+
+def test_cprofile_format(tmp_path):
+    with ptb.instrument() as stats:
+        ptb.Pipe(0.3239, 0.0127).radius_of_gyration()
+    filename = str(tmp_path / 'pipe.prof')
+    stats.dump_stats(filename)
+    loaded = pstats.Stats(filename)
+    keys = {key[2]: key for key in loaded.stats}
+    assert 'Pipe.radius_of_gyration' in keys
+    callers = loaded.stats[keys['Pipe.second_moment']][4]
+    assert keys['Pipe.radius_of_gyration'] in callers
+    assert pstats.Stats(stats).total_calls == loaded.total_calls
+
+
+def test_enable_twice():
+    stats = ptb.instrument()
+    stats.enable()
+    try:
+        with pytest.raises(RuntimeError):
+            stats.enable()
+    finally:
+        stats.disable()
+
+
+def test_environment_variable(tmp_path):
+    filename = str(tmp_path / 'report.json')
+    environment = dict(os.environ, PIPETOOLBOX_INSTRUMENT=filename)
+    subprocess.run([sys.executable, '-c', 'import pipetoolbox as ptb; ptb.Pipe(0.3, 0.01).mass_total()'],
+                   env=environment, check=True)
+    with open(filename) as json_file:
+        report = json.load(json_file)
+    assert report['methods']['Pipe.mass_total']['calls'] == 1
+
+
+def test_threads_keep_their_own_call_stack():
+    import threading
+    count = 2000
+    #
+    def pipes():
+        for _ in range(count):
+            ptb.Pipe(0.3239, 0.0127).radius_of_gyration()
+    #
+    def materials():
+        material = ptb.Materials()
+        for _ in range(count):
+            material.get_material('steel')
+    #
+    with ptb.instrument() as stats:
+        threads = [threading.Thread(target=target) for target in (pipes, materials)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    stats.create_stats()
+    callers = {key[2]: {caller[2] for caller in value[4]} for key, value in stats.stats.items()}
+    assert callers['Materials.get_material'] == set()
+    assert callers['Pipe.second_moment'] == {'Pipe.radius_of_gyration'}
+    methods = stats.report()['methods']
+    assert methods['Materials.get_material']['calls'] == count
+    assert methods['Pipe.radius_of_gyration']['calls'] == count
@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Check the streaming line list against Pipe
+"""
+
+import csv
+
+import pytest
+
+import pipetoolbox as ptb
+from pipetoolbox.linelist import process_line_list
+
+
+def test_line_list_matches_pipe(tmp_path):
+    lines = tmp_path / 'lines.tsv'
+    lines.write_text("Tag\tOD\tWT\tMaterial\tcoatings_thickness\tcoatings_density\tinternal_fluid_density\tlength\n"
+                     "L-001\t0.3239\t0.0127\tsteel\t0.003\t900\t\t12\n"
+                     "L-002\t0.1683\t0.0071\tstainless steel\t\t\t820\t6\n"
+                     "L-003\t0.6096\t0.0254\tsteel\t0.05\t2400\t1025\t\n")
+    results = tmp_path / 'results.tsv'
+    properties = ['mass_total', 'tension_limit', 'euler_load']
+    assert process_line_list(str(lines), str(results), properties, chunk_size=2) == 3
+    #
+    with open(str(results), newline='') as results_file:
+        rows = list(csv.reader(results_file, delimiter='\t'))
+    assert rows[0] == ['tag'] + properties
+    pipe = ptb.Pipe(0.1683, 0.0071, 'stainless steel')
+    pipe.internal_fluid('oil', 820.0)
+    pipe.length(6.0)
+    assert rows[2][0] == 'L-002'
+    assert [float(value) for value in rows[2][1:]] == [
+            pipe.mass_total(), pipe.tension_limit(), pipe.euler_load()]
+
+
+def test_blank_and_short_rows(tmp_path):
+    lines = tmp_path / 'lines.csv'
+    lines.write_text("tag,od,wt,material,internal_fluid_density,length\n"
+                     "L-001,0.3239,0.0127,steel,820,12\n"
+                     "\n"
+                     "L-002,0.1683,0.0071\n"
+                     ",,,,,\n"
+                     "\n")
+    results = tmp_path / 'results.csv'
+    assert process_line_list(str(lines), str(results), ['mass_total'], chunk_size=1) == 2
+    with open(str(results), newline='') as results_file:
+        rows = list(csv.reader(results_file))
+    assert [row[0] for row in rows[1:]] == ['L-001', 'L-002']
+    assert float(rows[2][1]) == ptb.Pipe(0.1683, 0.0071).mass_total()
+
+
+def test_long_row_is_an_error(tmp_path):
+    lines = tmp_path / 'lines.csv'
+    lines.write_text("tag,od,wt\n"
+                     "L-001,0.3239,0.0127\n"
+                     "L-002,0.1683,0.0071,steel\n")
+    with pytest.raises(ValueError, match='row 3'):
+        process_line_list(str(lines), str(tmp_path / 'results.csv'))
+
+
+def test_unknown_columns_and_missing_header(tmp_path):
+    lines = tmp_path / 'lines.csv'
+    lines.write_text("tag,od,wt,coating_thickness,contents\n"
+                     "L-001,0.3239,0.0127,0.003,oil\n")
+    with pytest.raises(ValueError, match='coating_thickness, contents'):
+        process_line_list(str(lines), str(tmp_path / 'results.csv'))
+    empty = tmp_path / 'empty.csv'
+    empty.write_text("")
+    with pytest.raises(ValueError, match='header'):
+        process_line_list(str(empty), str(tmp_path / 'results.csv'))
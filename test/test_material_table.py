@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Check the material table queries against full scans
+"""
+
+import io
+
+import numpy as np
+
+import pipetoolbox as ptb
+
+
+def make_table(count=5000, seed=3):
+    rng = np.random.default_rng(seed)
+    records = [ptb.MaterialRecord('grade {:05d}'.format(index),
+                                  rng.uniform(200e6, 900e6), rng.uniform(300e6, 1100e6), 0.3,
+                                  rng.uniform(150e9, 240e9), rng.uniform(7600.0, 8200.0),
+                                  1.2e-5) for index in range(count)]
+    return records, ptb.MaterialTable(records)
+
+
+def test_compound_select_matches_a_scan():
+    records, table = make_table()
+    rows = table.select(youngs_modulus=(180e9, 220e9), density=(None, 8000.0))
+    expected = [index for index, record in enumerate(records)
+                if 180e9 <= record.youngs_modulus <= 220e9 and record.density <= 8000.0]
+    assert rows.tolist() == expected
+
+
+def test_sort_and_top_by_a_ratio():
+    records, table = make_table()
+    rows = table.select(youngs_modulus=(180e9, 220e9))
+    ordered = table.sort(rows, 'yield_stress/density', descending=True)
+    ratios = [records[row].yield_stress / records[row].density for row in ordered]
+    assert ratios == sorted(ratios, reverse=True)
+    assert table.top('yield_stress/density', 5, rows).tolist() == ordered[:5].tolist()
+    best = max(range(len(records)), key=lambda index: records[index].yield_stress / records[index].density)
+    assert table.top('yield_stress/density', 1).tolist() == [best]
+
+
+def test_missing_values_are_not_selected():
+    table = ptb.MaterialTable.from_youngs_reference()
+    assert len(table.select(density=(None, None))) == 0
+    names = table.names(table.select(youngs_modulus=(180e9, 220e9)))
+    assert 'steel' in names and 'glass' not in names
+    assert table.names(table.top('youngs_modulus', 1)) == ['carbyne']
+
+
+def test_display_and_export(tmp_path):
+    records, table = make_table(10)
+    output = io.StringIO()
+    table.display([0, 1], file=output)
+    assert output.getvalue().splitlines()[3].startswith('grade 00000')
+    table.export_csv(str(tmp_path / 'grades.csv'), [2, 3])
+    with ptb.MaterialsDatabase(str(tmp_path / 'grades.db')) as database:
+        database.import_csv(str(tmp_path / 'grades.csv'))
+        assert database.names() == ['grade 00002', 'grade 00003']
+        assert ptb.MaterialTable.from_database(database).records() == records[2:4]
+
+
+def test_database_display(capsys):
+    ptb.Materials().database_display()
+    lines = capsys.readouterr().out.splitlines()
+    assert lines[3].split()[:3] == ['default', '358.5', '394.3']
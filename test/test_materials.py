@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Checks on the materials database
+"""
+
+import pipetoolbox as ptb
+
+
+def test_pipes_share_the_material_record():
+    first = ptb.Pipe(0.2191, 0.0082, 'stainless steel')
+    second = ptb.Pipe(0.2731, 0.0093)
+    second.material('stainless steel')
+    assert first._material is second._material is ptb.material_record('stainless steel')
+
+
+def test_changing_a_property_copies_the_record():
+    materials = ptb.Materials('steel')
+    materials.yield_stress(450.0e6)
+    assert materials.yield_stress() == 450.0e6
+    assert ptb.material_record('steel').yield_stress == 358.5e6
+    pipe = ptb.Pipe(0.2191, 0.0082)
+    pipe.material(materials.record())
+    assert pipe.tension_limit() == pipe.area_steel() * 450.0e6
+
+
+def test_additions_are_shared_unless_private():
+    shared = ptb.Materials()
+    shared.addmat('test duplex', 450e6, 620e6, 200e9, 0.3, 7800.0, 1.3e-5)
+    assert ptb.Materials('test duplex').name() == 'test duplex'
+    assert ptb.Pipe(0.1, 0.01, 'test duplex')._material.density == 7800.0
+    #
+    private = ptb.Materials()
+    private.database_private()
+    private.addmat('test private', 500e6, 650e6, 200e9, 0.3, 7850.0, 1.2e-5)
+    assert private.name() == 'test private'
+    assert ptb.material_record('test private') is None
+    assert not ptb.Materials().get_material('test private')
+
+
+def test_library_save_load_keeps_the_selection(tmp_path):
+    filename = str(tmp_path / 'grades.db')
+    with ptb.MaterialsDatabase(filename) as database:
+        database.add([ptb.MaterialRecord('x65 at 100C', 418e6, 501e6, 0.3, 200e9, 7850.0, 1.2e-5),
+                      ptb.MaterialRecord('x65', 448e6, 531e6, 0.3, 207e9, 7850.0, 1.2e-5)])
+    #
+    materials = ptb.Materials('stainless steel')
+    materials.database_private()
+    database = materials.database_load(filename)
+    assert materials.name() == 'stainless steel'
+    assert materials.get_material('x65 at 100C')
+    assert materials.yield_stress() == 418e6
+    assert ptb.material_record('x65') is None
+    #
+    ptb.database_attach(database)
+    try:
+        assert ptb.Pipe(0.3239, 0.0127, 'x65')._material.youngs_modulus == 207e9
+    finally:
+        ptb.database_detach(database)
+        database.close()
+
+
+def test_library_csv_round_trip(tmp_path):
+    with ptb.MaterialsDatabase(str(tmp_path / 'a.db')) as database:
+        ptb.Materials().database_save(database.filename())
+        database.export_csv(str(tmp_path / 'a.csv'))
+        names = database.names()
+    with ptb.MaterialsDatabase(str(tmp_path / 'b.db')) as database:
+        database.import_csv(str(tmp_path / 'a.csv'))
+        assert database.names() == names
+        assert database.get('default') == ptb.material_record('default')
+
+
+def test_legacy_pickle_is_imported():
+    import os
+    materials = ptb.Materials()
+    materials.database_private()
+    materials.database_load(os.path.join(os.path.dirname(__file__), 'Materials.txt'))
+    assert materials.get_material('stainless steel')
+    assert materials.density() == 8030.0
+
+
+def test_library_load_is_local_and_opened_once(tmp_path):
+    filename = str(tmp_path / 'local.db')
+    with ptb.MaterialsDatabase(filename) as database:
+        database.add([ptb.MaterialRecord('x70', 483e6, 565e6, 0.3, 207e9, 7850.0, 1.2e-5)])
+    #
+    materials = ptb.Materials()
+    database = materials.database_load(filename)
+    try:
+        assert materials.database_load(filename) is database
+        assert materials._databases.count(database) == 1
+        assert materials.get_material('x70')
+        assert not ptb.Materials().get_material('x70')
+        assert ptb.material_record('x70') is None
+    finally:
+        database.close()
+
+
+def test_unknown_material_name_is_an_error():
+    import pytest
+    with pytest.raises(ValueError, match='stainles steel'):
+        ptb.Pipe(0.3239, 0.0127, 'stainles steel')
@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Checks on the scalar Pipe object
+"""
+
+import pipetoolbox as ptb
+
+
+def test_cache_hits_and_invalidation():
+    pipe = ptb.Pipe(0.3239, 0.0127)
+    mass = pipe.mass_total()
+    hits, misses = pipe.cache_info()['hits'], pipe.cache_info()['misses']
+    assert pipe.mass_total() == mass
+    assert pipe.cache_info()['hits'] == hits + 1
+    assert pipe.cache_info()['misses'] == misses
+    #
+    # Changing the external fluid or length does not touch the mass
+    pipe.external_fluid('brine', 1200.0)
+    pipe.length(12.0)
+    pipe.mass_total()
+    assert pipe.cache_info()['misses'] == misses
+    #
+    # Each input that the mass depends on triggers a recompute
+    for change in (lambda: pipe.od(0.3556),
+                   lambda: pipe.t(0.015),
+                   lambda: pipe.coatings('pp', 0.003, 900.0),
+                   lambda: pipe.internal_fluid('oil', 800.0),
+                   lambda: pipe.material('stainless steel')):
+        before = pipe.mass_total()
+        change()
+        fresh = ptb.Pipe(pipe.diameter_outer(), pipe.wall_thickness())
+        fresh.coatings('pp', pipe._coatings.thickness, pipe._coatings.density)
+        fresh.internal_fluid('oil', pipe._internal_fluid.density)
+        fresh.material(pipe._material.name)
+        assert pipe.mass_total() == fresh.mass_total() != before
+
+
+def test_setting_the_same_value_keeps_the_cache():
+    pipe = ptb.Pipe(0.1683, 0.0071)
+    pipe.second_moment()
+    pipe.od(0.1683)
+    pipe.t(0.0071)
+    pipe.material('default')
+    pipe.second_moment()
+    assert pipe.cache_info() == {'hits': 1, 'misses': 1, 'size': 1}
+    pipe.cache_clear()
+    assert pipe.cache_info() == {'hits': 0, 'misses': 0, 'size': 0}
+
+
+def test_memory_per_instance():
+    # 200 bytes per pipe on 64-bit CPython and 488 bytes with every cached
+    # property evaluated, see the Pipe docstring
+    import tracemalloc
+    count = 10000
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        pipes = [ptb.Pipe(0.3239, 0.0127) for index in range(count)]
+        for pipe in pipes:
+            pipe.coatings('3lpp', 0.003, 900.0)
+            pipe.internal_fluid('oil', 800.0)
+        per_pipe = (tracemalloc.get_traced_memory()[0] - before) / count
+        for pipe in pipes:
+            pipe.mass_buoyant()
+            pipe.radius_of_gyration()
+        evaluated = (tracemalloc.get_traced_memory()[0] - before) / count
+    finally:
+        tracemalloc.stop()
+    assert per_pipe < 216
+    assert evaluated < 504
+    assert pipes[0].cache_info()['size'] == 12
+    assert not hasattr(pipes[0], '__dict__')
+    assert pipes[0]._coatings is pipes[-1]._coatings
+
+
+def test_scalar_path_does_not_import_numpy():
+    import os
+    import subprocess
+    import sys
+    code = ("import sys, pipetoolbox; pipe = pipetoolbox.Pipe(0.3239, 0.0127); "
+            "pipe.radius_of_gyration(); pipe.euler_load('pin-pin'); "
+            "print('numpy' in sys.modules)")
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    assert subprocess.check_output([sys.executable, '-c', code], cwd=root).strip() == b'False'
+
+
+def test_array_inputs_use_numpy():
+    import numpy as np
+    pipe = ptb.Pipe(np.array([0.1683, 0.3239]), np.array([0.0071, 0.0127]))
+    batch = ptb.PipeArray([0.1683, 0.3239], [0.0071, 0.0127])
+    assert pipe.radius_of_gyration().tolist() == batch.radius_of_gyration().tolist()
+    pipe.t(np.array([0.008, 0.014]))
+    assert pipe.area_steel().tolist() == ptb.PipeArray([0.1683, 0.3239], [0.008, 0.014]).area_steel().tolist()
+
+
+def test_array_coatings_and_fluids():
+    import numpy as np
+    pipe = ptb.Pipe(np.array([0.1683, 0.3239]), np.array([0.0071, 0.0127]))
+    pipe.mass_total()
+    pipe.coatings('pp', np.array([0.003, 0.005]), 900.0)
+    pipe.internal_fluid('oil', np.array([800.0, 900.0]))
+    pipe.external_fluid('brine', np.array([1025.0, 1200.0]))
+    batch = ptb.PipeArray([0.1683, 0.3239], [0.0071, 0.0127], coatings_thickness=[0.003, 0.005],
+                          coatings_density=900.0, internal_fluid_density=[800.0, 900.0],
+                          external_fluid_density=[1025.0, 1200.0])
+    assert pipe.mass_total().tolist() == batch.mass_total().tolist()
+    assert pipe.mass_buoyant().tolist() == batch.mass_buoyant().tolist()
+
+
+def test_interned_settings_are_bounded():
+    from pipetoolbox import pipe as pipe_module
+    interned = dict(pipe_module._interned)
+    pipe = ptb.Pipe(0.3239, 0.0127)
+    try:
+        for index in range(2 * pipe_module._INTERN_LIMIT):
+            pipe.coatings('pp', 0.001 * index, 900.0)
+            pipe.internal_fluid('oil', float('nan'))
+        assert len(pipe_module._interned) <= pipe_module._INTERN_LIMIT
+        assert pipe._coatings.thickness == 0.001 * (2 * pipe_module._INTERN_LIMIT - 1)
+    finally:
+        pipe_module._interned.clear()
+        pipe_module._interned.update(interned)
+
+
+def test_default_end_conditions_are_pin_pin():
+    import pytest
+    pipe = ptb.Pipe(0.3239, 0.0127)
+    pipe.length(12.0)
+    assert pipe.euler_load() == pipe.euler_load('fixed') == pipe.euler_load('pin-pin')
+    assert pipe.euler_load('fix-fix') == 4.0 * pipe.euler_load('pin-pin')
+    with pytest.raises(ValueError):
+        pipe.euler_load('clamped')
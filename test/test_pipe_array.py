@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Check the batch PipeArray against the scalar Pipe methods
+"""
+
+import numpy as np
+
+import pipetoolbox as ptb
+
+PROPERTIES = ['diameter_inner', 'area_inner', 'area_steel', 'area_outer',
+              'area_coatings', 'area_external', 'second_moment',
+              'radius_of_gyration', 'mass_fluids', 'mass_steel',
+              'mass_coatings', 'mass_total', 'mass_buoyant', 'tension_limit',
+              'bending_limit', 'pressure_internal_limit', 'euler_load']
+
+
+def make_pipes(count=200, seed=1):
+    rng = np.random.default_rng(seed)
+    pipes = []
+    for index in range(count):
+        pipe = ptb.Pipe(rng.uniform(0.02, 1.0), 0.0)
+        pipe.t(rng.uniform(0.05, 0.4) * pipe.diameter_outer())
+        pipe.coatings('pp', rng.uniform(0.0, 0.05), rng.uniform(600.0, 1200.0))
+        pipe.internal_fluid('oil', rng.uniform(700.0, 1100.0))
+        pipe.external_fluid('sea water', rng.uniform(1000.0, 1030.0))
+        pipe.length(rng.uniform(1.0, 50.0))
+        pipe.material(['steel', 'stainless steel'][index % 2])
+        pipes.append(pipe)
+    return pipes
+
+
+def test_matches_scalar_pipe_exactly():
+    pipes = make_pipes()
+    batch = ptb.PipeArray.from_pipes(pipes)
+    for name in PROPERTIES:
+        values = getattr(batch, name)()
+        expected = [getattr(pipe, name)() for pipe in pipes]
+        assert values.tolist() == expected, name
+
+
+def test_material_names_and_broadcasting():
+    batch = ptb.PipeArray(np.linspace(0.1, 0.5, 5), 0.01, material='stainless steel')
+    pipe = ptb.Pipe(0.2, 0.01)
+    pipe.material('stainless steel')
+    assert batch.shape == (5,)
+    assert batch.tension_limit(0.8)[1] == pipe.tension_limit(0.8)
+    assert batch.euler_load('pin-fix')[1] == pipe.euler_load('pin-fix')
+    assert batch.pipe(1).bending_limit() == pipe.bending_limit()
+
+
+def test_properties_shares_intermediates_without_changing_results():
+    batch = ptb.PipeArray.from_pipes(make_pipes(50))
+    results = batch.properties(PROPERTIES, safety_factor=0.72, end_conditions='pin-pin')
+    assert results['tension_limit'].tolist() == batch.tension_limit(0.72).tolist()
+    assert results['euler_load'].tolist() == batch.euler_load('pin-pin').tolist()
+    for name in PROPERTIES[:12]:
+        assert results[name].tolist() == getattr(batch, name)().tolist(), name
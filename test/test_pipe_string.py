@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Check the pipe string sums against a loop over Pipe objects
+"""
+
+import numpy as np
+
+import pipetoolbox as ptb
+
+from test_pipe_array import make_pipes
+
+
+def test_tension_profile_and_masses():
+    pipes = make_pipes(300)
+    string = ptb.PipeString(pipes, bottom_tension=2.0e5)
+    #
+    tension = 2.0e5
+    expected = []
+    for pipe in reversed(pipes):
+        tension += pipe.mass_buoyant() * 9.81 * pipe.length()
+        expected.append(tension)
+    expected.reverse()
+    assert np.allclose(string.tension_profile(), expected, rtol=1e-12)
+    assert np.isclose(string.mass_steel(), sum(pipe.mass_steel() * pipe.length() for pipe in pipes))
+    utilisation = [tension / pipe.tension_limit() for tension, pipe in zip(expected, pipes)]
+    assert string.governing_segment()[0] == int(np.argmax(utilisation))
+
+
+def test_replacing_a_segment_matches_a_full_recompute():
+    pipes = make_pipes(300)
+    string = ptb.PipeString(pipes, safety_factor=0.8)
+    replacement = ptb.Pipe(0.5, 0.03, 'stainless steel')
+    replacement.length(40.0)
+    string.set_segment(150, replacement)
+    string.bottom_tension(1.0e5)
+    #
+    pipes[150] = replacement
+    fresh = ptb.PipeString(pipes, bottom_tension=1.0e5, safety_factor=0.8)
+    assert np.allclose(string.tension_profile(), fresh.tension_profile(), rtol=1e-12)
+    assert np.allclose(string.utilisation(), fresh.utilisation(), rtol=1e-12)
+    assert np.isclose(string.mass_steel(), fresh.mass_steel())
+    assert np.isclose(string.length(), fresh.length())
+    assert string.governing_segment()[0] == fresh.governing_segment()[0]
+    assert np.isclose(string.governing_segment()[1], fresh.governing_segment()[1])
+
+
+def test_segments_are_copied_and_keep_their_material():
+    segments = ptb.PipeArray(0.3239, np.full(5, 0.0127), length=12.0)
+    before = segments.wall_thickness().tolist()
+    string = ptb.PipeString(segments)
+    pipe = ptb.Pipe(0.3239, 0.0159)
+    pipe.length(12.0)
+    string.set_segment(2, pipe)
+    assert segments.wall_thickness().tolist() == before
+    assert string.segment(0)._material == ptb.Pipe(0.3239, 0.0127, 'default')._material
+    string.set_segment(3, ptb.Pipe(0.3239, 0.0127, 'stainless steel'))
+    assert string.segment(3)._material == ptb.material_record('stainless steel')
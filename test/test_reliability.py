@@ -0,0 +1,36 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Check the Monte Carlo reliability against a closed form case
+"""
+
+from statistics import NormalDist
+
+import pipetoolbox as ptb
+
+
+def closed_form(pipe, beta):
+    """Only the load is random, so failure is a normal tail"""
+    capacity = pipe.tension_limit()
+    load = capacity / (1.0 + 0.1 * beta)
+    return load, 1.0 - NormalDist().cdf(beta)
+
+
+def test_crude_monte_carlo_brackets_the_exact_value():
+    pipe = ptb.Pipe(0.3239, 0.0127)
+    load, exact = closed_form(pipe, 2.0)
+    result = ptb.failure_probability(pipe, load, yield_cov=0.0, samples=400000,
+                                     block_size=65536, seed=7)
+    assert result.lower <= exact <= result.upper
+    assert result == ptb.failure_probability(pipe, load, yield_cov=0.0, samples=400000,
+                                             block_size=65536, seed=7)
+
+
+def test_importance_sampling_for_a_rare_event():
+    pipe = ptb.Pipe(0.3239, 0.0127)
+    load, exact = closed_form(pipe, 5.0)
+    result = ptb.failure_probability(pipe, load, yield_cov=0.0, samples=50000,
+                                     seed=7, importance_shift='auto')
+    assert abs(result.shift[3] - 5.0) < 1e-6
+    assert result.lower <= exact <= result.upper
+    assert result.upper - result.lower < 0.1 * exact
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Check the fused property report against the Pipe methods and its rendering
+"""
+
+import csv
+import io
+import json
+import subprocess
+import sys
+
+import pytest
+
+import pipetoolbox as ptb
+from pipetoolbox.report import FIELDS, units
+from test_pipe_array import make_pipes
+
+
+def test_report_matches_methods_exactly():
+    for pipe in make_pipes(50):
+        report = pipe.properties(safety_factor=0.8, end_conditions='pin-pin', temperature=150.0)
+        assert report.material == pipe._material.name
+        for name in FIELDS:
+            method = getattr(pipe, name)
+            if name in ('tension_limit', 'bending_limit', 'pressure_internal_limit'):
+                expected = method(0.8, 150.0)
+            elif name == 'euler_load':
+                expected = method('pin-pin', 150.0)
+            else:
+                expected = method()
+            assert getattr(report, name) == expected, name
+
+
+def test_field_units():
+    pipe = ptb.Pipe(0.3239, 0.0127)
+    SI = pipe.properties()
+    field = pipe.properties(SI=False)
+    assert field.units == 'field'
+    assert field.diameter_outer == pytest.approx(323.9)
+    assert field.tension_limit == pytest.approx(1e-3 * SI.tension_limit)
+    assert field.pressure_internal_limit == pytest.approx(1e-6 * SI.pressure_internal_limit)
+    assert field.mass_buoyant == SI.mass_buoyant
+    assert units(False)['bending_limit'] == 'kNm'
+
+
+def test_render_formats_agree():
+    pipes = make_pipes(20)
+    batch = ptb.PipeArray.from_pipes(pipes)
+    text = ptb.render_properties(pipes)
+    assert len(text.splitlines()) == 22
+    #
+    rows = list(csv.reader(io.StringIO(ptb.render_properties(pipes, 'csv', SI=False))))
+    assert rows[0][:2] == ['material', 'diameter_outer (mm)']
+    assert [row[0] for row in rows[1:]] == [pipe._material.name for pipe in pipes]
+    #
+    from_pipes = json.loads(ptb.render_properties(pipes, 'json'))
+    from_array = json.loads(ptb.render_properties(batch, 'json'))
+    assert from_pipes['units'] == from_array['units']
+    for row, batch_row in zip(from_pipes['pipes'], from_array['pipes']):
+        assert row.pop('material')
+        assert row == pytest.approx(batch_row, rel=1e-12)
+
+
+def test_render_to_file_and_display():
+    pipe = ptb.Pipe(0.3239, 0.0127)
+    output = io.StringIO()
+    assert ptb.render_properties([pipe, pipe], 'details', file=output) is None
+    assert output.getvalue().count("Pipe Details") == 2
+    output = io.StringIO()
+    pipe.display(file=output)
+    assert "Burst limit" in output.getvalue()
+    with pytest.raises(ValueError):
+        ptb.render_properties(pipe, 'xml')
+
+
+def test_report_without_numpy():
+    code = ("import sys, pipetoolbox as ptb; ptb.Pipe(0.3, 0.01).properties(); "
+            "ptb.render_properties(ptb.Pipe(0.3, 0.01), 'csv'); assert 'numpy' not in sys.modules")
+    subprocess.run([sys.executable, '-c', code], check=True)
+
+
+def test_degenerate_pipes_display():
+    for pipe in (ptb.Pipe(), ptb.Pipe(0.3, 0.0)):
+        output = io.StringIO()
+        pipe.display(file=output)
+        assert "Burst limit" in output.getvalue()
+        assert pipe.properties().radius_of_gyration != pipe.properties().radius_of_gyration
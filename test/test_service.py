@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Check the property service answers, coalescing, cache and metrics
+"""
+
+import asyncio
+
+import pytest
+
+import pipetoolbox as ptb
+from pipetoolbox.service import PipeClient, PipeService, make_requests, run_load
+
+
+def expected(request):
+    pipe = ptb.Pipe(request['od'], request['wt'], request['material'])
+    pipe.coatings('none', request['coatings_thickness'], request['coatings_density'])
+    pipe.length(request['length'])
+    return {name: getattr(pipe, name)() for name in request['properties']}
+
+
+async def serve(service, requests, concurrency=16, path=None):
+    server = await service.start(path=path)
+    port = None if path else server.sockets[0].getsockname()[1]
+    client = await PipeClient.connect(path, port=port)
+    results = await asyncio.gather(*[client.request(request) for request in requests])
+    metrics = await client.metrics()
+    await client.close()
+    await service.stop(server)
+    return results, metrics
+
+
+@pytest.mark.parametrize('coalesce', [True, False])
+def test_results_match_pipe(coalesce):
+    requests = make_requests(300, repeat=0.3)
+    results, metrics = asyncio.run(serve(PipeService(coalesce=coalesce), requests))
+    assert results == [expected(request) for request in requests]
+    assert metrics['requests'] == 300
+    assert metrics['cache_hits'] + metrics['cache_misses'] == 300
+    if coalesce:
+        assert 0 < metrics['batches'] < 300
+    else:
+        assert metrics['batches'] == 0
+
+
+def test_identical_requests_share_one_evaluation(tmp_path):
+    requests = make_requests(1) * 50
+    service = PipeService(window=0.01)
+    results, metrics = asyncio.run(serve(service, requests, path=str(tmp_path / 'pipes.sock')))
+    assert results == [expected(requests[0])] * 50
+    assert metrics['batches'] == 1 and metrics['mean_batch'] == 1.0
+    assert metrics['cache_size'] == 1
+
+
+def test_cache_is_least_recently_used():
+    requests = make_requests(20, repeat=0.0)
+    service = PipeService(cache_size=5, coalesce=False)
+    asyncio.run(serve(service, requests))
+    assert list(service._cache) == [service._parse(request)[0] for request in requests[-5:]]
+
+
+def test_errors_are_returned():
+    async def run():
+        service = PipeService()
+        server = await service.start()
+        client = await PipeClient.connect(port=server.sockets[0].getsockname()[1])
+        with pytest.raises(ValueError, match='Unknown material'):
+            await client.request({'od': 0.3239, 'wt': 0.0127, 'material': 'unobtainium'})
+        with pytest.raises(ValueError, match='Unknown property'):
+            await client.request({'od': 0.3239, 'wt': 0.0127, 'properties': ['colour']})
+        result = await client.request({'od': 0.3239, 'wt': 0.0127, 'properties': ['euler_load']})
+        metrics = await client.metrics()
+        await client.close()
+        await service.stop(server)
+        return result, metrics
+    result, metrics = asyncio.run(run())
+    assert result['euler_load'] == ptb.Pipe(0.3239, 0.0127).euler_load()
+    assert metrics['errors'] == 2
+
+
+def test_load_generator():
+    async def run():
+        service = PipeService()
+        server = await service.start()
+        elapsed, latencies = await run_load(make_requests(200), 8, port=server.sockets[0].getsockname()[1])
+        await service.stop(server)
+        return elapsed, latencies
+    elapsed, latencies = asyncio.run(run())
+    assert len(latencies) == 200 and elapsed > 0.0
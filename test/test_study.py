@@ -0,0 +1,47 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Check the parameter study against Pipe and between serial and parallel runs
+"""
+
+import numpy as np
+
+import pipetoolbox as ptb
+
+
+def make_study():
+    return ptb.ParameterStudy(
+            properties=('mass_total', 'tension_limit', 'euler_load'),
+            safety_factor=0.8, end_conditions='pin-pin', length=15.0,
+            outer_diameter=np.linspace(0.1, 0.6, 11),
+            wall_thickness=np.linspace(0.008, 0.03, 7),
+            corrosion_allowance=[0.0, 0.003],
+            coatings_thickness=[0.0, 0.05],
+            internal_fluid_density=[800.0, 1025.0],
+            material=['steel', 'stainless steel'])
+
+
+def test_parallel_matches_serial_and_pipe():
+    study = make_study()
+    serial = study.run(processes=1, chunk_size=97)
+    parallel = study.run(processes=2, chunk_size=97)
+    for name in serial:
+        assert serial[name].shape == study.shape()
+        assert np.array_equal(serial[name], parallel[name])
+    #
+    index = (4, 3, 1, 1, 0, 0, 0, 1)
+    pipe = ptb.Pipe(study.values('outer_diameter')[4],
+                    study.values('wall_thickness')[3] - 0.003, 'stainless steel')
+    pipe.coatings('none', 0.05, 0.0)
+    pipe.internal_fluid('oil', 800.0)
+    pipe.length(15.0)
+    assert serial['mass_total'][index] == pipe.mass_total()
+    assert serial['tension_limit'][index] == pipe.tension_limit(0.8)
+    assert serial['euler_load'][index] == pipe.euler_load('pin-pin')
+
+
+def test_progress_reports_every_case():
+    reports = []
+    study = make_study()
+    study.run(processes=1, chunk_size=500, progress=lambda done, total: reports.append((done, total)))
+    assert reports == [(500, 1232), (1000, 1232), (1232, 1232)]